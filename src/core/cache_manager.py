@@ -8,7 +8,7 @@ import os
 import traceback
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Any, Optional, Dict
+from typing import Any, Optional, Dict, Iterable
 
 # Import logging utilities
 import sys
@@ -196,6 +196,34 @@ class CacheManager:
             logger.error(f"Error retrieving from cache for {email_id}: {e}")
             return None
 
+    def get_many(self, email_ids: Iterable[str]) -> Dict[str, Any]:
+        """
+        Retrieve cached data for several emails in one pass.
+        Updates access time for LRU on every hit.
+
+        Args:
+            email_ids: Email IDs to retrieve
+
+        Returns:
+            dict: email_id -> cached data for the IDs that are cached (misses are omitted)
+        """
+        found = {}
+        try:
+            accessed_at = datetime.now().isoformat()
+            for email_id in email_ids:
+                entry = self.cache.get(email_id)
+                if entry is None or email_id == '_metadata':
+                    continue
+                entry['accessed_at'] = accessed_at
+                found[email_id] = entry['data']
+
+            logger.debug(f"Cache get_many: {len(found)} hits")
+            return found
+
+        except Exception as e:
+            logger.error(f"Error retrieving multiple entries from cache: {e}")
+            return found
+
     def set(self, email_id: str, data: Any) -> bool:
         """
         Cache email summary data.
@@ -7,6 +7,7 @@ Stores context in SQLite database for historical tracking.
 import sqlite3
 import json
 import traceback
+import zlib
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, Any, List, Optional
@@ -14,9 +15,18 @@ from typing import Dict, Any, List, Optional
 from utils.logger_utils import setup_logger, log_exception
 from utils.metrics_utils import get_metrics_tracker
 
+try:
+    import zstandard as zstd
+except ImportError:  # Optional dependency - fall back to zlib
+    zstd = None
+
 # Initialize logger
 logger = setup_logger(__name__)
 
+# Leading format byte for compressed_context BLOBs (legacy rows are plain TEXT)
+_FORMAT_ZSTD = b'\x01'
+_FORMAT_ZLIB = b'\x02'
+
 
 class ContextMemoryManager:
     """
@@ -24,6 +34,7 @@ class ContextMemoryManager:
 
     Stores:
     - compressed_context: Token-efficient representation for future AI queries
+      (stored as a zstd-compressed BLOB, zlib when zstandard is not installed)
     - elaborate_summary: Human-readable 10-bullet summary
     - metadata: Timestamp, email count, categories
     """
@@ -39,6 +50,8 @@ class ContextMemoryManager:
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
         self.conn = None
         self.metrics = get_metrics_tracker()
+        self._zctx = zstd.ZstdCompressor(level=3) if zstd else None
+        self._zdctx = zstd.ZstdDecompressor() if zstd else None
 
         logger.info(f"Initializing ContextMemoryManager: {self.db_path}")
         self._init_database()
@@ -54,7 +67,7 @@ class ContextMemoryManager:
                 CREATE TABLE IF NOT EXISTS context_memory (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
                     timestamp TEXT NOT NULL,
-                    compressed_context TEXT NOT NULL,
+                    compressed_context BLOB NOT NULL,
                     elaborate_summary TEXT NOT NULL,
                     email_count INTEGER NOT NULL,
                     categories TEXT NOT NULL,
@@ -69,14 +82,79 @@ class ContextMemoryManager:
                 ON context_memory(timestamp DESC)
             """)
 
+            # Running counters so get_stats() doesn't scan the whole table
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS stats (
+                    total_entries INTEGER NOT NULL,
+                    total_emails INTEGER NOT NULL
+                )
+            """)
+
+            # Seed counters once (covers databases created before the stats table existed)
+            cursor.execute("""
+                INSERT INTO stats (total_entries, total_emails)
+                SELECT COUNT(*), COALESCE(SUM(email_count), 0) FROM context_memory
+                WHERE NOT EXISTS (SELECT 1 FROM stats)
+            """)
+
+            # Keep counters in sync with inserts/deletes
+            cursor.execute("""
+                CREATE TRIGGER IF NOT EXISTS ctx_insert AFTER INSERT ON context_memory
+                BEGIN
+                    UPDATE stats SET total_entries = total_entries + 1,
+                                     total_emails = total_emails + NEW.email_count;
+                END
+            """)
+            cursor.execute("""
+                CREATE TRIGGER IF NOT EXISTS ctx_delete AFTER DELETE ON context_memory
+                BEGIN
+                    UPDATE stats SET total_entries = total_entries - 1,
+                                     total_emails = total_emails - OLD.email_count;
+                END
+            """)
+
             self.conn.commit()
             logger.info("Database initialized successfully")
 
         except Exception as e:
             log_exception(logger, e, "Failed to initialize database")
-            self.metrics.record_error(__name__, type(e).__name__, str(e), traceback.format_exc())
+            self.metrics.record_error(__name__, type(e).__name__, str(e), traceback.format_exc)
             raise
 
+    def _compress_context(self, context: str) -> bytes:
+        """Compress context text into a format-tagged BLOB."""
+        data = context.encode('utf-8')
+        if self._zctx:
+            return _FORMAT_ZSTD + self._zctx.compress(data)
+        return _FORMAT_ZLIB + zlib.compress(data)
+
+    def _decompress_context(self, value: Any) -> str:
+        """Decode a stored compressed_context value (BLOB or legacy TEXT)."""
+        if isinstance(value, str):
+            return value
+
+        fmt, payload = value[:1], value[1:]
+        if fmt == _FORMAT_ZSTD:
+            if not self._zdctx:
+                raise RuntimeError("zstandard is required to read this context entry")
+            return self._zdctx.decompress(payload).decode('utf-8')
+        if fmt == _FORMAT_ZLIB:
+            return zlib.decompress(payload).decode('utf-8')
+        raise ValueError(f"Unknown compressed_context format: {fmt!r}")
+
+    def _row_to_context(self, row: tuple) -> Dict[str, Any]:
+        """Convert a context_memory row into a context dictionary."""
+        return {
+            'id': row[0],
+            'timestamp': row[1],
+            'compressed_context': self._decompress_context(row[2]),
+            'elaborate_summary': json.loads(row[3]),
+            'email_count': row[4],
+            'categories': json.loads(row[5]),
+            'metadata': json.loads(row[6]) if row[6] else None,
+            'created_at': row[7]
+        }
+
     def save_context(
         self,
         compressed_context: str,
@@ -116,7 +194,8 @@ class ContextMemoryManager:
                 INSERT INTO context_memory
                 (timestamp, compressed_context, elaborate_summary, email_count, categories, metadata)
                 VALUES (?, ?, ?, ?, ?, ?)
-            """, (timestamp, compressed_context, summary_json, email_count, categories_json, metadata_json))
+            """, (timestamp, self._compress_context(compressed_context), summary_json,
+                  email_count, categories_json, metadata_json))
 
             self.conn.commit()
 
@@ -125,7 +204,7 @@ class ContextMemoryManager:
 
         except Exception as e:
             log_exception(logger, e, "Failed to save context memory")
-            self.metrics.record_error(__name__, type(e).__name__, str(e), traceback.format_exc())
+            self.metrics.record_error(__name__, type(e).__name__, str(e), traceback.format_exc)
             return False
 
     def get_latest_context(self) -> Optional[Dict[str, Any]]:
@@ -161,20 +240,11 @@ class ContextMemoryManager:
                 logger.info("No context memory entries found")
                 return None
 
-            return {
-                'id': row[0],
-                'timestamp': row[1],
-                'compressed_context': row[2],
-                'elaborate_summary': json.loads(row[3]),
-                'email_count': row[4],
-                'categories': json.loads(row[5]),
-                'metadata': json.loads(row[6]) if row[6] else None,
-                'created_at': row[7]
-            }
+            return self._row_to_context(row)
 
         except Exception as e:
             log_exception(logger, e, "Failed to get latest context")
-            self.metrics.record_error(__name__, type(e).__name__, str(e), traceback.format_exc())
+            self.metrics.record_error(__name__, type(e).__name__, str(e), traceback.format_exc)
             return None
 
     def get_context_by_date(self, date: str) -> Optional[Dict[str, Any]]:
@@ -206,20 +276,11 @@ class ContextMemoryManager:
                 logger.info(f"No context memory found for date: {date}")
                 return None
 
-            return {
-                'id': row[0],
-                'timestamp': row[1],
-                'compressed_context': row[2],
-                'elaborate_summary': json.loads(row[3]),
-                'email_count': row[4],
-                'categories': json.loads(row[5]),
-                'metadata': json.loads(row[6]) if row[6] else None,
-                'created_at': row[7]
-            }
+            return self._row_to_context(row)
 
         except Exception as e:
             log_exception(logger, e, f"Failed to get context for date: {date}")
-            self.metrics.record_error(__name__, type(e).__name__, str(e), traceback.format_exc())
+            self.metrics.record_error(__name__, type(e).__name__, str(e), traceback.format_exc)
             return None
 
     def get_all_contexts(self, limit: int = 30) -> List[Dict[str, Any]]:
@@ -245,25 +306,14 @@ class ContextMemoryManager:
 
             rows = cursor.fetchall()
 
-            contexts = []
-            for row in rows:
-                contexts.append({
-                    'id': row[0],
-                    'timestamp': row[1],
-                    'compressed_context': row[2],
-                    'elaborate_summary': json.loads(row[3]),
-                    'email_count': row[4],
-                    'categories': json.loads(row[5]),
-                    'metadata': json.loads(row[6]) if row[6] else None,
-                    'created_at': row[7]
-                })
+            contexts = [self._row_to_context(row) for row in rows]
 
             logger.info(f"Retrieved {len(contexts)} context memory entries")
             return contexts
 
         except Exception as e:
             log_exception(logger, e, "Failed to get all contexts")
-            self.metrics.record_error(__name__, type(e).__name__, str(e), traceback.format_exc())
+            self.metrics.record_error(__name__, type(e).__name__, str(e), traceback.format_exc)
             return []
 
     def get_stats(self) -> Dict[str, Any]:
@@ -280,27 +330,24 @@ class ContextMemoryManager:
         try:
             cursor = self.conn.cursor()
 
-            cursor.execute("""
-                SELECT
-                    COUNT(*) as total_entries,
-                    SUM(email_count) as total_emails,
-                    MIN(timestamp) as earliest_date,
-                    MAX(timestamp) as latest_date
-                FROM context_memory
-            """)
+            # Counters are maintained by the ctx_insert/ctx_delete triggers
+            cursor.execute("SELECT total_entries, total_emails FROM stats LIMIT 1")
+            counters = cursor.fetchone() or (0, 0)
 
-            row = cursor.fetchone()
+            # MIN/MAX are answered from idx_timestamp without touching table rows
+            cursor.execute("SELECT MIN(timestamp), MAX(timestamp) FROM context_memory")
+            dates = cursor.fetchone()
 
             return {
-                'total_entries': row[0] or 0,
-                'total_emails': row[1] or 0,
-                'earliest_date': row[2],
-                'latest_date': row[3]
+                'total_entries': counters[0] or 0,
+                'total_emails': counters[1] or 0,
+                'earliest_date': dates[0],
+                'latest_date': dates[1]
             }
 
         except Exception as e:
             log_exception(logger, e, "Failed to get context stats")
-            self.metrics.record_error(__name__, type(e).__name__, str(e), traceback.format_exc())
+            self.metrics.record_error(__name__, type(e).__name__, str(e), traceback.format_exc)
             return {
                 'total_entries': 0,
                 'total_emails': 0,
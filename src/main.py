@@ -18,25 +18,34 @@ import json
 import time
 import sys
 import traceback
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 
 # Add src directory to Python path for imports
 sys.path.insert(0, str(Path(__file__).parent))
 
-import google.genai as genai
-
 # Import utility functions from organized modules
 from core.config_manager import ConfigManager
 from core.cache_manager import CacheManager
-from utils.email_utils import connect_to_gmail, fetch_recent_emails, display_emails
+from utils.email_utils import connect_to_gmail, fetch_recent_emails, display_emails, save_history_id
 from utils.gemini_utils import categorize_emails
-from utils.display_utils import display_categorized_summary, generate_daily_digest, display_daily_digest
+from utils.gemini_transport import get_client
+from utils.display_utils import (
+    display_categorized_summary, generate_daily_digest, display_daily_digest, group_by_category,
+    Digest
+)
 from utils.logger_utils import setup_logger, log_exception, log_performance
 from utils.metrics_utils import get_metrics_tracker
 
-# Initialize logger
+# Initialize logger and metrics tracker
 logger = setup_logger(__name__)
+metrics = get_metrics_tracker()
+
+# Digest output location (data/digest in project root), resolved once at import
+_DIGEST_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'digest')
+_DIGEST_FILE = os.path.join(_DIGEST_DIR, 'digest_data.json')
+_digest_dir_ready = False
 
 
 class EmailAssistantError(Exception):
@@ -44,25 +53,21 @@ class EmailAssistantError(Exception):
     pass
 
 
-def save_digest_to_json(digest: dict, categorized_emails: list, execution_time: float) -> bool:
+def save_digest_to_json(digest: Digest, categorized_emails: list, execution_time: float) -> bool:
     """
     Save the daily digest to a JSON file for web visualization.
 
     Args:
-        digest: Daily digest dictionary from generate_daily_digest()
+        digest: Daily digest from generate_daily_digest()
         categorized_emails: List of all categorized emails
         execution_time: Time taken to execute the script in seconds
 
     Returns:
         bool: True if successful, False otherwise
     """
+    global _digest_dir_ready
     logger.info("Saving digest to JSON file")
-    metrics = get_metrics_tracker()
-
-    # Use data/digest directory
-    digest_dir = Path(__file__).parent.parent / 'data' / 'digest'
-    digest_dir.mkdir(parents=True, exist_ok=True)
-    digest_file = digest_dir / 'digest_data.json'
+    digest_file = _DIGEST_FILE
 
     digest_data = {
         'metadata': {
@@ -70,11 +75,16 @@ def save_digest_to_json(digest: dict, categorized_emails: list, execution_time:
             'execution_time': round(execution_time, 2),
             'total_emails': len(categorized_emails)
         },
-        'digest': digest,
+        'digest': digest.to_dict(),
         'categorized_emails': categorized_emails
     }
 
     try:
+        # Create data/digest once per process
+        if not _digest_dir_ready:
+            os.makedirs(_DIGEST_DIR, exist_ok=True)
+            _digest_dir_ready = True
+
         with open(digest_file, 'w') as f:
             json.dump(digest_data, f, indent=2)
 
@@ -96,14 +106,59 @@ def save_digest_to_json(digest: dict, categorized_emails: list, execution_time:
         return False
 
 
+def _connect_and_fetch(max_emails: int, search_query: str, last_fetch_timestamp: str = None) -> tuple:
+    """
+    Connect to Gmail and fetch new emails.
+
+    Runs on a worker thread so Gemini client setup can overlap the Gmail round-trips.
+
+    Args:
+        max_emails: Maximum number of emails to fetch
+        search_query: Gmail search query
+        last_fetch_timestamp: Fetch only emails after this ISO timestamp (optional)
+
+    Returns:
+        tuple: (Gmail service, list of fetched emails, mailbox historyId to save
+            once the emails are processed)
+
+    Raises:
+        EmailAssistantError: If connecting or fetching fails
+    """
+    try:
+        service = connect_to_gmail()
+        logger.info("Gmail connection successful")
+
+    except Exception as e:
+        log_exception(logger, e, "Gmail connection failed")
+        metrics.record_error(__name__, type(e).__name__, "Gmail connection failed", traceback.format_exc())
+        raise EmailAssistantError(f"Failed to connect to Gmail: {e}")
+
+    try:
+        my_emails, history_id = fetch_recent_emails(
+            service,
+            max_results=max_emails,
+            query=search_query,
+            after_timestamp=last_fetch_timestamp,
+            return_history_id=True
+        )
+        logger.info(f"Fetched {len(my_emails)} new emails")
+
+    except Exception as e:
+        log_exception(logger, e, "Email fetching failed")
+        metrics.record_error(__name__, type(e).__name__, "Email fetch failed", traceback.format_exc())
+        raise EmailAssistantError(f"Failed to fetch emails: {e}")
+
+    return service, my_emails, history_id
+
+
 def main():
     """
     Main execution function for the Email Assistant.
 
     Workflow:
     1. Load configuration and initialize cache
-    2. Connect to Gmail and fetch emails
-    3. Initialize Gemini AI model
+    2. Connect to Gmail and fetch emails (on a worker thread)
+    3. Initialize Gemini AI model (overlapped with step 2)
     4. Categorize emails (with caching)
     5. Generate and display daily digest
     6. Save digest to JSON for web visualization
@@ -115,7 +170,6 @@ def main():
     """
     # Track execution time
     start_time = time.time()
-    metrics = get_metrics_tracker()
     success = False
     error_message = None
 
@@ -157,19 +211,10 @@ def main():
         print(f"   Model: {config.get('api_settings', 'gemini_model')}")
         print(f"   Cache: {'Enabled' if cache_enabled else 'Disabled'}")
 
-        # === Step 1: Connect to Gmail and Fetch Emails ===
+        # === Step 1: Connect to Gmail and Fetch Emails (background worker) ===
         logger.info("Step 1: Connecting to Gmail")
         print("\n🔄 Step 1: Connecting to Gmail...")
 
-        try:
-            service = connect_to_gmail()
-            logger.info("Gmail connection successful")
-
-        except Exception as e:
-            log_exception(logger, e, "Gmail connection failed")
-            metrics.record_error(__name__, type(e).__name__, "Gmail connection failed", traceback.format_exc())
-            raise EmailAssistantError(f"Failed to connect to Gmail: {e}")
-
         max_emails = config.get('gmail_settings', 'max_emails_to_fetch', 10)
         search_query = config.get('gmail_settings', 'search_query', 'is:unread newer_than:1d')
 
@@ -180,19 +225,25 @@ def main():
             if last_fetch_timestamp:
                 logger.info(f"Incremental fetch: fetching emails after {last_fetch_timestamp}")
 
-        try:
-            my_emails = fetch_recent_emails(
-                service,
-                max_results=max_emails,
-                query=search_query,
-                after_timestamp=last_fetch_timestamp
+        # Get API key from environment variable
+        api_key = os.environ.get('GOOGLE_API_KEY') or os.environ.get('GEMINI_API_KEY')
+        model_name = config.get('api_settings', 'gemini_model', 'gemini-2.5-flash-lite')
+        client = None
+        gemini_init_error = None
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            gmail_future = executor.submit(
+                _connect_and_fetch, max_emails, search_query, last_fetch_timestamp
             )
-            logger.info(f"Fetched {len(my_emails)} new emails")
 
-        except Exception as e:
-            log_exception(logger, e, "Email fetching failed")
-            metrics.record_error(__name__, type(e).__name__, "Email fetch failed", traceback.format_exc())
-            raise EmailAssistantError(f"Failed to fetch emails: {e}")
+            # Build the Gemini client while Gmail I/O is in flight
+            if api_key:
+                try:
+                    client = get_client(api_key)
+                except Exception as e:
+                    gemini_init_error = e
+
+            service, my_emails, history_id = gmail_future.result()
 
         # === Step 2: Display Fetched Emails ===
         print(f"\n📧 Step 2: Displaying {len(my_emails)} fetched emails")
@@ -206,13 +257,10 @@ def main():
             metrics.record_script_run(execution_time, 0, True, None)
             return
 
-        # === Step 3: Initialize Gemini AI Model ===
+        # === Step 3: Initialize Gemini AI Model (client built during Step 1) ===
         logger.info("Step 3: Initializing Gemini AI")
         print("\n🤖 Step 3: Initializing Gemini AI model...")
 
-        # Get API key from environment variable
-        api_key = os.environ.get('GOOGLE_API_KEY') or os.environ.get('GEMINI_API_KEY')
-
         if not api_key:
             error_msg = "GOOGLE_API_KEY not found in environment variables"
             logger.error(error_msg)
@@ -224,20 +272,16 @@ def main():
             print("\nGet your API key from: https://aistudio.google.com/app/apikey")
             raise EmailAssistantError("GOOGLE_API_KEY not configured")
 
-        try:
-            # Initialize Gemini client
-            client = genai.Client(api_key=api_key)
-
-            # Get model name from config
-            model_name = config.get('api_settings', 'gemini_model', 'gemini-2.5-flash-lite')
-
-            logger.info(f"Gemini client initialized: {model_name}")
-            print(f"✅ Gemini client initialized successfully (using {model_name})")
+        if gemini_init_error is not None:
+            log_exception(logger, gemini_init_error, "Gemini initialization failed")
+            metrics.record_error(
+                __name__, type(gemini_init_error).__name__, "Gemini init failed",
+                lambda: ''.join(traceback.format_exception(gemini_init_error))
+            )
+            raise EmailAssistantError(f"Failed to initialize Gemini: {gemini_init_error}")
 
-        except Exception as e:
-            log_exception(logger, e, "Gemini initialization failed")
-            metrics.record_error(__name__, type(e).__name__, "Gemini init failed", traceback.format_exc())
-            raise EmailAssistantError(f"Failed to initialize Gemini: {e}")
+        logger.info(f"Gemini client initialized: {model_name}")
+        print(f"✅ Gemini client initialized successfully (using {model_name})")
 
         # === Step 4: Categorize Emails with Gemini (incremental processing) ===
         logger.info("Step 4: Categorizing emails")
@@ -247,15 +291,19 @@ def main():
         new_emails_count = 0
 
         try:
-            # Load all cached emails first
+            cached_for_run = {}
             if cache_enabled and cache:
+                # Look up only the fetched IDs to decide what still needs categorizing
+                cached_for_run = cache.get_many(e['id'] for e in my_emails)
+
+                # The digest covers the whole cached window, not just this fetch
                 cached_emails_dict = cache.get_all_cached_emails()
                 categorized_emails = list(cached_emails_dict.values())
                 logger.info(f"Loaded {len(categorized_emails)} emails from cache")
                 print(f"  ✓ Loaded {len(categorized_emails)} previously processed emails from cache")
 
             # Categorize only new emails (not in cache)
-            new_emails = [e for e in my_emails if not (cache_enabled and cache and cache.has(e['id']))]
+            new_emails = [e for e in my_emails if e['id'] not in cached_for_run]
             new_emails_count = len(new_emails)
 
             if new_emails_count > 0:
@@ -285,7 +333,7 @@ def main():
                         cache.set(cat_email['id'], cache_data)
                         metrics.record_cache_operation('SET', 'email_categorization', None)
 
-                # Update last fetch timestamp
+                # Update last fetch timestamp only now that the emails are cached
                 if cache_enabled and cache:
                     cache.update_last_fetch_timestamp(datetime.now().isoformat())
                     cache.save()
@@ -296,6 +344,11 @@ def main():
                 logger.info("No new emails to categorize")
                 print("  ℹ️ No new emails to categorize")
 
+            # The fetched delta is fully handled (cached or categorized), so the
+            # next incremental fetch starts from here even if nothing was new
+            if cache_enabled and cache:
+                save_history_id(history_id)
+
             logger.info(f"Total emails: {len(categorized_emails)} ({new_emails_count} new)")
 
         except Exception as e:
@@ -306,7 +359,8 @@ def main():
         # === Step 5: Display Categorization Summary ===
         logger.info("Step 5: Displaying categorization summary")
         print("\n📊 Step 5: Displaying categorization summary...")
-        display_categorized_summary(categorized_emails)
+        grouped = group_by_category(categorized_emails)
+        display_categorized_summary(categorized_emails, grouped=grouped)
 
         # === Step 6: Generate Daily Digest ===
         logger.info("Step 6: Generating daily digest")
@@ -319,7 +373,8 @@ def main():
                 client,
                 model_name,
                 cache=cache if cache_enabled else None,
-                new_emails_count=new_emails_count
+                new_emails_count=new_emails_count,
+                grouped=grouped
             )
             logger.info("Daily digest generation successful")
 
@@ -6,17 +6,37 @@ Handles automated actions for categorized emails:
 - Unsubscribe handling for SPAM emails
 """
 
+import base64
+import functools
 import json
+import re
+import shutil
+import sys
+import tempfile
+import threading
 import time
 import traceback
-from typing import Dict, Any, Optional, List
-from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Any, Optional, List, Tuple, Callable
+from datetime import date, datetime, time as dt_time, timedelta
 
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:  # Optional dependency - fall back to stdlib json
+    _json_loads = json.loads
+
+from .gemini_transport import get_service_tier
 from .logger_utils import setup_logger, log_exception, log_api_call
 from .metrics_utils import get_metrics_tracker
+from .response_cache import get_response_cache
 
-# Initialize logger
+# Initialize logger and metrics tracker
 logger = setup_logger(__name__)
+metrics = get_metrics_tracker()
+
+# Bound once; used for every unsubscribe message
+_b64 = base64.urlsafe_b64encode
 
 
 class AutomationError(Exception):
@@ -24,10 +44,380 @@ class AutomationError(Exception):
     pass
 
 
+# Extraction tasks are narrow structured-output classification, so they run on
+# the smallest Gemini tier by default rather than the main digest model
+DEFAULT_CLASSIFICATION_MODEL = 'gemini-2.5-flash-lite'
+
+# Gemini generation config: request raw JSON so no markdown-fence cleanup is needed;
+# deterministic sampling since the answers are classifications
+_JSON_RESPONSE_CONFIG = {'response_mime_type': 'application/json', 'temperature': 0.0}
+
+# Service tier for the automation sweep and context generation (GEMINI_TIER);
+# results wait for user confirmation, so GEMINI_TIER=flex suits most runs
+GEMINI_SERVICE_TIER = get_service_tier()
+
+# Output budget per task object; bounds latency if generation runs away
+_MAX_OUTPUT_TOKENS_PER_TASK = 256
+
+# Fallback for responses that still arrive wrapped in a ```json fence
+_FENCE = re.compile(r'^```(?:json)?\s*|\s*```$')
+
+# Gemini structured-output schemas (OpenAPI subset) for each task's JSON object
+_NULLABLE_STRING = {'type': 'STRING', 'nullable': True}
+_TASK_SCHEMAS = {
+    'event': {
+        'type': 'OBJECT',
+        'properties': {
+            'has_event': {'type': 'BOOLEAN'},
+            'date': _NULLABLE_STRING,
+            'time': _NULLABLE_STRING,
+            'title': _NULLABLE_STRING,
+            'description': _NULLABLE_STRING,
+        },
+        'required': ['has_event', 'date', 'time', 'title', 'description'],
+    },
+    'autopay': {
+        'type': 'OBJECT',
+        'properties': {
+            'has_autopay': {'type': 'BOOLEAN'},
+            'due_date': _NULLABLE_STRING,
+            'amount': _NULLABLE_STRING,
+        },
+        'required': ['has_autopay', 'due_date', 'amount'],
+    },
+    'spam': {
+        'type': 'OBJECT',
+        'properties': {
+            'is_spam': {'type': 'BOOLEAN'},
+            'confidence': {'type': 'STRING', 'enum': ['high', 'medium', 'low']},
+            'unsubscribe_link': _NULLABLE_STRING,
+            'unsubscribe_email': _NULLABLE_STRING,
+            'reason': {'type': 'STRING'},
+        },
+        'required': ['is_spam', 'confidence', 'unsubscribe_link', 'unsubscribe_email', 'reason'],
+    },
+}
+
+
+def _batched_schema(tasks: List[str]) -> Dict[str, Any]:
+    """Build the structured-output schema for a combined multi-task response."""
+    return {
+        'type': 'OBJECT',
+        'properties': {task: _TASK_SCHEMAS[task] for task in tasks},
+        'required': list(tasks),
+    }
+
+# Timings are taken with perf_counter_ns; metrics store seconds
+_NS_PER_SECOND = 1e9
+
+# Cap on in-flight Gemini requests across all worker threads (rate-limit guard)
+MAX_CONCURRENT_GEMINI = 4
+_gemini_slots = threading.BoundedSemaphore(MAX_CONCURRENT_GEMINI)
+
+# Per-task prompt parts, shared by the single-task and batched prompts
+_TASK_PROMPTS = {
+    'event': {
+        'goal': "determine if it contains event information (appointment, birthday invite, meeting, etc.)",
+        'schema': """{
+  "has_event": true/false,
+  "date": "<YYYY-MM-DD format if event exists, otherwise null>",
+  "time": "<HH:MM format if specified, otherwise null>",
+  "title": "<event title if event exists, otherwise null>",
+  "description": "<brief event description if event exists, otherwise null>"
+}""",
+        'rules': """- Set has_event to true ONLY if there's a clear date for an event
+- Date is REQUIRED for has_event=true (must be parseable date)
+- Time is OPTIONAL (set to null if not specified)
+- Look for phrases like: "appointment on", "meet at", "birthday on", "event scheduled for"
+- If no clear event date found, set has_event to false"""
+    },
+    'autopay': {
+        'goal': "determine if it mentions autopay being enabled or scheduled",
+        'schema': """{
+  "has_autopay": true/false,
+  "due_date": "<YYYY-MM-DD format if bill due date found, otherwise null>",
+  "amount": "<bill amount if found, otherwise null>"
+}""",
+        'rules': """- Set has_autopay to true ONLY if email explicitly mentions:
+  - "autopay enabled", "autopay scheduled", "automatic payment set up"
+  - "will be automatically charged", "auto-debit enabled"
+- Set has_autopay to false if:
+  - No mention of autopay
+  - Email says "autopay not enabled", "manual payment required"
+  - Payment action required from user"""
+    },
+    'spam': {
+        'goal': "determine if it's truly SPAM (unwanted/promotional)",
+        'schema': """{
+  "is_spam": true/false,
+  "confidence": "<high/medium/low>",
+  "unsubscribe_link": "<full URL if found in content, otherwise null>",
+  "unsubscribe_email": "<email address if found, otherwise null>",
+  "reason": "<brief explanation of why it's SPAM or not>"
+}""",
+        'rules': """- Set is_spam to true if:
+  - Unsolicited marketing/promotional content
+  - Suspicious sender or phishing attempt
+  - Unwanted newsletters or mass emails
+- Set is_spam to false if:
+  - Legitimate transactional email (receipts, confirmations)
+  - Personal correspondence
+  - Emails from known services the user likely subscribed to
+- Look for unsubscribe links (usually at bottom): "unsubscribe", "opt-out", "manage preferences"
+- Confidence: high (very certain), medium (likely), low (uncertain)"""
+    },
+}
+
+# Keyword pre-filters: an email matching none of a task's patterns cannot
+# qualify, so the task is answered locally with its negative result
+_MONTH = r'(?:jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\.?\s+\d{1,2}\b'
+_TASK_PREFILTERS = {
+    'event': re.compile(
+        r'\b(?:appointment|meeting|meet|rsvp|invit|schedul|calendar|birthday|event|reservation|webinar)'
+        r'|\b\d{1,2}[:/-]\d{1,2}\b|\b' + _MONTH,
+        re.IGNORECASE
+    ),
+    'autopay': re.compile(r'\b(?:invoice|bill|due|payment|autopay|auto-pay|amount|statement)|\$\d', re.IGNORECASE),
+    'spam': re.compile(r'unsubscribe|opt[-\s]?out|manage (?:your )?preferences', re.IGNORECASE),
+}
+_PREFILTER_NEGATIVE_RESULTS = {
+    'event': {'has_event': False, 'date': None, 'time': None, 'title': None, 'description': None},
+    'autopay': {'has_autopay': False, 'due_date': None, 'amount': None},
+    'spam': {
+        'is_spam': False,
+        'confidence': 'low',
+        'unsubscribe_link': None,
+        'unsubscribe_email': None,
+        'reason': 'No unsubscribe option found (keyword pre-filter)'
+    },
+}
+
+# Per-email block used in every prompt; filled with str.format_map
+_EMAIL_BLOCK_TMPL = "From: {sender}\nSubject: {subject}\nContent: {snippet}"
+
+
+def _escape_braces(text: str) -> str:
+    """Escape literal braces so text can be embedded in a format_map template."""
+    return text.replace('{', '{{').replace('}', '}}')
+
+
+def _task_instructions(task: str) -> str:
+    """Build the response-format and rules section of a task prompt."""
+    parts = _TASK_PROMPTS[task]
+    return f"""Respond ONLY with a valid JSON object (no markdown, no code blocks):
+{parts['schema']}
+
+Rules:
+{parts['rules']}
+
+Only return the JSON object, nothing else."""
+
+
+# Static prompt bodies, built and interned once at import time
+_TASK_PROMPT_TMPLS = {
+    task: sys.intern(
+        f"Analyze the following email and {_escape_braces(parts['goal'])}.\n\n"
+        f"{_EMAIL_BLOCK_TMPL}\n\n"
+        f"{_escape_braces(_task_instructions(task))}"
+    )
+    for task, parts in _TASK_PROMPTS.items()
+}
+
+
+def _email_fields(email: Dict[str, Any]) -> Dict[str, Any]:
+    """Map an email to the fields used by the prompt templates."""
+    return {
+        'sender': email.get('from', 'Unknown'),
+        'subject': email.get('subject', 'No Subject'),
+        'snippet': email.get('snippet', 'No content'),
+    }
+
+
+def _email_block(email: Dict[str, Any]) -> str:
+    """Build the per-email From/Subject/Content block used in every prompt."""
+    return _EMAIL_BLOCK_TMPL.format_map(_email_fields(email))
+
+
+def _build_task_prompt(task: str, email: Dict[str, Any]) -> str:
+    """Build the prompt for a single automation task."""
+    return _TASK_PROMPT_TMPLS[task].format_map(_email_fields(email))
+
+
+def _build_batched_prompt(tasks: List[str], email: Dict[str, Any]) -> str:
+    """Build one prompt that asks for several automation tasks, keyed by task name."""
+    keys = ",\n".join(f'  "{task}": <JSON object for task "{task}">' for task in tasks)
+    sections = "\n\n".join(
+        f'Task "{task}": {_TASK_PROMPTS[task]["goal"]}.\n'
+        f'JSON object for "{task}":\n{_TASK_PROMPTS[task]["schema"]}\n'
+        f'Rules for "{task}":\n{_TASK_PROMPTS[task]["rules"]}'
+        for task in tasks
+    )
+    return f"""Analyze the following email and complete each task below.
+
+{_email_block(email)}
+
+Respond ONLY with a valid JSON object (no markdown, no code blocks) with one key per task:
+{{
+{keys}
+}}
+
+{sections}
+
+Only return the JSON object, nothing else."""
+
+
+def gemini_call(func: Callable[..., Any]) -> Callable[..., Any]:
+    """
+    Decorator for functions that issue one Gemini request.
+
+    The wrapper takes a concurrency slot, times the call with perf_counter_ns, and
+    logs and records metrics for the outcome. The decorated function is called
+    with two extra keyword arguments that the wrapper consumes:
+    op_name (metrics operation name) and description (log label).
+
+    Returns:
+        Callable: Wrapped function returning the result, or None on failure
+    """
+    @functools.wraps(func)
+    def wrapper(*args, op_name: str, description: str, **kwargs):
+        with _gemini_slots:
+            start_ns = time.perf_counter_ns()
+            try:
+                result = func(*args, **kwargs)
+            except Exception as e:
+                elapsed = (time.perf_counter_ns() - start_ns) / _NS_PER_SECOND
+                error_msg = f"Gemini API call failed for {description}: {e}"
+                logger.error(error_msg)
+                log_api_call(logger, "Gemini", False)
+                metrics.record_api_call("Gemini", op_name, False, False, elapsed)
+                metrics.record_error(__name__, type(e).__name__, error_msg)
+                return None
+            elapsed = (time.perf_counter_ns() - start_ns) / _NS_PER_SECOND
+
+        log_api_call(logger, "Gemini", True)
+        metrics.record_api_call("Gemini", op_name, True, False, elapsed)
+        return result
+
+    return wrapper
+
+
+@gemini_call
+def _generate(client: Any, model_name: str, prompt: str, config: Dict[str, Any]) -> Any:
+    """Issue a single generate_content request."""
+    return client.models.generate_content(
+        model=model_name,
+        contents=prompt,
+        config=config
+    )
+
+
+def _gemini_json_call(
+    client: Any,
+    model_name: str,
+    prompt: str,
+    op_name: str,
+    description: str,
+    response_schema: Optional[Dict[str, Any]] = None,
+    max_output_tokens: int = _MAX_OUTPUT_TOKENS_PER_TASK
+) -> Optional[Dict[str, Any]]:
+    """
+    Send a prompt to Gemini in JSON mode and parse the response.
+
+    Args:
+        client: Initialized Gemini client instance (google.genai.Client)
+        model_name: Name of the Gemini model to use
+        prompt: Prompt text
+        op_name: Operation name recorded in metrics
+        description: Human-readable operation name for log messages
+        response_schema: Structured-output schema the response must follow (optional)
+        max_output_tokens: Output token cap for the response
+
+    Returns:
+        dict: Parsed JSON response, or None if the call or parsing fails
+    """
+    config = dict(_JSON_RESPONSE_CONFIG)
+    config['max_output_tokens'] = max_output_tokens
+    if GEMINI_SERVICE_TIER:
+        config['service_tier'] = GEMINI_SERVICE_TIER
+    if response_schema:
+        config['response_schema'] = response_schema
+
+    response = _generate(client, model_name, prompt, config, op_name=op_name, description=description)
+    if response is None:
+        return None
+
+    try:
+        response_text = _FENCE.sub('', response.text.strip())
+
+        try:
+            return _json_loads(response_text)
+
+        except ValueError as e:  # json.JSONDecodeError and orjson.JSONDecodeError
+            error_msg = f"Invalid JSON in {description}: {e}"
+            logger.error(f"{error_msg}\nResponse text: {response_text[:200]}")
+            metrics.record_error(__name__, "JSONDecodeError", error_msg)
+            return None
+
+    except Exception as e:
+        log_exception(logger, e, f"Error in {description}")
+        metrics.record_error(__name__, type(e).__name__, str(e), traceback.format_exc())
+        return None
+
+
+def _prefiltered_result(task: str, email: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Answer a task without Gemini when the email has none of the task's keywords.
+
+    Returns:
+        dict: The task's negative result, or None if the email needs a Gemini call
+    """
+    text = f"{email.get('subject') or ''} {email.get('snippet') or ''}"
+    if _TASK_PREFILTERS[task].search(text):
+        return None
+    logger.debug(f"Skipping {task} analysis (no keyword match): {(email.get('subject') or 'No Subject')[:50]}")
+    return dict(_PREFILTER_NEGATIVE_RESULTS[task])
+
+
+def _run_task(
+    task: str,
+    email: Dict[str, Any],
+    client: Any,
+    model_name: str,
+    op_name: str,
+    description: str
+) -> Optional[Dict[str, Any]]:
+    """
+    Run a single automation task.
+
+    Results are served from the response cache when the same email content was
+    analyzed before, and emails failing the task's keyword pre-filter are
+    answered locally.
+    """
+    prefiltered = _prefiltered_result(task, email)
+    if prefiltered is not None:
+        return prefiltered
+
+    response_cache = get_response_cache()
+    cached = response_cache.get(task, email)
+    if cached is not None:
+        log_api_call(logger, "Gemini", True, cached=True)
+        metrics.record_api_call("Gemini", op_name, True, True, 0.0)
+        return cached
+
+    result = _gemini_json_call(
+        client, model_name, _build_task_prompt(task, email), op_name, description,
+        response_schema=_TASK_SCHEMAS[task]
+    )
+
+    if result is not None:
+        response_cache.set(task, email, result)
+    return result
+
+
 def extract_event_details(
     email: Dict[str, Any],
     client: Any,
-    model_name: str
+    classification_model: str = DEFAULT_CLASSIFICATION_MODEL
 ) -> Optional[Dict[str, Any]]:
     """
     Extract event details (date, time, description) from email using Gemini.
@@ -38,7 +428,7 @@ def extract_event_details(
     Args:
         email: Categorized email dictionary
         client: Initialized Gemini client instance (google.genai.Client)
-        model_name: Name of the Gemini model to use
+        classification_model: Gemini model for the extraction (a small, fast tier)
 
     Returns:
         dict: Event details with keys:
@@ -49,86 +439,18 @@ def extract_event_details(
             - description: str (event description)
         None if extraction fails or no event found
     """
-    logger.debug(f"Extracting event details from: {email.get('subject', 'No Subject')[:50]}")
-    start_time = time.time()
-    metrics = get_metrics_tracker()
-
-    prompt = f"""Analyze the following email and determine if it contains event information (appointment, birthday invite, meeting, etc.).
-
-From: {email.get('from', 'Unknown')}
-Subject: {email.get('subject', 'No Subject')}
-Content: {email.get('snippet', 'No content')}
-
-Respond ONLY with a valid JSON object (no markdown, no code blocks):
-{{
-  "has_event": true/false,
-  "date": "<YYYY-MM-DD format if event exists, otherwise null>",
-  "time": "<HH:MM format if specified, otherwise null>",
-  "title": "<event title if event exists, otherwise null>",
-  "description": "<brief event description if event exists, otherwise null>"
-}}
-
-Rules:
-- Set has_event to true ONLY if there's a clear date for an event
-- Date is REQUIRED for has_event=true (must be parseable date)
-- Time is OPTIONAL (set to null if not specified)
-- Look for phrases like: "appointment on", "meet at", "birthday on", "event scheduled for"
-- If no clear event date found, set has_event to false
-
-Only return the JSON object, nothing else."""
-
-    try:
-        # Generate response from Gemini
-        try:
-            response = client.models.generate_content(model=model_name, contents=prompt)
-            elapsed = time.time() - start_time
-
-            log_api_call(logger, "Gemini", True)
-            metrics.record_api_call("Gemini", "extract_event_details", True, False, elapsed)
-
-        except Exception as e:
-            elapsed = time.time() - start_time
-            error_msg = f"Gemini API call failed for event extraction: {e}"
-            logger.error(error_msg)
-            log_api_call(logger, "Gemini", False)
-            metrics.record_api_call("Gemini", "extract_event_details", False, False, elapsed)
-            metrics.record_error(__name__, type(e).__name__, error_msg)
-            raise AutomationError(error_msg)
-
-        response_text = response.text.strip()
-
-        # Clean markdown code blocks
-        if response_text.startswith('```json'):
-            response_text = response_text[7:]
-        if response_text.startswith('```'):
-            response_text = response_text[3:]
-        if response_text.endswith('```'):
-            response_text = response_text[:-3]
-        response_text = response_text.strip()
-
-        # Parse JSON response
-        try:
-            event_data = json.loads(response_text)
-            logger.debug(f"Event extraction result: has_event={event_data.get('has_event')}")
-            return event_data
-
-        except json.JSONDecodeError as e:
-            error_msg = f"Invalid JSON in event extraction: {e}"
-            logger.error(f"{error_msg}\nResponse text: {response_text[:200]}")
-            metrics.record_error(__name__, "JSONDecodeError", error_msg)
-            return None
+    logger.debug(f"Extracting event details from: {(email.get('subject') or 'No Subject')[:50]}")
 
-    except Exception as e:
-        if not isinstance(e, AutomationError):
-            log_exception(logger, e, "Error extracting event details")
-            metrics.record_error(__name__, type(e).__name__, str(e), traceback.format_exc())
-        return None
+    event_data = _run_task('event', email, client, classification_model, "extract_event_details", "event extraction")
+    if event_data is not None:
+        logger.debug(f"Event extraction result: has_event={event_data.get('has_event')}")
+    return event_data
 
 
 def check_autopay_scheduled(
     email: Dict[str, Any],
     client: Any,
-    model_name: str
+    classification_model: str = DEFAULT_CLASSIFICATION_MODEL
 ) -> Optional[Dict[str, Any]]:
     """
     Check if bill-due email has autopay scheduled using Gemini.
@@ -138,7 +460,7 @@ def check_autopay_scheduled(
     Args:
         email: Categorized email dictionary
         client: Initialized Gemini client instance (google.genai.Client)
-        model_name: Name of the Gemini model to use
+        classification_model: Gemini model for the extraction (a small, fast tier)
 
     Returns:
         dict: Autopay check result with keys:
@@ -147,86 +469,18 @@ def check_autopay_scheduled(
             - amount: str (bill amount if found, otherwise null)
         None if check fails
     """
-    logger.debug(f"Checking autopay status for: {email.get('subject', 'No Subject')[:50]}")
-    start_time = time.time()
-    metrics = get_metrics_tracker()
-
-    prompt = f"""Analyze the following email and determine if it mentions autopay being enabled or scheduled.
-
-From: {email.get('from', 'Unknown')}
-Subject: {email.get('subject', 'No Subject')}
-Content: {email.get('snippet', 'No content')}
-
-Respond ONLY with a valid JSON object (no markdown, no code blocks):
-{{
-  "has_autopay": true/false,
-  "due_date": "<YYYY-MM-DD format if bill due date found, otherwise null>",
-  "amount": "<bill amount if found, otherwise null>"
-}}
+    logger.debug(f"Checking autopay status for: {(email.get('subject') or 'No Subject')[:50]}")
 
-Rules:
-- Set has_autopay to true ONLY if email explicitly mentions:
-  - "autopay enabled", "autopay scheduled", "automatic payment set up"
-  - "will be automatically charged", "auto-debit enabled"
-- Set has_autopay to false if:
-  - No mention of autopay
-  - Email says "autopay not enabled", "manual payment required"
-  - Payment action required from user
-
-Only return the JSON object, nothing else."""
-
-    try:
-        # Generate response from Gemini
-        try:
-            response = client.models.generate_content(model=model_name, contents=prompt)
-            elapsed = time.time() - start_time
-
-            log_api_call(logger, "Gemini", True)
-            metrics.record_api_call("Gemini", "check_autopay", True, False, elapsed)
-
-        except Exception as e:
-            elapsed = time.time() - start_time
-            error_msg = f"Gemini API call failed for autopay check: {e}"
-            logger.error(error_msg)
-            log_api_call(logger, "Gemini", False)
-            metrics.record_api_call("Gemini", "check_autopay", False, False, elapsed)
-            metrics.record_error(__name__, type(e).__name__, error_msg)
-            raise AutomationError(error_msg)
-
-        response_text = response.text.strip()
-
-        # Clean markdown code blocks
-        if response_text.startswith('```json'):
-            response_text = response_text[7:]
-        if response_text.startswith('```'):
-            response_text = response_text[3:]
-        if response_text.endswith('```'):
-            response_text = response_text[:-3]
-        response_text = response_text.strip()
-
-        # Parse JSON response
-        try:
-            autopay_data = json.loads(response_text)
-            logger.debug(f"Autopay check result: has_autopay={autopay_data.get('has_autopay')}")
-            return autopay_data
-
-        except json.JSONDecodeError as e:
-            error_msg = f"Invalid JSON in autopay check: {e}"
-            logger.error(f"{error_msg}\nResponse text: {response_text[:200]}")
-            metrics.record_error(__name__, "JSONDecodeError", error_msg)
-            return None
-
-    except Exception as e:
-        if not isinstance(e, AutomationError):
-            log_exception(logger, e, "Error checking autopay status")
-            metrics.record_error(__name__, type(e).__name__, str(e), traceback.format_exc())
-        return None
+    autopay_data = _run_task('autopay', email, client, classification_model, "check_autopay", "autopay check")
+    if autopay_data is not None:
+        logger.debug(f"Autopay check result: has_autopay={autopay_data.get('has_autopay')}")
+    return autopay_data
 
 
 def verify_spam_and_extract_unsubscribe(
     email: Dict[str, Any],
     client: Any,
-    model_name: str
+    classification_model: str = DEFAULT_CLASSIFICATION_MODEL
 ) -> Optional[Dict[str, Any]]:
     """
     Verify if email is SPAM and extract unsubscribe information using Gemini.
@@ -236,7 +490,7 @@ def verify_spam_and_extract_unsubscribe(
     Args:
         email: Categorized email dictionary
         client: Initialized Gemini client instance (google.genai.Client)
-        model_name: Name of the Gemini model to use
+        classification_model: Gemini model for the extraction (a small, fast tier)
 
     Returns:
         dict: SPAM verification result with keys:
@@ -247,86 +501,546 @@ def verify_spam_and_extract_unsubscribe(
             - reason: str (why it's classified as SPAM)
         None if verification fails
     """
-    logger.debug(f"Verifying SPAM status for: {email.get('subject', 'No Subject')[:50]}")
-    start_time = time.time()
-    metrics = get_metrics_tracker()
+    logger.debug(f"Verifying SPAM status for: {(email.get('subject') or 'No Subject')[:50]}")
 
-    prompt = f"""Analyze the following email and determine if it's truly SPAM (unwanted/promotional).
+    spam_data = _run_task('spam', email, client, classification_model, "verify_spam", "SPAM verification")
+    if spam_data is not None:
+        logger.debug(f"SPAM verification result: is_spam={spam_data.get('is_spam')}, confidence={spam_data.get('confidence')}")
+    return spam_data
 
-From: {email.get('from', 'Unknown')}
-Subject: {email.get('subject', 'No Subject')}
-Content: {email.get('snippet', 'No content')}
 
-Respond ONLY with a valid JSON object (no markdown, no code blocks):
-{{
-  "is_spam": true/false,
-  "confidence": "<high/medium/low>",
-  "unsubscribe_link": "<full URL if found in content, otherwise null>",
-  "unsubscribe_email": "<email address if found, otherwise null>",
-  "reason": "<brief explanation of why it's SPAM or not>"
-}}
+# Single-task extractor for each automation task
+_TASK_EXTRACTORS = {
+    'event': extract_event_details,
+    'autopay': check_autopay_scheduled,
+    'spam': verify_spam_and_extract_unsubscribe,
+}
 
-Rules:
-- Set is_spam to true if:
-  - Unsolicited marketing/promotional content
-  - Suspicious sender or phishing attempt
-  - Unwanted newsletters or mass emails
-- Set is_spam to false if:
-  - Legitimate transactional email (receipts, confirmations)
-  - Personal correspondence
-  - Emails from known services the user likely subscribed to
-- Look for unsubscribe links (usually at bottom): "unsubscribe", "opt-out", "manage preferences"
-- Confidence: high (very certain), medium (likely), low (uncertain)
 
-Only return the JSON object, nothing else."""
+def analyze_email_batched(
+    email: Dict[str, Any],
+    client: Any,
+    classification_model: str = DEFAULT_CLASSIFICATION_MODEL,
+    *,
+    tasks: List[str]
+) -> Dict[str, Optional[Dict[str, Any]]]:
+    """
+    Run several automation extractions for one email in a single Gemini call.
+
+    When only one task applies, the regular single-task prompt is used. When
+    several apply, their prompts are combined and Gemini returns one JSON object
+    keyed by task name.
+
+    Args:
+        email: Categorized email dictionary
+        client: Initialized Gemini client instance (google.genai.Client)
+        classification_model: Gemini model for the extraction (a small, fast tier)
+        tasks: Task names to run ('event', 'autopay', 'spam')
+
+    Returns:
+        dict: Task name -> extraction result (same shape as the single-task
+              functions), or None for a task that failed. Tasks already in the
+              response cache or ruled out by the keyword pre-filter are
+              answered without an API call.
+    """
+    # Serve previously analyzed email content from the response cache
+    response_cache = get_response_cache()
+    results = {}
+    pending = []
+    for task in tasks:
+        prefiltered = _prefiltered_result(task, email)
+        if prefiltered is not None:
+            results[task] = prefiltered
+            continue
+        cached = response_cache.get(task, email)
+        if cached is not None:
+            log_api_call(logger, "Gemini", True, cached=True)
+            metrics.record_api_call("Gemini", "analyze_email_batched", True, True, 0.0)
+            results[task] = cached
+        else:
+            pending.append(task)
+
+    if not pending:
+        return results
+
+    if len(pending) == 1:
+        task = pending[0]
+        results[task] = _TASK_EXTRACTORS[task](email, client, classification_model)
+        return results
+
+    logger.debug(f"Running batched automation analysis {pending} for: {(email.get('subject') or 'No Subject')[:50]}")
+
+    combined = _gemini_json_call(
+        client, classification_model, _build_batched_prompt(pending, email),
+        "analyze_email_batched", "batched automation analysis",
+        response_schema=_batched_schema(pending),
+        max_output_tokens=_MAX_OUTPUT_TOKENS_PER_TASK * len(pending)
+    )
+    if not isinstance(combined, dict):
+        combined = {}
+
+    for task in pending:
+        result = combined.get(task)
+        results[task] = result if isinstance(result, dict) else None
+        if results[task] is not None:
+            response_cache.set(task, email, results[task])
+    return results
+
+
+# Gemini Batch Mode: terminal job states and default polling cadence
+_BATCH_JOB_DONE_STATES = {
+    'JOB_STATE_SUCCEEDED', 'JOB_STATE_PARTIALLY_SUCCEEDED',
+    'JOB_STATE_FAILED', 'JOB_STATE_CANCELLED', 'JOB_STATE_EXPIRED',
+}
+BATCH_POLL_INTERVAL_SECONDS = 30
+BATCH_TIMEOUT_SECONDS = 24 * 60 * 60
+
+
+def _batch_request_line(key: str, task: str, email: Dict[str, Any]) -> str:
+    """Build one JSONL line of a Gemini Batch Mode input file."""
+    return json.dumps({
+        'key': key,
+        'request': {
+            'contents': [{'role': 'user', 'parts': [{'text': _build_task_prompt(task, email)}]}],
+            'generationConfig': {
+                'responseMimeType': 'application/json',
+                'responseSchema': _TASK_SCHEMAS[task],
+                'temperature': _JSON_RESPONSE_CONFIG['temperature'],
+                'maxOutputTokens': _MAX_OUTPUT_TOKENS_PER_TASK,
+            },
+        },
+    })
+
 
+def _parse_batch_result_line(line: str) -> Tuple[Optional[str], Optional[Dict[str, Any]]]:
+    """Parse one JSONL line of a Batch Mode result file into (key, result)."""
+    record = _json_loads(line)
+    key = record.get('key')
     try:
-        # Generate response from Gemini
-        try:
-            response = client.models.generate_content(model=model_name, contents=prompt)
-            elapsed = time.time() - start_time
+        text = record['response']['candidates'][0]['content']['parts'][0]['text']
+        result = _json_loads(_FENCE.sub('', text.strip()))
+    except (KeyError, IndexError, TypeError, ValueError):
+        logger.warning(f"No usable batch result for {key}: {record.get('error')}")
+        return key, None
+    return key, result if isinstance(result, dict) else None
 
-            log_api_call(logger, "Gemini", True)
-            metrics.record_api_call("Gemini", "verify_spam", True, False, elapsed)
 
-        except Exception as e:
-            elapsed = time.time() - start_time
-            error_msg = f"Gemini API call failed for SPAM verification: {e}"
-            logger.error(error_msg)
-            log_api_call(logger, "Gemini", False)
-            metrics.record_api_call("Gemini", "verify_spam", False, False, elapsed)
-            metrics.record_error(__name__, type(e).__name__, error_msg)
-            raise AutomationError(error_msg)
-
-        response_text = response.text.strip()
-
-        # Clean markdown code blocks
-        if response_text.startswith('```json'):
-            response_text = response_text[7:]
-        if response_text.startswith('```'):
-            response_text = response_text[3:]
-        if response_text.endswith('```'):
-            response_text = response_text[:-3]
-        response_text = response_text.strip()
-
-        # Parse JSON response
-        try:
-            spam_data = json.loads(response_text)
-            logger.debug(f"SPAM verification result: is_spam={spam_data.get('is_spam')}, confidence={spam_data.get('confidence')}")
-            return spam_data
+def analyze_emails_batch_mode(
+    email_tasks: List[Tuple[Dict[str, Any], List[str]]],
+    client: Any,
+    classification_model: str = DEFAULT_CLASSIFICATION_MODEL,
+    poll_interval: float = BATCH_POLL_INTERVAL_SECONDS,
+    timeout: float = BATCH_TIMEOUT_SECONDS
+) -> List[Dict[str, Optional[Dict[str, Any]]]]:
+    """
+    Run automation extractions for many emails as one Gemini Batch Mode job.
 
-        except json.JSONDecodeError as e:
-            error_msg = f"Invalid JSON in SPAM verification: {e}"
-            logger.error(f"{error_msg}\nResponse text: {response_text[:200]}")
-            metrics.record_error(__name__, "JSONDecodeError", error_msg)
-            return None
+    Batch Mode is billed at a discount and has higher rate limits, but jobs
+    may take up to 24 hours; use it for non-interactive sweeps. Requests are
+    written to a JSONL file keyed "<task>::<email id>", uploaded, processed as
+    a batch job, and the result file is demultiplexed back per email.
+    Pre-filtered and cached tasks are answered without entering the job.
+
+    Args:
+        email_tasks: List of (email, task names) tuples
+        client: Initialized Gemini client instance (google.genai.Client)
+        classification_model: Gemini model for the extraction
+        poll_interval: Seconds between job status checks
+        timeout: Maximum seconds to wait for the job
+
+    Returns:
+        list: One dict per input email mapping task name -> result (None on failure)
+    """
+    response_cache = get_response_cache()
+    results = [{} for _ in email_tasks]
+    pending = {}
+
+    for index, (email, tasks) in enumerate(email_tasks):
+        for task in tasks:
+            result = _prefiltered_result(task, email)
+            if result is None:
+                result = response_cache.get(task, email)
+            if result is not None:
+                results[index][task] = result
+            else:
+                results[index][task] = None
+                pending[f"{task}::{email.get('id', index)}"] = (index, task, email)
+
+    if not pending:
+        return results
+
+    logger.info(f"Submitting Gemini batch job with {len(pending)} requests")
+    start_ns = time.perf_counter_ns()
+    success = False
+    batch_dir = Path(tempfile.mkdtemp(prefix='gemini_batch_'))
+
+    try:
+        input_path = batch_dir / 'requests.jsonl'
+        input_path.write_text(
+            '\n'.join(_batch_request_line(key, task, email) for key, (_, task, email) in pending.items()),
+            encoding='utf-8'
+        )
+
+        uploaded = client.files.upload(
+            file=str(input_path),
+            config={'display_name': 'email-assistant-automation', 'mime_type': 'jsonl'}
+        )
+        job = client.batches.create(
+            model=classification_model,
+            src=uploaded.name,
+            config={'display_name': 'email-assistant-automation'}
+        )
+
+        deadline = time.monotonic() + timeout
+        state = getattr(job.state, 'name', str(job.state))
+        while state not in _BATCH_JOB_DONE_STATES:
+            if time.monotonic() >= deadline:
+                raise AutomationError(f"Gemini batch job {job.name} did not finish within {timeout}s")
+            time.sleep(poll_interval)
+            job = client.batches.get(name=job.name)
+            state = getattr(job.state, 'name', str(job.state))
+
+        if state not in ('JOB_STATE_SUCCEEDED', 'JOB_STATE_PARTIALLY_SUCCEEDED'):
+            raise AutomationError(f"Gemini batch job {job.name} ended in {state}: {job.error}")
+
+        content = client.files.download(file=job.dest.file_name)
+        for line in content.decode('utf-8').splitlines():
+            if not line.strip():
+                continue
+            key, result = _parse_batch_result_line(line)
+            if key in pending and result is not None:
+                index, task, email = pending[key]
+                results[index][task] = result
+                response_cache.set(task, email, result)
+
+        success = True
+        logger.info(f"Gemini batch job {job.name} complete ({state})")
 
     except Exception as e:
-        if not isinstance(e, AutomationError):
-            log_exception(logger, e, "Error verifying SPAM status")
+        log_exception(logger, e, "Gemini batch job failed")
+        metrics.record_error(__name__, type(e).__name__, str(e), traceback.format_exc())
+
+    finally:
+        shutil.rmtree(batch_dir, ignore_errors=True)
+        elapsed = (time.perf_counter_ns() - start_ns) / _NS_PER_SECOND
+        log_api_call(logger, "Gemini", success)
+        metrics.record_api_call("Gemini", "batch_job", success, False, elapsed)
+
+    return results
+
+
+# Google batch endpoints accept at most 50 sub-requests per call (Calendar limit)
+_GOOGLE_BATCH_LIMIT = 50
+
+
+def _run_write_batch(
+    service: Any,
+    items: List[Tuple[Dict[str, Any], Dict[str, Any]]],
+    build_request: Callable[[Any, Dict[str, Any], Dict[str, Any]], Any],
+    api_name: str,
+    op_name: str,
+    failure_message: str,
+    success_message: Callable[[Dict[str, Any]], str]
+) -> List[bool]:
+    """
+    Build and execute Google API write requests, pipelining them via BatchHttpRequest.
+
+    A single request is executed directly; larger sets are sent in batches of
+    _GOOGLE_BATCH_LIMIT sub-requests per HTTP round-trip.
+
+    Args:
+        service: Google API service instance used to build the requests
+        items: List of (details, email) tuples
+        build_request: Returns the unexecuted HttpRequest for one item,
+                       or None if the item cannot be submitted
+        api_name: API name for logging/metrics
+        op_name: Operation name for metrics
+        failure_message: Log message used when an item fails
+        success_message: Builds the log message from the API response
+
+    Returns:
+        list: One bool per item, True if that write succeeded
+    """
+    outcomes = [False] * len(items)
+    pending = []
+    api_records = []
+
+    for index, (details, email) in enumerate(items):
+        try:
+            request = build_request(service, details, email)
+        except Exception as e:
+            log_exception(logger, e, failure_message)
             metrics.record_error(__name__, type(e).__name__, str(e), traceback.format_exc())
+            continue
+        if request is not None:
+            pending.append((index, request))
+
+    def _record(index, response, exception, elapsed):
+        if exception is None:
+            outcomes[index] = True
+            logger.info(success_message(response or {}))
+            log_api_call(logger, api_name, True)
+            api_records.append((api_name, op_name, True, False, elapsed))
+        else:
+            log_exception(logger, exception, failure_message)
+            log_api_call(logger, api_name, False)
+            api_records.append((api_name, op_name, False, False, elapsed))
+            metrics.record_error(
+                __name__, type(exception).__name__, str(exception),
+                lambda: ''.join(traceback.format_exception(type(exception), exception, exception.__traceback__))
+            )
+
+    try:
+        if len(pending) == 1:
+            index, request = pending[0]
+            start_ns = time.perf_counter_ns()
+            try:
+                response, exception = request.execute(), None
+            except Exception as e:
+                response, exception = None, e
+            _record(index, response, exception, (time.perf_counter_ns() - start_ns) / _NS_PER_SECOND)
+        else:
+            _execute_in_batches(service, pending, _record)
+    finally:
+        # One metrics transaction for the whole set of writes
+        metrics.record_api_calls(api_records)
+
+    return outcomes
+
+
+def _execute_in_batches(
+    service: Any,
+    pending: List[Tuple[int, Any]],
+    record: Callable[[int, Any, Optional[Exception], float], None]
+) -> None:
+    """
+    Execute requests through BatchHttpRequest, _GOOGLE_BATCH_LIMIT per round-trip.
+
+    Args:
+        service: Google API service instance that built the requests
+        pending: List of (item index, unexecuted HttpRequest) tuples
+        record: Called with (index, response, exception, elapsed seconds) per request
+    """
+    for chunk_start in range(0, len(pending), _GOOGLE_BATCH_LIMIT):
+        chunk = pending[chunk_start:chunk_start + _GOOGLE_BATCH_LIMIT]
+        responses = {}
+
+        def _on_response(request_id, response, exception, responses=responses):
+            responses[int(request_id)] = (response, exception)
+
+        batch = service.new_batch_http_request(callback=_on_response)
+        for index, request in chunk:
+            batch.add(request, request_id=str(index))
+
+        start_ns = time.perf_counter_ns()
+        try:
+            batch.execute()
+        except Exception as e:
+            # Transport-level failure: every sub-request without a response failed
+            for index, _ in chunk:
+                responses.setdefault(index, (None, e))
+        elapsed = (time.perf_counter_ns() - start_ns) / _NS_PER_SECOND
+
+        for index, _ in chunk:
+            response, exception = responses.get(
+                index, (None, AutomationError("No response returned for batched request"))
+            )
+            record(index, response, exception, elapsed)
+
+
+# Calendar event settings shared by every created event
+EVENT_TIMEZONE = 'America/Los_Angeles'
+_REMINDERS = {
+    'useDefault': False,
+    'overrides': [
+        {'method': 'email', 'minutes': 24 * 60},  # 1 day before
+        {'method': 'popup', 'minutes': 24 * 60},  # 1 day before
+    ],
+}
+
+
+def _timed_event(start: datetime, title: str, description: str) -> Dict[str, Any]:
+    """Build a one-hour Calendar event body starting at start."""
+    return {
+        'summary': title,
+        'description': description,
+        'start': {'dateTime': start.isoformat(), 'timeZone': EVENT_TIMEZONE},
+        'end': {'dateTime': (start + timedelta(hours=1)).isoformat(), 'timeZone': EVENT_TIMEZONE},
+        'reminders': _REMINDERS,
+    }
+
+
+def _all_day_event(day: date, title: str, description: str) -> Dict[str, Any]:
+    """Build an all-day Calendar event body (date-only, no time zone)."""
+    return {
+        'summary': title,
+        'description': description,
+        'start': {'date': day.isoformat()},
+        'end': {'date': (day + timedelta(days=1)).isoformat()},
+        'reminders': _REMINDERS,
+    }
+
+
+def _build_calendar_event_request(
+    service: Any,
+    event_details: Dict[str, Any],
+    email: Dict[str, Any]
+) -> Any:
+    """Build the Calendar insert request for one event (None if no date)."""
+    logger.info(f"Creating calendar event: {event_details.get('title')}")
+
+    # Parse date and time
+    event_date = event_details.get('date')
+    event_time = event_details.get('time')
+
+    if not event_date:
+        logger.error("Cannot create calendar event: date is required")
         return None
 
+    title = event_details.get('title', email.get('subject'))
+    description = event_details.get('description', f"From email: {email.get('subject')}")
+
+    # Parse each component once; time accepts HH:MM or HH:MM:SS
+    start_date = date.fromisoformat(event_date)
+    if event_time:
+        start = datetime.combine(start_date, dt_time.fromisoformat(event_time))
+        event = _timed_event(start, title, description)
+    else:
+        event = _all_day_event(start_date, title, description)
+
+    return service.events().insert(calendarId='primary', body=event)
+
+
+def _build_task_request(
+    service: Any,
+    task_details: Dict[str, Any],
+    email: Dict[str, Any]
+) -> Any:
+    """Build the Tasks insert request for one bill email."""
+    subject = email.get('subject')
+    logger.info(f"Creating task: {(subject or 'No Subject')[:50]}")
+
+    # Build task object
+    task = {
+        'title': subject or 'Bill Payment',
+        'notes': f"From: {email.get('from') or 'Unknown'}\nAmount: {task_details.get('amount') or 'N/A'}\n\n{email.get('snippet') or ''}",
+    }
+
+    # Add due date if available
+    if task_details.get('due_date'):
+        task['due'] = f"{task_details['due_date']}T00:00:00.000Z"
+
+    return service.tasks().insert(tasklist='@default', body=task)
+
+
+# Fixed headers of every unsubscribe message (UTF-8 text body, sent as 8bit)
+_UNSUBSCRIBE_HEADERS = (
+    'Content-Type: text/plain; charset="utf-8"\r\n'
+    'MIME-Version: 1.0\r\n'
+    'Content-Transfer-Encoding: 8bit\r\n'
+    'Subject: Unsubscribe Request\r\n'
+)
+
+
+def _unsubscribe_message_bytes(to: str, original_subject: str) -> bytes:
+    """Build the RFC 822 bytes of an unsubscribe message without email.mime."""
+    return (
+        f"{_UNSUBSCRIBE_HEADERS}To: {to}\r\n\r\n"
+        f"Please unsubscribe me from this mailing list.\r\n\r\nOriginal Subject: {original_subject}"
+    ).encode('utf-8')
+
+
+def _build_unsubscribe_request(
+    gmail_service: Any,
+    unsubscribe_info: Dict[str, Any],
+    email: Dict[str, Any]
+) -> Any:
+    """Build the Gmail send request for one unsubscribe email (None if no address)."""
+    subject = email.get('subject') or 'No Subject'
+    logger.info(f"Sending unsubscribe request for: {subject[:50]}")
+
+    unsubscribe_email = unsubscribe_info.get('unsubscribe_email')
+
+    if not unsubscribe_email:
+        logger.warning("No unsubscribe email found, cannot send request")
+        return None
+
+    if '\r' in unsubscribe_email or '\n' in unsubscribe_email:
+        logger.warning(f"Rejecting malformed unsubscribe address: {unsubscribe_email!r}")
+        return None
+
+    raw_message = _b64(_unsubscribe_message_bytes(unsubscribe_email, subject)).decode()
+
+    return gmail_service.users().messages().send(
+        userId='me',
+        body={'raw': raw_message}
+    )
+
+
+def create_calendar_events_batch(
+    service: Any,
+    items: List[Tuple[Dict[str, Any], Dict[str, Any]]]
+) -> List[bool]:
+    """
+    Create Google Calendar events (1-day advance reminder) in batched requests.
+
+    Args:
+        service: Authenticated Google API service instance
+        items: List of (event_details, email) tuples, where event_details
+               comes from extract_event_details()
+
+    Returns:
+        list: One bool per item, True if that event was created
+    """
+    return _run_write_batch(
+        service, items, _build_calendar_event_request,
+        "Google Calendar", "create_event", "Failed to create calendar event",
+        lambda created: f"Calendar event created successfully: {created.get('htmlLink')}"
+    )
+
+
+def create_tasks_batch(
+    service: Any,
+    items: List[Tuple[Dict[str, Any], Dict[str, Any]]]
+) -> List[bool]:
+    """
+    Create Google Tasks (without reminder) in batched requests.
+
+    Args:
+        service: Authenticated Google API service instance
+        items: List of (task_details, email) tuples
+
+    Returns:
+        list: One bool per item, True if that task was created
+    """
+    return _run_write_batch(
+        service, items, _build_task_request,
+        "Google Tasks", "create_task", "Failed to create task",
+        lambda created: f"Task created successfully: {created.get('id')}"
+    )
+
+
+def send_unsubscribe_requests_batch(
+    gmail_service: Any,
+    items: List[Tuple[Dict[str, Any], Dict[str, Any]]]
+) -> List[bool]:
+    """
+    Send unsubscribe email requests in batched Gmail requests.
+
+    Args:
+        gmail_service: Authenticated Gmail API service instance
+        items: List of (unsubscribe_info, email) tuples, where unsubscribe_info
+               comes from verify_spam_and_extract_unsubscribe()
+
+    Returns:
+        list: One bool per item, True if that request was sent
+    """
+    return _run_write_batch(
+        gmail_service, items, _build_unsubscribe_request,
+        "Gmail", "send_unsubscribe", "Failed to send unsubscribe request",
+        lambda sent: f"Unsubscribe request sent successfully: {sent.get('id')}"
+    )
+
 
 def create_calendar_event(
     service: Any,
@@ -344,67 +1058,7 @@ def create_calendar_event(
     Returns:
         bool: True if event created successfully, False otherwise
     """
-    logger.info(f"Creating calendar event: {event_details.get('title')}")
-    start_time = time.time()
-    metrics = get_metrics_tracker()
-
-    try:
-        # Parse date and time
-        event_date = event_details.get('date')
-        event_time = event_details.get('time')
-
-        if not event_date:
-            logger.error("Cannot create calendar event: date is required")
-            return False
-
-        # Build event datetime
-        if event_time:
-            start_datetime = f"{event_date}T{event_time}:00"
-            end_datetime = datetime.fromisoformat(start_datetime) + timedelta(hours=1)
-            end_datetime = end_datetime.isoformat()
-        else:
-            # All-day event
-            start_datetime = event_date
-            end_datetime = (datetime.fromisoformat(event_date) + timedelta(days=1)).date().isoformat()
-
-        # Build event object
-        event = {
-            'summary': event_details.get('title', email.get('subject')),
-            'description': event_details.get('description', f"From email: {email.get('subject')}"),
-            'start': {
-                'dateTime' if event_time else 'date': start_datetime,
-                'timeZone': 'America/Los_Angeles',
-            },
-            'end': {
-                'dateTime' if event_time else 'date': end_datetime,
-                'timeZone': 'America/Los_Angeles',
-            },
-            'reminders': {
-                'useDefault': False,
-                'overrides': [
-                    {'method': 'email', 'minutes': 24 * 60},  # 1 day before
-                    {'method': 'popup', 'minutes': 24 * 60},  # 1 day before
-                ],
-            },
-        }
-
-        # Create event via Calendar API
-        created_event = service.events().insert(calendarId='primary', body=event).execute()
-
-        elapsed = time.time() - start_time
-        logger.info(f"Calendar event created successfully: {created_event.get('htmlLink')}")
-        log_api_call(logger, "Google Calendar", True)
-        metrics.record_api_call("Google Calendar", "create_event", True, False, elapsed)
-
-        return True
-
-    except Exception as e:
-        elapsed = time.time() - start_time
-        log_exception(logger, e, "Failed to create calendar event")
-        log_api_call(logger, "Google Calendar", False)
-        metrics.record_api_call("Google Calendar", "create_event", False, False, elapsed)
-        metrics.record_error(__name__, type(e).__name__, str(e), traceback.format_exc())
-        return False
+    return create_calendar_events_batch(service, [(event_details, email)])[0]
 
 
 def create_task(
@@ -423,38 +1077,7 @@ def create_task(
     Returns:
         bool: True if task created successfully, False otherwise
     """
-    logger.info(f"Creating task: {email.get('subject')[:50]}")
-    start_time = time.time()
-    metrics = get_metrics_tracker()
-
-    try:
-        # Build task object
-        task = {
-            'title': email.get('subject', 'Bill Payment'),
-            'notes': f"From: {email.get('from')}\nAmount: {task_details.get('amount', 'N/A')}\n\n{email.get('snippet', '')}",
-        }
-
-        # Add due date if available
-        if task_details.get('due_date'):
-            task['due'] = f"{task_details['due_date']}T00:00:00.000Z"
-
-        # Create task via Tasks API
-        created_task = service.tasks().insert(tasklist='@default', body=task).execute()
-
-        elapsed = time.time() - start_time
-        logger.info(f"Task created successfully: {created_task.get('id')}")
-        log_api_call(logger, "Google Tasks", True)
-        metrics.record_api_call("Google Tasks", "create_task", True, False, elapsed)
-
-        return True
-
-    except Exception as e:
-        elapsed = time.time() - start_time
-        log_exception(logger, e, "Failed to create task")
-        log_api_call(logger, "Google Tasks", False)
-        metrics.record_api_call("Google Tasks", "create_task", False, False, elapsed)
-        metrics.record_error(__name__, type(e).__name__, str(e), traceback.format_exc())
-        return False
+    return create_tasks_batch(service, [(task_details, email)])[0]
 
 
 def send_unsubscribe_request(
@@ -473,44 +1096,4 @@ def send_unsubscribe_request(
     Returns:
         bool: True if unsubscribe request sent successfully, False otherwise
     """
-    logger.info(f"Sending unsubscribe request for: {email.get('subject')[:50]}")
-    start_time = time.time()
-    metrics = get_metrics_tracker()
-
-    try:
-        unsubscribe_email = unsubscribe_info.get('unsubscribe_email')
-
-        if not unsubscribe_email:
-            logger.warning("No unsubscribe email found, cannot send request")
-            return False
-
-        # Build unsubscribe email
-        from email.mime.text import MIMEText
-        import base64
-
-        message = MIMEText(f"Please unsubscribe me from this mailing list.\n\nOriginal Subject: {email.get('subject')}")
-        message['to'] = unsubscribe_email
-        message['subject'] = 'Unsubscribe Request'
-
-        raw_message = base64.urlsafe_b64encode(message.as_bytes()).decode()
-
-        # Send via Gmail API
-        sent_message = gmail_service.users().messages().send(
-            userId='me',
-            body={'raw': raw_message}
-        ).execute()
-
-        elapsed = time.time() - start_time
-        logger.info(f"Unsubscribe request sent successfully: {sent_message.get('id')}")
-        log_api_call(logger, "Gmail", True)
-        metrics.record_api_call("Gmail", "send_unsubscribe", True, False, elapsed)
-
-        return True
-
-    except Exception as e:
-        elapsed = time.time() - start_time
-        log_exception(logger, e, "Failed to send unsubscribe request")
-        log_api_call(logger, "Gmail", False)
-        metrics.record_api_call("Gmail", "send_unsubscribe", False, False, elapsed)
-        metrics.record_error(__name__, type(e).__name__, str(e), traceback.format_exc())
-        return False
+    return send_unsubscribe_requests_batch(gmail_service, [(unsubscribe_info, email)])[0]
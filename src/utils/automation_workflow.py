@@ -3,31 +3,152 @@ Automation Workflow
 Orchestrates automated actions for categorized emails with user confirmation.
 """
 
+import re
+import sys
 import traceback
-from typing import Dict, Any, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, Any, List, Optional, Callable
 
 from .automation_utils import (
-    extract_event_details,
-    check_autopay_scheduled,
+    DEFAULT_CLASSIFICATION_MODEL,
+    MAX_CONCURRENT_GEMINI,
+    analyze_email_batched,
+    analyze_emails_batch_mode,
     verify_spam_and_extract_unsubscribe,
-    create_calendar_event,
-    create_task,
-    send_unsubscribe_request
+    create_calendar_events_batch,
+    create_tasks_batch,
+    send_unsubscribe_requests_batch
 )
 from .logger_utils import setup_logger, log_exception
 from .metrics_utils import get_metrics_tracker
 
-# Initialize logger
+# Initialize logger (per-email log calls use %-style args so filtered levels skip formatting)
 logger = setup_logger(__name__)
 
 
+# Subject keywords marking a bill (substring match keeps "billing"/"payments")
+_BILL_RE = re.compile(r'bill|payment|invoice|\bdue\b', re.IGNORECASE)
+
+# Summary separators
+SEP80 = "=" * 80
+DASH80 = "-" * 80
+
+
+@dataclass(slots=True, frozen=True)
+class EmailView:
+    """Truncated subject/sender strings of an email, computed once for logs and display."""
+
+    subject50: str
+    subject60: str
+    sender50: str
+
+    @classmethod
+    def of(cls, email: Dict[str, Any]) -> 'EmailView':
+        """Build the view of an email dictionary (missing fields become '')."""
+        subject = email.get('subject') or ''
+        return cls(subject[:50], subject[:60], (email.get('from') or '')[:50])
+
+
+def _view(item: Dict[str, Any]) -> EmailView:
+    """Get the EmailView of a result item, building it if the item has none."""
+    return item.get('view') or EmailView.of(item['email'])
+
+
+def _is_bill_email(email: Dict[str, Any]) -> bool:
+    """Check whether an email needs the autopay check."""
+    return email.get('subcategory') == 'Bill-Due' or bool(_BILL_RE.search(email.get('subject') or ''))
+
+
+def _record_email_error(e: Exception, context: str, view: EmailView) -> None:
+    """Log and record a failure confined to a single email."""
+    log_exception(logger, e, f"{context}: {view.subject50}")
+    get_metrics_tracker().record_error(__name__, type(e).__name__, str(e), traceback.format_exc())
+
+
+def _process_single_need_action(
+    email: Dict[str, Any],
+    view: EmailView,
+    tasks: List[str],
+    analysis: Dict[str, Any]
+) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Turn one email's Gemini analysis into pending calendar events and tasks.
+
+    Returns:
+        dict: 'calendar_events' and 'tasks' lists found for this email
+    """
+    found = {'calendar_events': [], 'tasks': []}
+
+    event_details = analysis.get('event')
+    if event_details and event_details.get('has_event') and event_details.get('date'):
+        found['calendar_events'].append({
+            'email': email,
+            'view': view,
+            'event_details': event_details
+        })
+        logger.info("Found calendar event: %s", event_details.get('title'))
+
+    # Check for bill-due without autopay
+    if 'autopay' in tasks:
+        autopay_info = analysis.get('autopay')
+
+        if autopay_info and not autopay_info.get('has_autopay'):
+            found['tasks'].append({
+                'email': email,
+                'view': view,
+                'task_details': autopay_info
+            })
+            logger.info("Found bill-due task (no autopay): %s", view.subject50)
+
+    return found
+
+
+def _process_single_spam(
+    email: Dict[str, Any],
+    view: EmailView,
+    spam_info: Optional[Dict[str, Any]]
+) -> Optional[Dict[str, Any]]:
+    """
+    Turn one email's SPAM verdict into an unsubscribe candidate.
+
+    Returns:
+        dict: Unsubscribe candidate, or None if the email does not qualify
+    """
+    if spam_info and spam_info.get('is_spam') and spam_info.get('confidence') in ['high', 'medium']:
+        if spam_info.get('unsubscribe_link') or spam_info.get('unsubscribe_email'):
+            logger.info("Found unsubscribe candidate: %s", view.subject50)
+            return {
+                'email': email,
+                'view': view,
+                'spam_info': spam_info
+            }
+    return None
+
+
+def _map_emails(func: Callable[[Dict[str, Any]], Any], emails: List[Dict[str, Any]]) -> List[Any]:
+    """
+    Apply func to every email concurrently, preserving input order.
+
+    Gemini calls are I/O-bound, so emails are analyzed on worker threads; the
+    shared MAX_CONCURRENT_GEMINI limit in automation_utils bounds the number
+    of requests in flight.
+    """
+    if len(emails) <= 1:
+        return [func(email) for email in emails]
+
+    with ThreadPoolExecutor(max_workers=min(len(emails), MAX_CONCURRENT_GEMINI)) as executor:
+        return list(executor.map(func, emails))
+
+
 def process_need_action_automations(
     emails: List[Dict[str, Any]],
     gmail_service: Any,
     calendar_service: Any,
     tasks_service: Any,
     gemini_client: Any,
-    model_name: str
+    classification_model: str = DEFAULT_CLASSIFICATION_MODEL,
+    batch: bool = False
 ) -> Dict[str, List[Dict[str, Any]]]:
     """
     Process Need-Action emails for automated calendar events and tasks.
@@ -38,14 +159,17 @@ def process_need_action_automations(
         calendar_service: Authenticated Google Calendar API service
         tasks_service: Authenticated Google Tasks API service
         gemini_client: Initialized Gemini client
-        model_name: Gemini model name
+        classification_model: Gemini model for the extraction calls
+        batch: Submit all extractions as one Gemini Batch Mode job (cheaper,
+               but may take hours) instead of concurrent synchronous calls
 
     Returns:
         dict: Processing results with keys:
             - calendar_events: List of events to create (pending user confirmation)
             - tasks: List of tasks to create (pending user confirmation)
+            Each item holds the 'email', its EmailView ('view') and the extracted details.
     """
-    logger.info(f"Processing {len(emails)} Need-Action emails for automation")
+    logger.info("Processing %d Need-Action emails for automation", len(emails))
     metrics = get_metrics_tracker()
 
     results = {
@@ -54,31 +178,44 @@ def process_need_action_automations(
     }
 
     try:
-        for email in emails:
-            # Check for calendar events (appointments, birthdays)
-            logger.debug(f"Checking for calendar event: {email.get('subject')[:50]}")
-            event_details = extract_event_details(email, gemini_client, model_name)
-
-            if event_details and event_details.get('has_event') and event_details.get('date'):
-                results['calendar_events'].append({
-                    'email': email,
-                    'event_details': event_details
-                })
-                logger.info(f"Found calendar event: {event_details.get('title')}")
-
-            # Check for bill-due without autopay
-            if 'bill' in email.get('subject', '').lower() or 'payment' in email.get('subject', '').lower():
-                logger.debug(f"Checking for bill-due task: {email.get('subject')[:50]}")
-                autopay_info = check_autopay_scheduled(email, gemini_client, model_name)
-
-                if autopay_info and not autopay_info.get('has_autopay'):
-                    results['tasks'].append({
-                        'email': email,
-                        'task_details': autopay_info
-                    })
-                    logger.info(f"Found bill-due task (no autopay): {email.get('subject')[:50]}")
-
-        logger.info(f"Automation processing complete: {len(results['calendar_events'])} events, {len(results['tasks'])} tasks")
+        # Always check for calendar events (appointments, birthdays);
+        # bill-due emails also get an autopay check in the same Gemini call
+        email_tasks = [
+            (email, ['event', 'autopay'] if _is_bill_email(email) else ['event'])
+            for email in emails
+        ]
+        views = [EmailView.of(email) for email in emails]
+
+        if batch:
+            analyses = analyze_emails_batch_mode(email_tasks, gemini_client, classification_model)
+        else:
+            def analyze(item):
+                (email, tasks), view = item
+                logger.debug("Checking automations %s: %s", tasks, view.subject50)
+                try:
+                    return analyze_email_batched(email, gemini_client, classification_model, tasks=tasks)
+                except Exception as e:
+                    _record_email_error(e, "Error analyzing Need-Action email", view)
+                    return None
+
+            analyses = _map_emails(analyze, list(zip(email_tasks, views)))
+
+        # Each email is isolated so one bad analysis doesn't drop the others' results
+        for (email, tasks), view, analysis in zip(email_tasks, views, analyses):
+            if analysis is None:
+                continue
+            try:
+                found = _process_single_need_action(email, view, tasks, analysis)
+            except Exception as e:
+                _record_email_error(e, "Error processing Need-Action email", view)
+                continue
+            results['calendar_events'].extend(found['calendar_events'])
+            results['tasks'].extend(found['tasks'])
+
+        logger.info(
+            "Automation processing complete: %d events, %d tasks",
+            len(results['calendar_events']), len(results['tasks'])
+        )
         return results
 
     except Exception as e:
@@ -91,7 +228,8 @@ def process_spam_automations(
     emails: List[Dict[str, Any]],
     gmail_service: Any,
     gemini_client: Any,
-    model_name: str
+    classification_model: str = DEFAULT_CLASSIFICATION_MODEL,
+    batch: bool = False
 ) -> List[Dict[str, Any]]:
     """
     Process SPAM emails for unsubscribe verification.
@@ -100,30 +238,48 @@ def process_spam_automations(
         emails: List of SPAM categorized emails
         gmail_service: Authenticated Gmail API service
         gemini_client: Initialized Gemini client
-        model_name: Gemini model name
+        classification_model: Gemini model for the extraction calls
+        batch: Submit all verifications as one Gemini Batch Mode job
 
     Returns:
-        list: Unsubscribe candidates (pending user confirmation)
+        list: Unsubscribe candidates (pending user confirmation) with 'email',
+              'view' (EmailView) and 'spam_info'
     """
-    logger.info(f"Processing {len(emails)} SPAM emails for unsubscribe automation")
+    logger.info("Processing %d SPAM emails for unsubscribe automation", len(emails))
     metrics = get_metrics_tracker()
 
     unsubscribe_candidates = []
 
     try:
-        for email in emails:
-            logger.debug(f"Verifying SPAM: {email.get('subject')[:50]}")
-            spam_info = verify_spam_and_extract_unsubscribe(email, gemini_client, model_name)
-
-            if spam_info and spam_info.get('is_spam') and spam_info.get('confidence') in ['high', 'medium']:
-                if spam_info.get('unsubscribe_link') or spam_info.get('unsubscribe_email'):
-                    unsubscribe_candidates.append({
-                        'email': email,
-                        'spam_info': spam_info
-                    })
-                    logger.info(f"Found unsubscribe candidate: {email.get('subject')[:50]}")
-
-        logger.info(f"SPAM processing complete: {len(unsubscribe_candidates)} unsubscribe candidates")
+        views = [EmailView.of(email) for email in emails]
+
+        if batch:
+            analyses = analyze_emails_batch_mode(
+                [(email, ['spam']) for email in emails], gemini_client, classification_model
+            )
+            verdicts = [analysis['spam'] for analysis in analyses]
+        else:
+            def verify(item):
+                email, view = item
+                logger.debug("Verifying SPAM: %s", view.subject50)
+                try:
+                    return verify_spam_and_extract_unsubscribe(email, gemini_client, classification_model)
+                except Exception as e:
+                    _record_email_error(e, "Error verifying SPAM email", view)
+                    return None
+
+            verdicts = _map_emails(verify, list(zip(emails, views)))
+
+        for email, view, spam_info in zip(emails, views, verdicts):
+            try:
+                candidate = _process_single_spam(email, view, spam_info)
+            except Exception as e:
+                _record_email_error(e, "Error processing SPAM email", view)
+                continue
+            if candidate:
+                unsubscribe_candidates.append(candidate)
+
+        logger.info("SPAM processing complete: %d unsubscribe candidates", len(unsubscribe_candidates))
         return unsubscribe_candidates
 
     except Exception as e:
@@ -143,56 +299,99 @@ def display_automation_summary(
         need_action_results: Results from process_need_action_automations()
         spam_results: Results from process_spam_automations()
     """
-    print("\n" + "=" * 80)
-    print("AUTOMATION SUMMARY - PENDING USER CONFIRMATION")
-    print("=" * 80 + "\n")
+    lines = ["", SEP80, "AUTOMATION SUMMARY - PENDING USER CONFIRMATION", SEP80, ""]
+    add = lines.append
 
     # Calendar events
     if need_action_results['calendar_events']:
-        print(f"📅 CALENDAR EVENTS TO CREATE ({len(need_action_results['calendar_events'])}):")
-        print("-" * 80)
+        add(f"📅 CALENDAR EVENTS TO CREATE ({len(need_action_results['calendar_events'])}):")
+        add(DASH80)
         for idx, item in enumerate(need_action_results['calendar_events'], 1):
             event = item['event_details']
-            email = item['email']
-            print(f"  {idx}. {event.get('title')}")
-            print(f"     Date: {event.get('date')}{' at ' + event.get('time') if event.get('time') else ' (all-day)'}")
-            print(f"     From email: {email.get('subject')[:60]}")
-            print(f"     Reminder: 1 day before")
-            print()
+            time_str = event.get('time')
+            add(
+                f"  {idx}. {event.get('title')}\n"
+                f"     Date: {event.get('date')}{' at ' + time_str if time_str else ' (all-day)'}\n"
+                f"     From email: {_view(item).subject60}\n"
+                "     Reminder: 1 day before\n"
+            )
 
     # Tasks
     if need_action_results['tasks']:
-        print(f"\n✅ TASKS TO CREATE ({len(need_action_results['tasks'])}):")
-        print("-" * 80)
+        add(f"\n✅ TASKS TO CREATE ({len(need_action_results['tasks'])}):")
+        add(DASH80)
         for idx, item in enumerate(need_action_results['tasks'], 1):
             task = item['task_details']
-            email = item['email']
-            print(f"  {idx}. {email.get('subject')[:60]}")
-            print(f"     Due: {task.get('due_date', 'No due date')}")
-            print(f"     Amount: {task.get('amount', 'N/A')}")
-            print()
+            add(
+                f"  {idx}. {_view(item).subject60}\n"
+                f"     Due: {task.get('due_date', 'No due date')}\n"
+                f"     Amount: {task.get('amount', 'N/A')}\n"
+            )
 
     # Unsubscribe candidates
     if spam_results:
-        print(f"\n🚫 UNSUBSCRIBE REQUESTS TO SEND ({len(spam_results)}):")
-        print("-" * 80)
+        add(f"\n🚫 UNSUBSCRIBE REQUESTS TO SEND ({len(spam_results)}):")
+        add(DASH80)
         for idx, item in enumerate(spam_results, 1):
             spam_info = item['spam_info']
-            email = item['email']
-            print(f"  {idx}. {email.get('subject')[:60]}")
-            print(f"     From: {email.get('from')[:50]}")
-            print(f"     Confidence: {spam_info.get('confidence')}")
-            print(f"     Reason: {spam_info.get('reason')[:70]}")
-            if spam_info.get('unsubscribe_email'):
-                print(f"     Unsubscribe email: {spam_info.get('unsubscribe_email')}")
-            if spam_info.get('unsubscribe_link'):
-                print(f"     Unsubscribe link: {spam_info.get('unsubscribe_link')[:60]}...")
-            print()
+            view = _view(item)
+            unsubscribe_email = spam_info.get('unsubscribe_email')
+            unsubscribe_link = spam_info.get('unsubscribe_link')
+            add(
+                f"  {idx}. {view.subject60}\n"
+                f"     From: {view.sender50}\n"
+                f"     Confidence: {spam_info.get('confidence')}\n"
+                f"     Reason: {(spam_info.get('reason') or '')[:70]}"
+                + (f"\n     Unsubscribe email: {unsubscribe_email}" if unsubscribe_email else "")
+                + (f"\n     Unsubscribe link: {unsubscribe_link[:60]}..." if unsubscribe_link else "")
+                + "\n"
+            )
 
     if not need_action_results['calendar_events'] and not need_action_results['tasks'] and not spam_results:
-        print("No automation actions pending.")
+        add("No automation actions pending.")
+
+    add(SEP80)
+
+    # One write instead of a print() (and flush) per line
+    sys.stdout.write("\n".join(lines) + "\n")
+
+
+def _warm_up(name: str, build_request: Callable[[], Any]) -> None:
+    """Execute one cheap read so the service's token and connection are ready."""
+    try:
+        build_request().execute()
+        logger.debug("Warmed up %s connection", name)
+    except Exception as e:
+        # Only an optimization; the real writes report their own failures
+        logger.debug("Skipping %s warm-up: %s", name, e)
 
-    print("=" * 80)
+
+def _start_warm_ups(
+    executor: ThreadPoolExecutor,
+    need_action_results: Dict[str, List[Dict[str, Any]]],
+    spam_results: List[Dict[str, Any]],
+    gmail_service: Any,
+    calendar_service: Any,
+    tasks_service: Any
+) -> List[Any]:
+    """
+    Warm up the services that have pending writes while the user decides.
+
+    Each read refreshes an expired OAuth token and opens the keep-alive
+    connection the batched writes reuse, so that latency overlaps the
+    confirmation prompt instead of the execution phase.
+
+    Returns:
+        list: Futures of the submitted warm-ups
+    """
+    warm_ups = []
+    if need_action_results['calendar_events']:
+        warm_ups.append(('Google Calendar', lambda: calendar_service.calendars().get(calendarId='primary')))
+    if need_action_results['tasks']:
+        warm_ups.append(('Google Tasks', lambda: tasks_service.tasklists().get(tasklist='@default')))
+    if spam_results:
+        warm_ups.append(('Gmail', lambda: gmail_service.users().getProfile(userId='me')))
+    return [executor.submit(_warm_up, name, build_request) for name, build_request in warm_ups]
 
 
 def execute_automations_with_confirmation(
@@ -241,50 +440,65 @@ def execute_automations_with_confirmation(
             return stats
 
         print(f"\n⚠️  Total actions pending: {total_actions}")
-        confirmation = input("\nDo you want to proceed with these automations? (yes/no): ").strip().lower()
 
-        if confirmation not in ['yes', 'y']:
+        # Warm up the write services while blocked on the prompt; a decline
+        # doesn't wait for them, a confirm waits so writes reuse the connections
+        warm_up_executor = ThreadPoolExecutor(max_workers=3)
+        try:
+            warm_ups = _start_warm_ups(
+                warm_up_executor, need_action_results, spam_results,
+                gmail_service, calendar_service, tasks_service
+            )
+            confirmation = input("\nDo you want to proceed with these automations? (yes/no): ").strip().lower()
+            confirmed = confirmation in ['yes', 'y']
+        finally:
+            warm_up_executor.shutdown(wait=False)
+
+        if not confirmed:
             logger.info("User declined automation execution")
             print("\n❌ Automation cancelled by user")
             return stats
 
+        for warm_up in warm_ups:
+            warm_up.result()
+
         print("\n⚙️  Executing automations...\n")
 
-        # Create calendar events
-        for item in need_action_results['calendar_events']:
-            success = create_calendar_event(
-                calendar_service,
-                item['event_details'],
-                item['email']
+        # Calendar, Tasks and Gmail are separate services and hosts, so their
+        # batched writes are sent concurrently rather than one API after another
+        events = need_action_results['calendar_events']
+        tasks = need_action_results['tasks']
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            event_results = executor.submit(
+                create_calendar_events_batch, calendar_service,
+                [(item['event_details'], item['email']) for item in events]
+            )
+            task_results = executor.submit(
+                create_tasks_batch, tasks_service,
+                [(item['task_details'], item['email']) for item in tasks]
             )
+            unsubscribe_results = executor.submit(
+                send_unsubscribe_requests_batch, gmail_service,
+                [(item['spam_info'], item['email']) for item in spam_results]
+            )
+
+        for item, success in zip(events, event_results.result()):
             if success:
                 stats['events_created'] += 1
                 print(f"  ✅ Created calendar event: {item['event_details'].get('title')}")
 
-        # Create tasks
-        for item in need_action_results['tasks']:
-            success = create_task(
-                tasks_service,
-                item['task_details'],
-                item['email']
-            )
+        for item, success in zip(tasks, task_results.result()):
             if success:
                 stats['tasks_created'] += 1
-                print(f"  ✅ Created task: {item['email'].get('subject')[:50]}")
-
-        # Send unsubscribe requests
-        for item in spam_results:
-            success = send_unsubscribe_request(
-                gmail_service,
-                item['spam_info'],
-                item['email']
-            )
+                print(f"  ✅ Created task: {_view(item).subject50}")
+
+        for item, success in zip(spam_results, unsubscribe_results.result()):
             if success:
                 stats['unsubscribe_sent'] += 1
-                print(f"  ✅ Sent unsubscribe request: {item['email'].get('subject')[:50]}")
+                print(f"  ✅ Sent unsubscribe request: {_view(item).subject50}")
 
         print(f"\n✅ Automation complete: {stats['events_created']} events, {stats['tasks_created']} tasks, {stats['unsubscribe_sent']} unsubscribes")
-        logger.info(f"Automation execution complete: {stats}")
+        logger.info("Automation execution complete: %s", stats)
         return stats
 
     except Exception as e:
@@ -6,14 +6,112 @@ Generates compressed context and elaborate summaries using Gemini AI.
 import json
 import time
 import traceback
-from typing import List, Dict, Any
+from itertools import islice
+from typing import List, Dict, Any, Tuple
 
+from .automation_utils import GEMINI_SERVICE_TIER
 from .logger_utils import setup_logger, log_exception, log_api_call
 from .metrics_utils import get_metrics_tracker
+from .response_cache import get_response_cache, payload_key
 
 # Initialize logger
 logger = setup_logger(__name__)
 
+# Static instructions of the compressed-context prompt
+_COMPRESSED_CONTEXT_INSTRUCTIONS = """Create a token-efficient compressed context that:
+1. Preserves key information (who, what, when, why)
+2. Groups similar emails together
+3. Uses abbreviations and compact format
+4. Can be used to reconstruct important details later
+
+Respond with a JSON object containing the compressed context:
+{
+  "key_topics": ["<topic 1>", "<topic 2>", ...],
+  "action_items": ["<item 1>", "<item 2>", ...],
+  "people": ["<person 1>", "<person 2>", ...],
+  "dates": ["<date 1>", "<date 2>", ...],
+  "compressed_summary": "<very brief 2-3 sentence summary of all emails>"
+}
+
+Focus on compression and efficiency. Only return the JSON object."""
+
+
+# Structured-output schemas; JSON mode makes Gemini return bare JSON (no code fences)
+_COMPRESSED_CONTEXT_SCHEMA = {
+    'type': 'OBJECT',
+    'properties': {
+        'key_topics': {'type': 'ARRAY', 'items': {'type': 'STRING'}},
+        'action_items': {'type': 'ARRAY', 'items': {'type': 'STRING'}},
+        'people': {'type': 'ARRAY', 'items': {'type': 'STRING'}},
+        'dates': {'type': 'ARRAY', 'items': {'type': 'STRING'}},
+        'compressed_summary': {'type': 'STRING'},
+    },
+    'required': ['key_topics', 'action_items', 'people', 'dates', 'compressed_summary'],
+}
+_SUMMARY_POINTS_SCHEMA = {'type': 'ARRAY', 'items': {'type': 'STRING'}}
+_ELABORATE_SUMMARY_SCHEMA = {
+    'type': 'OBJECT',
+    'properties': {'summary_points': _SUMMARY_POINTS_SCHEMA},
+    'required': ['summary_points'],
+}
+
+
+def _json_config(response_schema: Dict[str, Any]) -> Dict[str, Any]:
+    """Build a generate_content config requesting JSON that matches response_schema."""
+    config = {'response_mime_type': 'application/json', 'response_schema': response_schema}
+    if GEMINI_SERVICE_TIER:
+        config['service_tier'] = GEMINI_SERVICE_TIER
+    return config
+
+
+# Email fields sent to the context prompts, and the per-prompt email limit
+_CONTEXT_FIELDS = ('subject', 'from', 'category', 'subcategory', 'summary', 'date')
+_MAX_CONTEXT_EMAILS = 20
+
+
+def _select_emails(emails: List[Dict[str, Any]], categories: List[str]) -> List[Dict[str, Any]]:
+    """
+    Pick the first _MAX_CONTEXT_EMAILS emails in the given categories.
+
+    Stops scanning once the limit is reached instead of filtering the whole inbox.
+    """
+    category_set = frozenset(categories)
+    return list(islice((e for e in emails if e.get('category') in category_set), _MAX_CONTEXT_EMAILS))
+
+
+def _serialize_emails(emails: List[Dict[str, Any]]) -> str:
+    """
+    Serialize the context fields of emails as compact JSON.
+
+    Compact separators and raw UTF-8 keep the prompt's input token count low.
+    """
+    return json.dumps(
+        [{field: email.get(field) for field in _CONTEXT_FIELDS} for email in emails],
+        separators=(',', ':'),
+        ensure_ascii=False
+    )
+
+
+def _elaborate_summary_instructions(max_bullets: int) -> str:
+    """Build the static instructions of the elaborate-summary prompt."""
+    return f"""Create a comprehensive summary that:
+1. Highlights the most important or urgent items
+2. Groups related emails together
+3. Provides actionable insights
+4. Is clear and easy to understand
+
+Respond with a JSON object containing bullet points:
+{{
+  "summary_points": [
+    "<bullet point 1>",
+    "<bullet point 2>",
+    ...
+  ]
+}}
+
+Maximum {max_bullets} bullet points. Each should be 1-2 sentences.
+Only return the JSON object."""
+
 
 def generate_compressed_context(
     emails: List[Dict[str, Any]],
@@ -36,57 +134,41 @@ def generate_compressed_context(
     Returns:
         str: Compressed context string (token-efficient)
     """
-    logger.info(f"Generating compressed context for {len(emails)} emails")
+    logger.info("Generating compressed context for %d emails", len(emails))
     start_time = time.time()
     metrics = get_metrics_tracker()
 
-    # Filter emails by categories
-    filtered_emails = [e for e in emails if e.get('category') in categories]
+    # Filter emails by categories (limited to avoid token limits)
+    filtered_emails = _select_emails(emails, categories)
 
     if not filtered_emails:
         logger.warning("No emails found for specified categories")
         return "{}"
 
-    # Build email summaries
-    email_summaries = []
-    for email in filtered_emails[:20]:  # Limit to 20 emails to avoid token limits
-        email_summaries.append({
-            'subject': email.get('subject'),
-            'from': email.get('from'),
-            'category': email.get('category'),
-            'subcategory': email.get('subcategory'),
-            'summary': email.get('summary'),
-            'date': email.get('date')
-        })
-
-    emails_json = json.dumps(email_summaries, indent=2)
+    emails_json = _serialize_emails(filtered_emails)
+    payload = f"Emails:\n{emails_json}"
 
     prompt = f"""Analyze the following emails and create a COMPRESSED context representation.
 
-Emails:
-{emails_json}
+{payload}
 
-Create a token-efficient compressed context that:
-1. Preserves key information (who, what, when, why)
-2. Groups similar emails together
-3. Uses abbreviations and compact format
-4. Can be used to reconstruct important details later
+{_COMPRESSED_CONTEXT_INSTRUCTIONS}"""
 
-Respond with a JSON object containing the compressed context:
-{{
-  "key_topics": ["<topic 1>", "<topic 2>", ...],
-  "action_items": ["<item 1>", "<item 2>", ...],
-  "people": ["<person 1>", "<person 2>", ...],
-  "dates": ["<date 1>", "<date 2>", ...],
-  "compressed_summary": "<very brief 2-3 sentence summary of all emails>"
-}}
-
-Focus on compression and efficiency. Only return the JSON object."""
+    # Identical email sets (e.g. re-runs on an overlapping inbox) reuse the stored response
+    response_cache = get_response_cache()
+    cache_key = payload_key('compressed_context', emails_json)
+    cached = response_cache.get_key(cache_key, 'compressed_context')
+    if cached is not None:
+        log_api_call(logger, "Gemini", True, cached=True)
+        metrics.record_api_call("Gemini", "compress_context", True, True, 0.0)
+        return json.dumps(cached)
 
     try:
         # Generate response from Gemini
         try:
-            response = client.models.generate_content(model=model_name, contents=prompt)
+            response = client.models.generate_content(
+                model=model_name, contents=prompt, config=_json_config(_COMPRESSED_CONTEXT_SCHEMA)
+            )
             elapsed = time.time() - start_time
 
             log_api_call(logger, "Gemini", True)
@@ -103,24 +185,17 @@ Focus on compression and efficiency. Only return the JSON object."""
 
         response_text = response.text.strip()
 
-        # Clean markdown code blocks
-        if response_text.startswith('```json'):
-            response_text = response_text[7:]
-        if response_text.startswith('```'):
-            response_text = response_text[3:]
-        if response_text.endswith('```'):
-            response_text = response_text[:-3]
-        response_text = response_text.strip()
-
-        # Validate JSON
+        # JSON mode guarantees the shape; parse once for the response cache
         try:
-            json.loads(response_text)  # Validate it's valid JSON
+            context_data = json.loads(response_text)
+            if isinstance(context_data, dict):
+                response_cache.set_key(cache_key, 'compressed_context', context_data)
             logger.info("Compressed context generated successfully")
             return response_text
 
         except json.JSONDecodeError as e:
             error_msg = f"Invalid JSON in compressed context: {e}"
-            logger.error(f"{error_msg}\nResponse text: {response_text[:200]}")
+            logger.error("%s\nResponse text: %.200s", error_msg, response_text)
             metrics.record_error(__name__, "JSONDecodeError", error_msg)
             return json.dumps({"error": "Invalid JSON response"})
 
@@ -153,53 +228,44 @@ def generate_elaborate_summary(
     Returns:
         list: List of bullet point strings (max 10)
     """
-    logger.info(f"Generating elaborate summary for {len(emails)} emails")
+    logger.info("Generating elaborate summary for %d emails", len(emails))
     start_time = time.time()
     metrics = get_metrics_tracker()
 
-    # Filter emails by categories
-    filtered_emails = [e for e in emails if e.get('category') in categories]
+    # Filter emails by categories (limited to avoid token limits)
+    filtered_emails = _select_emails(emails, categories)
 
     if not filtered_emails:
         logger.warning("No emails found for specified categories")
         return ["No emails to summarize"]
 
-    # Build email summaries
-    email_summaries = []
-    for email in filtered_emails[:20]:  # Limit to 20 emails to avoid token limits
-        email_summaries.append(
-            f"- {email.get('subject')} (from {email.get('from')}): {email.get('summary')}"
-        )
-
-    combined_text = "\n".join(email_summaries)
+    combined_text = "\n".join(
+        f"- {email.get('subject')} (from {email.get('from')}): {email.get('summary')}"
+        for email in filtered_emails
+    )
+    payload = f"Emails:\n{combined_text}"
+    instructions = _elaborate_summary_instructions(max_bullets)
 
     prompt = f"""Analyze the following emails and create an elaborate summary with up to {max_bullets} bullet points.
 
-Emails:
-{combined_text}
+{payload}
 
-Create a comprehensive summary that:
-1. Highlights the most important or urgent items
-2. Groups related emails together
-3. Provides actionable insights
-4. Is clear and easy to understand
+{instructions}"""
 
-Respond with a JSON object containing bullet points:
-{{
-  "summary_points": [
-    "<bullet point 1>",
-    "<bullet point 2>",
-    ...
-  ]
-}}
-
-Maximum {max_bullets} bullet points. Each should be 1-2 sentences.
-Only return the JSON object."""
+    response_cache = get_response_cache()
+    cache_key = payload_key(f"elaborate_summary:{max_bullets}", combined_text)
+    cached = response_cache.get_key(cache_key, 'elaborate_summary')
+    if cached is not None:
+        log_api_call(logger, "Gemini", True, cached=True)
+        metrics.record_api_call("Gemini", "elaborate_summary", True, True, 0.0)
+        return cached.get('summary_points', [])[:max_bullets]
 
     try:
         # Generate response from Gemini
         try:
-            response = client.models.generate_content(model=model_name, contents=prompt)
+            response = client.models.generate_content(
+                model=model_name, contents=prompt, config=_json_config(_ELABORATE_SUMMARY_SCHEMA)
+            )
             elapsed = time.time() - start_time
 
             log_api_call(logger, "Gemini", True)
@@ -216,15 +282,6 @@ Only return the JSON object."""
 
         response_text = response.text.strip()
 
-        # Clean markdown code blocks
-        if response_text.startswith('```json'):
-            response_text = response_text[7:]
-        if response_text.startswith('```'):
-            response_text = response_text[3:]
-        if response_text.endswith('```'):
-            response_text = response_text[:-3]
-        response_text = response_text.strip()
-
         # Parse JSON response
         try:
             summary_data = json.loads(response_text)
@@ -232,13 +289,14 @@ Only return the JSON object."""
 
             # Limit to max_bullets
             summary_points = summary_points[:max_bullets]
+            response_cache.set_key(cache_key, 'elaborate_summary', {'summary_points': summary_points})
 
-            logger.info(f"Elaborate summary generated successfully: {len(summary_points)} bullets")
+            logger.info("Elaborate summary generated successfully: %d bullets", len(summary_points))
             return summary_points
 
         except json.JSONDecodeError as e:
             error_msg = f"Invalid JSON in elaborate summary: {e}"
-            logger.error(f"{error_msg}\nResponse text: {response_text[:200]}")
+            logger.error("%s\nResponse text: %.200s", error_msg, response_text)
             metrics.record_error(__name__, "JSONDecodeError", error_msg)
             return ["Failed to parse summary response"]
 
@@ -246,3 +304,123 @@ Only return the JSON object."""
         log_exception(logger, e, "Error generating elaborate summary")
         metrics.record_error(__name__, type(e).__name__, str(e), traceback.format_exc())
         return [f"Error generating summary: {e}"]
+
+
+# Structured-output schema for the combined context + summary response
+_CONTEXT_BUNDLE_SCHEMA = {
+    'type': 'OBJECT',
+    'properties': {
+        'compressed_context': _COMPRESSED_CONTEXT_SCHEMA,
+        'summary_points': _SUMMARY_POINTS_SCHEMA,
+    },
+    'required': ['compressed_context', 'summary_points'],
+}
+
+
+def generate_context_bundle(
+    emails: List[Dict[str, Any]],
+    categories: List[str],
+    client: Any,
+    model_name: str,
+    max_bullets: int = 10
+) -> Tuple[str, List[str]]:
+    """
+    Generate the compressed context and the elaborate summary in one Gemini call.
+
+    Equivalent to calling generate_compressed_context() and
+    generate_elaborate_summary() on the same emails, but the emails are sent
+    once and the response is constrained to a JSON schema.
+
+    Args:
+        emails: List of categorized emails
+        categories: List of categories to include (e.g., ['Need-Action', 'FYI'])
+        client: Initialized Gemini client instance (google.genai.Client)
+        model_name: Name of the Gemini model to use
+        max_bullets: Maximum number of summary bullet points (default: 10)
+
+    Returns:
+        tuple: (compressed context JSON string, list of summary bullet points)
+    """
+    logger.info("Generating context bundle for %d emails", len(emails))
+    start_time = time.time()
+    metrics = get_metrics_tracker()
+
+    # Filter emails by categories (limited to avoid token limits)
+    filtered_emails = _select_emails(emails, categories)
+
+    if not filtered_emails:
+        logger.warning("No emails found for specified categories")
+        return "{}", ["No emails to summarize"]
+
+    emails_json = _serialize_emails(filtered_emails)
+
+    prompt = f"""Analyze the following emails and produce two outputs.
+
+Emails:
+{emails_json}
+
+1. "compressed_context": a COMPRESSED, token-efficient context representation that
+   preserves key information (who, what, when, why), groups similar emails, uses
+   abbreviations and compact format, and can be used to reconstruct important details
+   later. Include key_topics, action_items, people, dates and a very brief 2-3 sentence
+   compressed_summary of all emails.
+
+2. "summary_points": an elaborate summary with up to {max_bullets} bullet points that
+   highlights the most important or urgent items, groups related emails, provides
+   actionable insights and is clear and easy to understand. Each bullet should be
+   1-2 sentences.
+
+Only return the JSON object."""
+
+    response_cache = get_response_cache()
+    cache_key = payload_key(f"context_bundle:{max_bullets}", emails_json)
+    cached = response_cache.get_key(cache_key, 'context_bundle')
+    if cached is not None:
+        log_api_call(logger, "Gemini", True, cached=True)
+        metrics.record_api_call("Gemini", "context_bundle", True, True, 0.0)
+        return json.dumps(cached.get('compressed_context', {})), cached.get('summary_points', [])[:max_bullets]
+
+    try:
+        # Generate response from Gemini
+        try:
+            response = client.models.generate_content(
+                model=model_name,
+                contents=prompt,
+                config=_json_config(_CONTEXT_BUNDLE_SCHEMA)
+            )
+            elapsed = time.time() - start_time
+
+            log_api_call(logger, "Gemini", True)
+            metrics.record_api_call("Gemini", "context_bundle", True, False, elapsed)
+
+        except Exception as e:
+            elapsed = time.time() - start_time
+            error_msg = f"Gemini API call failed for context bundle: {e}"
+            logger.error(error_msg)
+            log_api_call(logger, "Gemini", False)
+            metrics.record_api_call("Gemini", "context_bundle", False, False, elapsed)
+            metrics.record_error(__name__, type(e).__name__, error_msg)
+            return json.dumps({"error": "Compression failed"}), [f"Failed to generate summary: {e}"]
+
+        response_text = response.text.strip()
+
+        # Parse JSON response
+        try:
+            bundle = json.loads(response_text)
+            compressed_context = json.dumps(bundle.get('compressed_context', {}))
+            summary_points = bundle.get('summary_points', [])[:max_bullets]
+            response_cache.set_key(cache_key, 'context_bundle', bundle)
+
+            logger.info("Context bundle generated successfully: %d bullets", len(summary_points))
+            return compressed_context, summary_points
+
+        except json.JSONDecodeError as e:
+            error_msg = f"Invalid JSON in context bundle: {e}"
+            logger.error("%s\nResponse text: %.200s", error_msg, response_text)
+            metrics.record_error(__name__, "JSONDecodeError", error_msg)
+            return json.dumps({"error": "Invalid JSON response"}), ["Failed to parse summary response"]
+
+    except Exception as e:
+        log_exception(logger, e, "Error generating context bundle")
+        metrics.record_error(__name__, type(e).__name__, str(e), traceback.format_exc())
+        return json.dumps({"error": str(e)}), [f"Error generating summary: {e}"]
@@ -4,21 +4,134 @@ Handles displaying categorized emails and generating/displaying daily digests
 with comprehensive error handling, logging, and metrics tracking.
 """
 
+import hashlib
+import operator
+import sys
 import time
 import traceback
-from collections import defaultdict
-from typing import List, Dict, Any, Optional
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import List, Dict, Any, Optional, Union
 
-from .email_utils import extract_email_body
+from .email_utils import GMAIL_BATCH_LIMIT, extract_email_bodies
 from .gemini_utils import generate_newsletter_summary, generate_category_summary
 from .logger_utils import setup_logger, log_exception, log_performance
 from .metrics_utils import get_metrics_tracker
+from .rate_limiter import TokenBucket
 
-# Initialize logger
+# Initialize logger and metrics tracker
 logger = setup_logger(__name__)
+metrics = get_metrics_tracker()
 
+# Section separators and digest header
+SEP80 = "=" * 80
+DASH80 = "-" * 80
+RULE80 = "─" * 80
+BOX_TOP = "╔" + "=" * 78 + "╗"
+DIGEST_TITLE = "║" + " " * 25 + "📧 DAILY EMAIL DIGEST 📧" + " " * 28 + "║"
+BOX_BOTTOM = "╚" + "=" * 78 + "╝"
+DIGEST_BANNER = "\n".join(["", SEP80, "GENERATING DAILY DIGEST", SEP80, ""])
 
-def display_categorized_summary(categorized_emails: List[Dict[str, Any]]) -> None:
+# Digest section headings, filled in with the section's item count
+NEED_ACTION_HEADING = "🔴 NEED ACTION" + " " * 20 + "({} emails)"
+FYI_HEADING = "ℹ️  FYI - FOR YOUR INFORMATION" + " " * 5 + "({} emails)"
+NEWSLETTERS_HEADING = "📰 NEWSLETTERS & UPDATES" + " " * 12 + "({} newsletters)"
+
+# Categories assigned by Gemini categorization, in display order
+CATEGORIES = tuple(sys.intern(c) for c in ('Need-Action', 'FYI', 'Newsletter', 'Marketing', 'SPAM', 'Unknown'))
+_category = operator.itemgetter('category')
+
+# Categories summarized as a whole in the digest: (category, Digest attribute)
+SUMMARY_CATEGORIES = (('Need-Action', 'need_action'), ('FYI', 'fyi'))
+
+# Digest summaries in flight at once, and the Gemini request budget they share
+MAX_CONCURRENT_SUMMARIES = 4
+SUMMARY_REQUESTS_PER_MINUTE = 10
+
+# Shared across digests: bursts up to a minute's budget, then paces to the RPM
+_limiter = TokenBucket(rate=SUMMARY_REQUESTS_PER_MINUTE / 60, capacity=SUMMARY_REQUESTS_PER_MINUTE)
+
+
+@dataclass(slots=True)
+class Section:
+    """A digest category: its emails and the consolidated summary bullets."""
+
+    emails: List[Dict[str, Any]] = field(default_factory=list)
+    summary: List[str] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class Digest:
+    """Daily digest returned by generate_daily_digest()."""
+
+    need_action: Section = field(default_factory=Section)
+    fyi: Section = field(default_factory=Section)
+    newsletters: List[Dict[str, Any]] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to the nested-dict form saved in digest_data.json."""
+        return {
+            'need_action': {'emails': self.need_action.emails, 'summary': self.need_action.summary},
+            'fyi': {'emails': self.fyi.emails, 'summary': self.fyi.summary},
+            'newsletters': self.newsletters
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'Digest':
+        """Build a Digest from its to_dict() form."""
+        return cls(
+            Section(data['need_action']['emails'], data['need_action']['summary']),
+            Section(data['fyi']['emails'], data['fyi']['summary']),
+            data['newsletters']
+        )
+
+
+def _category_key(prefix: str, emails: List[Dict[str, Any]]) -> str:
+    """
+    Build a constant-size cache key for a category summary from its email IDs.
+
+    Args:
+        prefix: Key prefix naming the category
+        emails: Emails in the category (order does not matter)
+
+    Returns:
+        str: prefix followed by a 32-character BLAKE2b hex digest of the sorted IDs
+    """
+    h = hashlib.blake2b(digest_size=16)
+    for email_id in sorted(e['id'] for e in emails):
+        h.update(email_id.encode())
+        h.update(b'\x00')
+    return prefix + h.hexdigest()
+
+
+def _fallback_summary(emails: List[Dict[str, Any]]) -> List[str]:
+    """Use the first few subjects as a category summary when Gemini fails."""
+    return [f"{email['subject']}" for email in emails[:5]]
+
+
+def group_by_category(emails: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Group emails by their 'category' field (missing -> 'Unknown'), keeping order.
+
+    Every known category is present (possibly empty) in CATEGORIES order;
+    any other category value gets its own group after them.
+    Compute this once and pass it as grouped= to display_categorized_summary()
+    and generate_daily_digest() so a run only traverses the email list once.
+    """
+    groups = {category: [] for category in CATEGORIES}
+    for email in emails:
+        try:
+            groups[_category(email)].append(email)
+        except KeyError:
+            # No category field, or a category outside CATEGORIES
+            groups.setdefault(email.get('category', 'Unknown'), []).append(email)
+    return groups
+
+
+def display_categorized_summary(
+    categorized_emails: List[Dict[str, Any]],
+    grouped: Optional[Dict[str, List[Dict[str, Any]]]] = None
+) -> None:
     """
     Display categorized emails organized by category.
 
@@ -27,6 +140,7 @@ def display_categorized_summary(categorized_emails: List[Dict[str, Any]]) -> Non
 
     Args:
         categorized_emails: List of categorized email dictionaries
+        grouped: Precomputed group_by_category(categorized_emails) (optional)
 
     Output:
         Prints formatted summary to console with:
@@ -34,38 +148,42 @@ def display_categorized_summary(categorized_emails: List[Dict[str, Any]]) -> Non
         - Email details (subject, sender, action, summary)
         - Visual separators for readability
     """
-    logger.info(f"Displaying categorized summary for {len(categorized_emails)} emails")
+    logger.info("Displaying categorized summary for %d emails", len(categorized_emails))
 
     try:
-        # Group emails by category using defaultdict
-        categories = defaultdict(list)
+        # Group emails by category (unless the caller already did)
+        categories = grouped if grouped is not None else group_by_category(categorized_emails)
 
-        for email in categorized_emails:
-            category = email.get('category', 'Unknown')
-            categories[category].append(email)
+        lines = ["", SEP80, "EMAIL CATEGORIZATION SUMMARY", SEP80, ""]
+        add = lines.append
 
-        print("\n" + "=" * 80)
-        print("EMAIL CATEGORIZATION SUMMARY")
-        print("=" * 80 + "\n")
-
-        # Display each category
+        # Display each non-empty category
+        shown = 0
         for category, emails in categories.items():
-            print(f"\n### {category.upper()} ({len(emails)} emails)")
-            print("-" * 80)
+            if not emails:
+                continue
+            shown += 1
+            add(f"\n### {category.upper()} ({len(emails)} emails)")
+            add(DASH80)
             for email in emails:
-                print(f"  • {email.get('subject', 'No Subject')}")
-                print(f"    From: {email.get('from', 'Unknown')}")
-                print(f"    Action: {email.get('action_item', 'None')}")
-                print(f"    Summary: {email.get('summary', 'No summary')}")
-                print()
+                # One formatted block per email (trailing newline = blank separator line)
+                get = email.get
+                add(
+                    f"  • {get('subject', 'No Subject')}\n"
+                    f"    From: {get('from', 'Unknown')}\n"
+                    f"    Action: {get('action_item', 'None')}\n"
+                    f"    Summary: {get('summary', 'No summary')}\n"
+                )
 
-        print("=" * 80)
-        logger.info(f"Successfully displayed {len(categories)} categories")
+        add(SEP80)
+
+        # One write instead of a print() per line
+        sys.stdout.write("\n".join(lines) + "\n")
+        logger.info("Successfully displayed %d categories", shown)
 
     except Exception as e:
         log_exception(logger, e, "Error displaying categorized summary")
-        metrics = get_metrics_tracker()
-        metrics.record_error(__name__, type(e).__name__, str(e), traceback.format_exc())
+        metrics.record_error(__name__, type(e).__name__, str(e), traceback.format_exc)
         print(f"⚠️  Error displaying categorized summary: {e}")
 
 
@@ -75,8 +193,9 @@ def generate_daily_digest(
     client: Any,
     model_name: str,
     cache: Optional[Any] = None,
-    new_emails_count: int = 0
-) -> Dict[str, Any]:
+    new_emails_count: int = 0,
+    grouped: Optional[Dict[str, List[Dict[str, Any]]]] = None
+) -> Digest:
     """
     Generate comprehensive Daily Digest with AI-powered summaries.
 
@@ -95,230 +214,206 @@ def generate_daily_digest(
         model_name: Name of the Gemini model to use
         cache: CacheManager instance for caching summaries (optional)
         new_emails_count: Number of new emails processed (triggers summary regeneration)
+        grouped: Precomputed group_by_category(categorized_emails) (optional)
 
     Returns:
-        dict: Daily digest with structure:
-            - need_action: {emails: [...], summary: [...]}
-            - fyi: {emails: [...], summary: [...]}
+        Digest: Daily digest with:
+            - need_action: Section(emails=[...], summary=[...])
+            - fyi: Section(emails=[...], summary=[...])
             - newsletters: [{subject, from, summary_points}, ...]
+        Use digest.to_dict() for the JSON-serializable nested-dict form.
 
     Note:
         - Checks cache before generating summaries
         - Creates cache keys based on email IDs for category summaries
-        - Rate-limits API calls to avoid quota errors
+        - Runs summary API calls concurrently, token-bucket paced to SUMMARY_REQUESTS_PER_MINUTE
         - Saves cache after generating new summaries
     """
-    logger.info(f"Generating daily digest for {len(categorized_emails)} emails")
-    start_time = time.time()
-    metrics = get_metrics_tracker()
+    logger.info("Generating daily digest for %d emails", len(categorized_emails))
+    start_time = time.perf_counter()
+    record_error = metrics.record_error
+    record_cache_operation = metrics.record_cache_operation
 
-    print("\n" + "=" * 80)
-    print("GENERATING DAILY DIGEST")
-    print("=" * 80 + "\n")
+    print(DIGEST_BANNER)
 
     try:
-        # Group emails by category
-        categories = defaultdict(list)
-        for email in categorized_emails:
-            category = email.get('category', 'Unknown')
-            categories[category].append(email)
+        # Group emails by category (unless the caller already did)
+        categories = grouped if grouped is not None else group_by_category(categorized_emails)
 
         # Initialize digest structure
-        digest = {
-            'need_action': {'emails': categories.get('Need-Action', []), 'summary': []},
-            'fyi': {'emails': categories.get('FYI', []), 'summary': []},
-            'newsletters': []
-        }
-
-        # Rate limiting configuration
-        requests_per_minute = 10
-        delay_between_requests = 60 / requests_per_minute + 1
-
-        # === Generate Need-Action Summary ===
-        if digest['need_action']['emails']:
-            try:
-                logger.info(f"Generating summary for {len(digest['need_action']['emails'])} Need-Action emails")
-                print(f"📋 Generating summary for {len(digest['need_action']['emails'])} Need-Action emails...")
-
-                # Create cache key based on sorted email IDs in category
-                need_action_cache_key = 'category_summary_need_action_' + '_'.join(
-                    sorted([e['id'] for e in digest['need_action']['emails']])
-                )
-
-                # Check cache first (skip if new emails added)
-                should_regenerate = new_emails_count > 0
-                if cache and cache.has(need_action_cache_key) and not should_regenerate:
-                    cached_data = cache.get(need_action_cache_key)
-                    digest['need_action']['summary'] = cached_data.get('summary', [])
-                    logger.info("Using cached Need-Action category summary")
-                    print(f"  ✓ Using cached Need-Action category summary")
-                    metrics.record_cache_operation('GET', 'category_summary', True)
-                else:
-                    # Generate new summary via Gemini
-                    if should_regenerate:
-                        logger.info("Regenerating Need-Action summary due to new emails")
-                        print(f"  🔄 Regenerating summary with new emails...")
-                    metrics.record_cache_operation('GET', 'category_summary', False)
-                    digest['need_action']['summary'] = generate_category_summary(
-                        digest['need_action']['emails'],
-                        'Need-Action',
-                        client,
-                        model_name
-                    )
-
-                    # Cache the result
-                    if cache:
-                        cache.set(need_action_cache_key, {'summary': digest['need_action']['summary']})
-                        metrics.record_cache_operation('SET', 'category_summary', None)
-                        logger.debug("Cached Need-Action summary")
-
-                    time.sleep(delay_between_requests)
-
-            except Exception as e:
-                log_exception(logger, e, "Error generating Need-Action summary")
-                metrics.record_error(__name__, type(e).__name__, f"Need-Action summary failed: {e}")
-                digest['need_action']['summary'] = [
-                    f"{email['subject']}" for email in digest['need_action']['emails'][:5]
-                ]
-
-        # === Generate FYI Summary ===
-        if digest['fyi']['emails']:
-            try:
-                logger.info(f"Generating summary for {len(digest['fyi']['emails'])} FYI emails")
-                print(f"📋 Generating summary for {len(digest['fyi']['emails'])} FYI emails...")
-
-                # Create cache key based on sorted email IDs
-                fyi_cache_key = 'category_summary_fyi_' + '_'.join(
-                    sorted([e['id'] for e in digest['fyi']['emails']])
-                )
+        digest = Digest(
+            need_action=Section(categories.get('Need-Action', [])),
+            fyi=Section(categories.get('FYI', []))
+        )
+
+        should_regenerate = new_emails_count > 0
+
+        def paced(func, *args):
+            _limiter.acquire()
+            return func(*args)
+
+        # Summaries are independent Gemini calls: they run concurrently on worker
+        # threads while this thread does the cache lookups and Gmail body fetches
+        # (the cache and Gmail service are not shared with the workers)
+        with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_SUMMARIES) as executor:
+            # Digest attribute -> (cache key, future) for category summaries sent to Gemini
+            category_jobs = {}
+
+            # === Dispatch Category Summaries ===
+            for category, digest_key in SUMMARY_CATEGORIES:
+                section = getattr(digest, digest_key)
+                emails = section.emails
+                if not emails:
+                    continue
+                try:
+                    logger.info("Generating summary for %d %s emails", len(emails), category)
+                    print(f"📋 Generating summary for {len(emails)} {category} emails...")
+
+                    # Create cache key based on sorted email IDs in category (only if caching)
+                    cache_key = _category_key(
+                        f'category_summary_{digest_key}_', emails
+                    ) if cache else None
+
+                    # Check cache first (skip if new emails added)
+                    cached_data = cache.get(cache_key) if cache and not should_regenerate else None
+                    if cached_data is not None:
+                        section.summary = cached_data.get('summary', [])
+                        logger.info("Using cached %s category summary", category)
+                        print(f"  ✓ Using cached {category} category summary")
+                        record_cache_operation('GET', 'category_summary', True)
+                    else:
+                        # Generate new summary via Gemini
+                        if should_regenerate:
+                            logger.info("Regenerating %s summary due to new emails", category)
+                            print(f"  🔄 Regenerating summary with new emails...")
+                        record_cache_operation('GET', 'category_summary', False)
+                        category_jobs[digest_key] = (cache_key, executor.submit(
+                            paced, generate_category_summary, emails, category, client, model_name
+                        ))
+
+                except Exception as e:
+                    log_exception(logger, e, f"Error generating {category} summary")
+                    record_error(__name__, type(e).__name__, f"{category} summary failed: {e}")
+                    section.summary = _fallback_summary(emails)
+
+            # === Dispatch Newsletter Summaries ===
+            # One [email, cached summary_points or None, future or None, cached entry or None]
+            # per newsletter; the entry is looked up once and reused when writing back
+            newsletter_jobs = []
+            newsletter_emails = categories.get('Newsletter', [])
+            if newsletter_emails:
+                try:
+                    logger.info("Generating detailed summaries for %d Newsletters", len(newsletter_emails))
+                    print(f"📰 Generating detailed summaries for {len(newsletter_emails)} Newsletters...\n")
+
+                    for idx, email in enumerate(newsletter_emails, 1):
+                        print(f"  Processing Newsletter {idx}/{len(newsletter_emails)}: {email['subject'][:50]}...")
 
-                # Check cache first (skip if new emails added)
-                should_regenerate = new_emails_count > 0
-                if cache and cache.has(fyi_cache_key) and not should_regenerate:
-                    cached_data = cache.get(fyi_cache_key)
-                    digest['fyi']['summary'] = cached_data.get('summary', [])
-                    logger.info("Using cached FYI category summary")
-                    print(f"  ✓ Using cached FYI category summary")
-                    metrics.record_cache_operation('GET', 'category_summary', True)
-                else:
-                    # Generate new summary via Gemini
-                    if should_regenerate:
-                        logger.info("Regenerating FYI summary due to new emails")
-                        print(f"  🔄 Regenerating summary with new emails...")
-                    metrics.record_cache_operation('GET', 'category_summary', False)
-                    digest['fyi']['summary'] = generate_category_summary(
-                        digest['fyi']['emails'],
-                        'FYI',
-                        client,
-                        model_name
-                    )
+                        # Check cache for newsletter summary (single lookup)
+                        summary_points = None
+                        cached_data = None
+                        try:
+                            cached_data = cache.get(email['id']) if cache else None
+                            if cached_data is not None:
+                                summary_points = cached_data.get('newsletter_summary')
+                            if summary_points:
+                                logger.debug("Using cached newsletter summary for %s", email['id'])
+                                print(f"  ✓ Using cached newsletter summary")
+                                record_cache_operation('GET', 'newsletter_summary', True)
+                            else:
+                                record_cache_operation('GET', 'newsletter_summary', False)
+                        except Exception as e:
+                            log_exception(logger, e, f"Error processing newsletter {idx}")
+                            record_error(__name__, type(e).__name__, f"Newsletter processing failed: {e}")
+
+                        newsletter_jobs.append([email, summary_points, None, cached_data])
+
+                    # Fetch uncached bodies one Gmail batch at a time and hand each
+                    # batch to the workers for 3-bullet summaries before fetching the
+                    # next, so Gemini summarizes batch i while Gmail returns batch i+1
+                    uncached = [job for job in newsletter_jobs if not job[1]]
+                    for chunk_start in range(0, len(uncached), GMAIL_BATCH_LIMIT):
+                        chunk = uncached[chunk_start:chunk_start + GMAIL_BATCH_LIMIT]
+                        bodies = extract_email_bodies(service, [job[0]['id'] for job in chunk])
+                        for job in chunk:
+                            email = job[0]
+                            job[2] = executor.submit(
+                                paced, generate_newsletter_summary,
+                                bodies.get(email['id'], ''), email['subject'], client, model_name
+                            )
+
+                except Exception as e:
+                    log_exception(logger, e, "Error processing newsletters")
+                    record_error(__name__, type(e).__name__, f"Newsletter batch processing failed: {e}")
+
+            # === Collect Category Summaries ===
+            for category, digest_key in SUMMARY_CATEGORIES:
+                if digest_key not in category_jobs:
+                    continue
+                cache_key, future = category_jobs[digest_key]
+                section = getattr(digest, digest_key)
+                try:
+                    section.summary = future.result()
 
                     # Cache the result
                     if cache:
-                        cache.set(fyi_cache_key, {'summary': digest['fyi']['summary']})
-                        metrics.record_cache_operation('SET', 'category_summary', None)
-                        logger.debug("Cached FYI summary")
-
-                    time.sleep(delay_between_requests)
-
-            except Exception as e:
-                log_exception(logger, e, "Error generating FYI summary")
-                metrics.record_error(__name__, type(e).__name__, f"FYI summary failed: {e}")
-                digest['fyi']['summary'] = [
-                    f"{email['subject']}" for email in digest['fyi']['emails'][:5]
-                ]
-
-        # === Generate Newsletter Summaries ===
-        newsletter_emails = categories.get('Newsletter', [])
-        if newsletter_emails:
-            try:
-                logger.info(f"Generating detailed summaries for {len(newsletter_emails)} Newsletters")
-                print(f"📰 Generating detailed summaries for {len(newsletter_emails)} Newsletters...\n")
-
-                for idx, email in enumerate(newsletter_emails, 1):
+                        cache.set(cache_key, {'summary': section.summary})
+                        record_cache_operation('SET', 'category_summary', None)
+                        logger.debug("Cached %s summary", category)
+
+                except Exception as e:
+                    log_exception(logger, e, f"Error generating {category} summary")
+                    record_error(__name__, type(e).__name__, f"{category} summary failed: {e}")
+                    section.summary = _fallback_summary(section.emails)
+
+            # === Collect Newsletter Summaries (in inbox order) ===
+            for idx, (email, summary_points, future, cached_data) in enumerate(newsletter_jobs, 1):
+                if future:
                     try:
-                        print(f"  Processing Newsletter {idx}/{len(newsletter_emails)}: {email['subject'][:50]}...")
+                        summary_points = future.result()
 
-                        # Check cache for newsletter summary
-                        summary_points = None
-                        if cache and cache.has(email['id']):
-                            cached_data = cache.get(email['id'])
-                            if 'newsletter_summary' in cached_data:
-                                summary_points = cached_data['newsletter_summary']
-                                logger.debug(f"Using cached newsletter summary for {email['id']}")
-                                print(f"  ✓ Using cached newsletter summary")
-                                metrics.record_cache_operation('GET', 'newsletter_summary', True)
-
-                        # Generate summary if not cached
-                        if not summary_points:
-                            metrics.record_cache_operation('GET', 'newsletter_summary', False)
-
-                            # Extract full email body
-                            email_body = extract_email_body(service, email['id'])
-
-                            # Generate 3-bullet summary via Gemini
-                            summary_points = generate_newsletter_summary(email_body, email['subject'], client, model_name)
-
-                            # Cache the newsletter summary
-                            if cache:
-                                cached_data = cache.get(email['id']) or {}
-                                cached_data['newsletter_summary'] = summary_points
-                                cache.set(email['id'], cached_data)
-                                metrics.record_cache_operation('SET', 'newsletter_summary', None)
-                                logger.debug(f"Cached newsletter summary for {email['id']}")
-
-                            # Rate limit only when making new API calls
-                            if idx < len(newsletter_emails):
-                                print(f"  ⏳ Waiting {delay_between_requests:.0f} seconds...")
-                                time.sleep(delay_between_requests)
-
-                        # Add newsletter to digest
-                        digest['newsletters'].append({
-                            'subject': email['subject'],
-                            'from': email['from'],
-                            'summary_points': summary_points
-                        })
+                        # Cache the newsletter summary (merged into the entry looked up above)
+                        if cache:
+                            cached_data = cached_data if cached_data is not None else {}
+                            cached_data['newsletter_summary'] = summary_points
+                            cache.set(email['id'], cached_data)
+                            record_cache_operation('SET', 'newsletter_summary', None)
+                            logger.debug("Cached newsletter summary for %s", email['id'])
 
                     except Exception as e:
                         log_exception(logger, e, f"Error processing newsletter {idx}")
-                        metrics.record_error(__name__, type(e).__name__, f"Newsletter processing failed: {e}")
-                        # Add fallback newsletter entry
-                        digest['newsletters'].append({
-                            'subject': email['subject'],
-                            'from': email['from'],
-                            'summary_points': [
-                                "Failed to generate summary",
-                                "Please check the original email",
-                                "Error occurred during processing"
-                            ]
-                        })
-
-            except Exception as e:
-                log_exception(logger, e, "Error processing newsletters")
-                metrics.record_error(__name__, type(e).__name__, f"Newsletter batch processing failed: {e}")
-
-        elapsed = time.time() - start_time
+                        record_error(__name__, type(e).__name__, f"Newsletter processing failed: {e}")
+                        summary_points = None
+
+                # Add newsletter to digest (fallback entry if it could not be summarized)
+                digest.newsletters.append({
+                    'subject': email['subject'],
+                    'from': email['from'],
+                    'summary_points': summary_points or [
+                        "Failed to generate summary",
+                        "Please check the original email",
+                        "Error occurred during processing"
+                    ]
+                })
+
+        elapsed = time.perf_counter() - start_time
         log_performance(logger, "Daily Digest Generation", elapsed)
-        logger.info(f"Daily digest generation complete in {elapsed:.2f}s")
+        logger.info("Daily digest generation complete in %.2fs", elapsed)
 
         print("\n✅ Daily Digest generation complete!\n")
         return digest
 
     except Exception as e:
-        elapsed = time.time() - start_time
+        elapsed = time.perf_counter() - start_time
         log_exception(logger, e, "Daily digest generation failed")
-        metrics.record_error(__name__, type(e).__name__, str(e), traceback.format_exc())
+        record_error(__name__, type(e).__name__, str(e), traceback.format_exc)
         print(f"⚠️  Error generating daily digest: {e}")
 
         # Return minimal digest structure
-        return {
-            'need_action': {'emails': [], 'summary': []},
-            'fyi': {'emails': [], 'summary': []},
-            'newsletters': []
-        }
+        return Digest()
 
 
-def display_daily_digest(digest: Dict[str, Any]) -> None:
+def display_daily_digest(digest: Union[Digest, Dict[str, Any]]) -> None:
     """
     Display Daily Digest in beautiful formatted output.
 
@@ -328,7 +423,7 @@ def display_daily_digest(digest: Dict[str, Any]) -> None:
     3. Newsletters & Updates (detailed summaries)
 
     Args:
-        digest: Digest dictionary from generate_daily_digest()
+        digest: Digest from generate_daily_digest() (or its to_dict() form)
 
     Output:
         Prints formatted digest to console with:
@@ -340,62 +435,72 @@ def display_daily_digest(digest: Dict[str, Any]) -> None:
     logger.info("Displaying daily digest")
 
     try:
+        if isinstance(digest, dict):
+            digest = Digest.from_dict(digest)
+
+        need_action, fyi, newsletters = digest.need_action, digest.fyi, digest.newsletters
+        need_action_count, fyi_count, newsletter_count = (
+            len(need_action.emails), len(fyi.emails), len(newsletters)
+        )
+        total_emails = need_action_count + fyi_count + newsletter_count
+
         # Header with box drawing
-        print("\n" + "╔" + "=" * 78 + "╗")
-        print("║" + " " * 25 + "📧 DAILY EMAIL DIGEST 📧" + " " * 28 + "║")
-        print("╚" + "=" * 78 + "╝\n")
+        lines = ["", BOX_TOP, DIGEST_TITLE, BOX_BOTTOM, ""]
+        add = lines.append
 
         # Need-Action Section
-        if digest['need_action']['emails']:
-            print("🔴 NEED ACTION" + " " * 20 + f"({len(digest['need_action']['emails'])} emails)")
-            print("─" * 80)
-            if digest['need_action']['summary']:
-                for point in digest['need_action']['summary']:
-                    print(f"  • {point}")
+        if need_action_count:
+            add(NEED_ACTION_HEADING.format(need_action_count))
+            add(RULE80)
+            if need_action.summary:
+                for point in need_action.summary:
+                    add(f"  • {point}")
             else:
                 # Fallback: show email subjects if summary failed
-                for email in digest['need_action']['emails']:
-                    print(f"  • {email.get('subject', 'No Subject')}")
-            print()
+                for email in need_action.emails:
+                    add(f"  • {email.get('subject', 'No Subject')}")
+            add("")
 
         # FYI Section
-        if digest['fyi']['emails']:
-            print("ℹ️  FYI - FOR YOUR INFORMATION" + " " * 5 + f"({len(digest['fyi']['emails'])} emails)")
-            print("─" * 80)
-            if digest['fyi']['summary']:
-                for point in digest['fyi']['summary']:
-                    print(f"  • {point}")
+        if fyi_count:
+            add(FYI_HEADING.format(fyi_count))
+            add(RULE80)
+            if fyi.summary:
+                for point in fyi.summary:
+                    add(f"  • {point}")
             else:
                 # Fallback: show email subjects if summary failed
-                for email in digest['fyi']['emails']:
-                    print(f"  • {email.get('subject', 'No Subject')}")
-            print()
+                for email in fyi.emails:
+                    add(f"  • {email.get('subject', 'No Subject')}")
+            add("")
 
         # Newsletter Section
-        if digest['newsletters']:
-            print("📰 NEWSLETTERS & UPDATES" + " " * 12 + f"({len(digest['newsletters'])} newsletters)")
-            print("─" * 80)
-
-            for idx, newsletter in enumerate(digest['newsletters'], 1):
-                print(f"\n  [{idx}] {newsletter.get('subject', 'No Subject')}")
-                print(f"      From: {newsletter.get('from', 'Unknown')}")
-                print("      Summary:")
-                for point in newsletter.get('summary_points', []):
-                    print(f"        • {point}")
-                print()
+        if newsletter_count:
+            add(NEWSLETTERS_HEADING.format(newsletter_count))
+            add(RULE80)
+
+            for idx, newsletter in enumerate(newsletters, 1):
+                get = newsletter.get
+                add(
+                    f"\n  [{idx}] {get('subject', 'No Subject')}\n"
+                    f"      From: {get('from', 'Unknown')}\n"
+                    "      Summary:"
+                )
+                for point in get('summary_points', []):
+                    add(f"        • {point}")
+                add("")
 
         # Footer
-        print("─" * 80)
-        total_emails = (len(digest['need_action']['emails']) +
-                       len(digest['fyi']['emails']) +
-                       len(digest['newsletters']))
-        print(f"Total emails processed: {total_emails}")
-        print()
+        add(RULE80)
+        add(f"Total emails processed: {total_emails}")
+        add("")
+
+        # One write instead of a print() per line
+        sys.stdout.write("\n".join(lines) + "\n")
 
-        logger.info(f"Successfully displayed digest with {total_emails} total emails")
+        logger.info("Successfully displayed digest with %d total emails", total_emails)
 
     except Exception as e:
         log_exception(logger, e, "Error displaying daily digest")
-        metrics = get_metrics_tracker()
-        metrics.record_error(__name__, type(e).__name__, str(e), traceback.format_exc())
+        metrics.record_error(__name__, type(e).__name__, str(e), traceback.format_exc)
         print(f"⚠️  Error displaying daily digest: {e}")
@@ -6,11 +6,19 @@ with comprehensive error handling, logging, and metrics tracking.
 
 import os
 import os.path
-import base64
+import binascii
+import json
 import re
+import sys
+import threading
 import time
-from typing import List, Dict, Any, Optional
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import List, Dict, Any, Optional, Tuple, Union
+import httplib2
 from google.auth.transport.requests import Request
+from google_auth_httplib2 import AuthorizedHttp
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
 from googleapiclient.discovery import build
@@ -27,6 +35,68 @@ logger = setup_logger(__name__)
 SCOPES = ['https://www.googleapis.com/auth/gmail.modify']
 
 
+# Socket timeout for Google API transports (seconds)
+GOOGLE_API_TIMEOUT_SECONDS = 30
+
+# Sub-requests per Gmail batch HTTP request (Gmail recommends at most 50)
+GMAIL_BATCH_LIMIT = 50
+
+# Batches of GMAIL_BATCH_LIMIT gets sent at once when fetching more than one batch
+MAX_CONCURRENT_BATCHES = 4
+
+# Headers requested when listing emails (format='metadata' skips the MIME body)
+METADATA_HEADERS = ['Subject', 'From', 'Date']
+
+
+# URL-safe base64 alphabet ('-', '_') -> standard alphabet ('+', '/')
+_URLSAFE_TO_STD_B64 = bytes.maketrans(b'-_', b'+/')
+
+# HTML tag matcher for stripping text/html bodies (character class, no backtracking)
+_HTML_TAG_RE = re.compile(r'<[^>]+>')
+
+# Message bodies kept in memory (LRU); a delivered message's body never changes
+BODY_CACHE_SIZE = 512
+_body_cache: "OrderedDict[str, str]" = OrderedDict()
+_body_cache_lock = threading.Lock()
+
+# Email dicts built by fetch_recent_emails (LRU), so messages that reappear in
+# later polls skip the metadata get; labels are as of the first fetch
+METADATA_CACHE_SIZE = 1024
+_metadata_cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+_metadata_cache_lock = threading.Lock()
+
+# Idle worker transports kept open between batched fetches:
+# id(credentials) -> (credentials, [AuthorizedHttp])
+_idle_batch_https = {}
+_batch_http_lock = threading.Lock()
+
+# Refresh OAuth tokens this long before they expire, retrying failures after a delay
+TOKEN_REFRESH_MARGIN = timedelta(minutes=5)
+TOKEN_REFRESH_RETRY_SECONDS = 60
+
+# Credentials shared by every connect_to_gmail() caller while they stay valid.
+# httplib2 is not thread-safe, so each thread keeps its own (credentials,
+# service) pair built over them
+_gmail_creds = None
+_gmail_local = threading.local()
+_gmail_lock = threading.Lock()
+
+# (token.json mtime, credentials parsed from it), so an unchanged file is not re-read
+_token_cache = None
+
+# Mailbox historyId committed by the last completed run (see save_history_id);
+# later incremental fetches ask users.history.list for just the messages added since then
+GMAIL_STATE_FILE = '.gmail_state.json'
+
+# Search terms the history path can apply as label filters; any other term
+# makes an incremental fetch fall back to messages.list
+_HISTORY_QUERY_LABELS = {'is:unread': 'UNREAD', 'in:inbox': 'INBOX'}
+_HISTORY_QUERY_IGNORED = re.compile(r'(?:newer_than|after):\S+')
+
+# Labels Gmail search leaves out unless asked for
+_EXCLUDED_LABELS = frozenset(('SPAM', 'TRASH'))
+
+
 class GmailConnectionError(Exception):
     """Raised when Gmail connection fails."""
     pass
@@ -37,12 +107,43 @@ class EmailFetchError(Exception):
     pass
 
 
+def build_google_service(
+    api_name: str,
+    version: str,
+    creds: Credentials,
+    timeout: int = GOOGLE_API_TIMEOUT_SECONDS
+) -> Any:
+    """
+    Build a Google API service over a persistent, authorized HTTP transport.
+
+    The service owns one keep-alive httplib2 connection for its lifetime, so
+    build it once and reuse it for every call (including batch requests) to
+    avoid a TLS handshake per request. httplib2 is not thread-safe, so a
+    service should not be shared across threads.
+
+    Args:
+        api_name: Google API name (e.g. 'gmail', 'calendar', 'tasks')
+        version: API version (e.g. 'v1', 'v3')
+        creds: Authorized OAuth credentials
+        timeout: Socket timeout in seconds
+
+    Returns:
+        service: Google API service instance
+    """
+    http = AuthorizedHttp(creds, http=httplib2.Http(timeout=timeout))
+    # Use the discovery document bundled with google-api-python-client
+    # instead of downloading it on every build
+    return build(api_name, version, http=http, static_discovery=True)
+
+
 def connect_to_gmail() -> Any:
     """
     Authenticate and connect to Gmail API using OAuth 2.0.
 
     Uses credentials.json for initial authentication and stores tokens in token.json
-    for subsequent runs. Automatically refreshes expired tokens.
+    for subsequent runs. Automatically refreshes expired tokens. Credentials are
+    shared by the process; each thread builds its own service over them once
+    (httplib2 is not thread-safe) and gets it back while they stay valid.
 
     Returns:
         service: Authenticated Gmail API service instance
@@ -51,21 +152,32 @@ def connect_to_gmail() -> Any:
         GmailConnectionError: If authentication or connection fails
         FileNotFoundError: If credentials.json is missing
     """
+    with _gmail_lock:
+        creds = _gmail_creds if _gmail_creds is not None and _gmail_creds.valid else None
+        connection = getattr(_gmail_local, 'connection', None)
+        if creds is not None and connection is not None and connection[0] is creds:
+            logger.debug("Reusing this thread's Gmail service")
+            return connection[1]
+        return _connect_to_gmail(creds)
+
+
+def _connect_to_gmail(creds: Optional[Credentials] = None) -> Any:
+    """
+    Build this thread's Gmail service (see connect_to_gmail).
+
+    Args:
+        creds: Valid shared credentials to build over; loaded, refreshed or
+            obtained through the OAuth flow when None
+    """
+    global _gmail_creds
+
     logger.info("Connecting to Gmail API...")
     start_time = time.time()
     metrics = get_metrics_tracker()
 
     try:
-        creds = None
-
-        # Load existing credentials from token.json if available
-        if os.path.exists('token.json'):
-            try:
-                creds = Credentials.from_authorized_user_file('token.json', SCOPES)
-                logger.debug("Loaded credentials from token.json")
-            except Exception as e:
-                logger.warning(f"Failed to load token.json, will re-authenticate: {e}")
-                creds = None
+        if creds is None:
+            creds = _load_token()
 
         # If no valid credentials, initiate OAuth flow
         if not creds or not creds.valid:
@@ -98,21 +210,21 @@ def connect_to_gmail() -> Any:
                     raise GmailConnectionError(error_msg)
 
             # Save credentials for next run
-            try:
-                with open('token.json', 'w') as token:
-                    token.write(creds.to_json())
-                logger.debug("Saved credentials to token.json")
-            except Exception as e:
-                logger.warning(f"Failed to save token.json: {e}")
+            _save_token(creds)
 
         # Build and return Gmail API service
         try:
-            service = build('gmail', 'v1', credentials=creds)
+            service = build_google_service('gmail', 'v1', creds)
             elapsed = time.time() - start_time
             log_performance(logger, "Gmail Connection", elapsed)
             log_api_call(logger, "Gmail", True)
             metrics.record_api_call("Gmail", "connect", True, False, elapsed)
             logger.info("Successfully connected to Gmail API")
+            _gmail_local.connection = (creds, service)
+            if creds is not _gmail_creds:
+                _gmail_creds = creds
+                if creds.refresh_token:
+                    threading.Thread(target=_refresh_token_loop, args=(creds,), daemon=True).start()
             return service
         except Exception as e:
             error_msg = f"Failed to build Gmail service: {e}"
@@ -130,26 +242,332 @@ def connect_to_gmail() -> Any:
         raise
 
 
+def _token_mtime() -> Optional[float]:
+    """Modification time of token.json, or None if it does not exist."""
+    try:
+        return os.path.getmtime('token.json')
+    except OSError:
+        return None
+
+
+def _load_token() -> Optional[Credentials]:
+    """
+    Load credentials from token.json, reusing the parsed copy while the file is unchanged.
+
+    Returns:
+        Credentials, or None if token.json is missing or unreadable
+    """
+    global _token_cache
+
+    mtime = _token_mtime()
+    if mtime is None:
+        return None
+    if _token_cache is not None and _token_cache[0] == mtime:
+        logger.debug("Using in-memory credentials for unchanged token.json")
+        return _token_cache[1]
+
+    try:
+        creds = Credentials.from_authorized_user_file('token.json', SCOPES)
+        logger.debug("Loaded credentials from token.json")
+    except Exception as e:
+        logger.warning(f"Failed to load token.json, will re-authenticate: {e}")
+        return None
+    _token_cache = (mtime, creds)
+    return creds
+
+
+def _save_token(creds: Credentials) -> None:
+    """Write credentials to token.json for the next run (failures are only logged)."""
+    global _token_cache
+
+    try:
+        with open('token.json', 'w') as token:
+            token.write(creds.to_json())
+        _token_cache = (_token_mtime(), creds)
+        logger.debug("Saved credentials to token.json")
+    except Exception as e:
+        logger.warning(f"Failed to save token.json: {e}")
+
+
+def _seconds_until_refresh(creds: Credentials) -> float:
+    """Seconds until creds should be refreshed (TOKEN_REFRESH_MARGIN before expiry)."""
+    if creds.expiry is None:
+        return TOKEN_REFRESH_RETRY_SECONDS
+    # google-auth stores expiry as a naive UTC datetime
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    return (creds.expiry - TOKEN_REFRESH_MARGIN - now).total_seconds()
+
+
+def _refresh_token_loop(creds: Credentials) -> None:
+    """
+    Refresh the shared Gmail credentials shortly before they expire.
+
+    Runs on a daemon thread so requests don't pay for the refresh; the
+    transport's own refresh on expiry remains the fallback. Stops once
+    connect_to_gmail() has replaced these credentials.
+    """
+    while True:
+        wait = _seconds_until_refresh(creds)
+        if wait > 0:
+            time.sleep(wait)
+
+        with _gmail_lock:
+            if creds is not _gmail_creds:
+                return
+            try:
+                creds.refresh(Request())
+                logger.info("Refreshed Gmail token ahead of expiry")
+            except Exception as e:
+                logger.warning(f"Background token refresh failed, retrying in {TOKEN_REFRESH_RETRY_SECONDS}s: {e}")
+                get_metrics_tracker().record_error(__name__, type(e).__name__, f"Background token refresh failed: {e}")
+                refreshed = False
+            else:
+                refreshed = True
+        if refreshed:
+            _save_token(creds)
+        else:
+            time.sleep(TOKEN_REFRESH_RETRY_SECONDS)
+
+
+def _batch_http(service: Any) -> Any:
+    """
+    Build a separate authorized transport for a batch sent from a worker thread.
+
+    The service's own httplib2 connection is not thread-safe, so concurrent
+    batches each get their own connection with the same credentials.
+    """
+    creds = service._http.credentials
+    return AuthorizedHttp(creds, http=httplib2.Http(timeout=GOOGLE_API_TIMEOUT_SECONDS))
+
+
+def _borrow_batch_http(service: Any) -> Any:
+    """Take an idle worker transport for the service's credentials, or build one."""
+    creds = service._http.credentials
+    with _batch_http_lock:
+        entry = _idle_batch_https.get(id(creds))
+        if entry is not None and entry[0] is creds and entry[1]:
+            return entry[1].pop()
+    return _batch_http(service)
+
+
+def _return_batch_http(service: Any, http: Any) -> None:
+    """Keep a worker transport (and its open connection) for the next batch."""
+    creds = service._http.credentials
+    with _batch_http_lock:
+        entry = _idle_batch_https.get(id(creds))
+        if entry is None or entry[0] is not creds:
+            entry = _idle_batch_https[id(creds)] = (creds, [])
+        if len(entry[1]) < MAX_CONCURRENT_BATCHES:
+            entry[1].append(http)
+
+
+def _batch_get_messages(
+    service: Any,
+    email_ids: List[str],
+    operation: str,
+    **get_kwargs: Any
+) -> Dict[str, tuple]:
+    """
+    Get several Gmail messages in batched HTTP requests.
+
+    Sends up to GMAIL_BATCH_LIMIT messages().get() calls per round-trip.
+    When there is more than one batch, up to MAX_CONCURRENT_BATCHES run at
+    once on worker threads, each over its own connection; those connections
+    are kept open and reused by later calls. A failed message does not stop
+    the rest of its batch.
+
+    Args:
+        service: Authenticated Gmail API service instance
+        email_ids: Gmail message IDs
+        operation: Metrics operation name recorded for each batch
+        **get_kwargs: Extra messages().get() arguments (e.g. format='full')
+
+    Returns:
+        dict: Message ID -> (message or None, exception or None); IDs missing
+            from the result belong to a batch that failed as a whole
+    """
+    metrics = get_metrics_tracker()
+    results = {}
+
+    def _on_response(request_id, response, exception):
+        results[request_id] = (response, exception)
+
+    # Each users()/messages() call rebuilds every method of the resource from
+    # the discovery document, so build it once rather than once per message
+    messages_resource = service.users().messages()
+
+    # Requests are built on this thread; only execute() runs on the workers
+    batches = []
+    for chunk_start in range(0, len(email_ids), GMAIL_BATCH_LIMIT):
+        chunk = email_ids[chunk_start:chunk_start + GMAIL_BATCH_LIMIT]
+        batch = service.new_batch_http_request(callback=_on_response)
+        for email_id in chunk:
+            batch.add(
+                messages_resource.get(userId='me', id=email_id, **get_kwargs),
+                request_id=email_id
+            )
+        batches.append((batch, len(chunk)))
+
+    def _execute(batch, size, http=None):
+        start_time = time.time()
+        try:
+            batch.execute(http=http)
+            metrics.record_api_call("Gmail", operation, True, False, time.time() - start_time)
+        except Exception as e:
+            logger.error(f"Gmail batch request failed for {size} messages: {e}")
+            metrics.record_api_call("Gmail", operation, False, False, time.time() - start_time)
+            metrics.record_error(__name__, type(e).__name__, f"Gmail batch request failed: {e}")
+
+    def _execute_pooled(batch, size):
+        http = _borrow_batch_http(service)
+        try:
+            _execute(batch, size, http)
+        finally:
+            _return_batch_http(service, http)
+
+    if len(batches) == 1:
+        _execute(*batches[0])
+    elif batches:
+        with ThreadPoolExecutor(max_workers=min(len(batches), MAX_CONCURRENT_BATCHES)) as executor:
+            for batch, size in batches:
+                executor.submit(_execute_pooled, batch, size)
+
+    return results
+
+
+def _load_history_id() -> Optional[str]:
+    """historyId saved by the last fetch, or None if there is no usable state file."""
+    try:
+        with open(GMAIL_STATE_FILE, 'r') as f:
+            return json.load(f).get('history_id')
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError, AttributeError) as e:
+        logger.warning(f"Ignoring unreadable {GMAIL_STATE_FILE}: {e}")
+        return None
+
+
+def save_history_id(history_id: Optional[str]) -> None:
+    """
+    Persist the mailbox historyId for the next incremental fetch (failures are only logged).
+
+    Call this only once the fetched emails have been processed, alongside the
+    last fetch timestamp, so a failed run fetches the same delta again.
+
+    Args:
+        history_id: historyId returned by fetch_recent_emails(return_history_id=True)
+    """
+    if not history_id:
+        return
+    try:
+        with open(GMAIL_STATE_FILE, 'w') as f:
+            json.dump({'history_id': str(history_id)}, f)
+        logger.debug(f"Saved Gmail historyId {history_id}")
+    except Exception as e:
+        logger.warning(f"Failed to save {GMAIL_STATE_FILE}: {e}")
+
+
+def _current_history_id(service: Any) -> Optional[str]:
+    """Current mailbox historyId from users.getProfile, or None if it can't be read."""
+    try:
+        return service.users().getProfile(userId='me').execute().get('historyId')
+    except Exception as e:
+        logger.warning(f"Could not read Gmail historyId, next fetch will search again: {e}")
+        return None
+
+
+def _history_required_labels(query: str) -> Optional[frozenset]:
+    """
+    Translate a search query into labels an added message must carry.
+
+    Returns:
+        frozenset of label IDs, or None if the query uses terms that only
+        messages.list can evaluate
+    """
+    labels = set()
+    for term in _HISTORY_QUERY_IGNORED.sub('', query).split():
+        label = _HISTORY_QUERY_LABELS.get(term.lower())
+        if label is None:
+            return None
+        labels.add(label)
+    return frozenset(labels)
+
+
+def _list_added_since(service: Any, start_history_id: str, query: str, max_results: int):
+    """
+    List messages added since start_history_id that match query.
+
+    Returns:
+        tuple: (message IDs, newest first, at most max_results; new historyId),
+        or None if the delta can't be served from history and the caller
+        should search instead (unsupported query, or historyId too old)
+    """
+    required_labels = _history_required_labels(query)
+    if required_labels is None:
+        logger.debug(f"Query '{query}' needs a search, skipping history sync")
+        return None
+
+    history_resource = service.users().history()
+    added = {}
+    request_kwargs = {
+        'userId': 'me',
+        'startHistoryId': start_history_id,
+        'historyTypes': ['messageAdded']
+    }
+    try:
+        while True:
+            response = history_resource.list(**request_kwargs).execute()
+            for record in response.get('history', []):
+                for item in record.get('messagesAdded', []):
+                    message = item.get('message', {})
+                    labels = message.get('labelIds', [])
+                    if required_labels.issubset(labels) and _EXCLUDED_LABELS.isdisjoint(labels):
+                        added[message['id']] = None
+            page_token = response.get('nextPageToken')
+            if not page_token:
+                break
+            request_kwargs['pageToken'] = page_token
+    except HttpError as e:
+        if getattr(getattr(e, 'resp', None), 'status', None) == 404:
+            logger.info(f"Gmail historyId {start_history_id} has expired, falling back to search")
+            return None
+        raise
+
+    # History runs oldest first; messages.list returns newest first
+    message_ids = list(added)[::-1][:max_results]
+    return message_ids, response.get('historyId')
+
+
 def fetch_recent_emails(
     service: Any,
     max_results: int = 30,
     query: str = 'is:unread newer_than:1d',
-    after_timestamp: Optional[str] = None
-) -> List[Dict[str, str]]:
+    after_timestamp: Optional[str] = None,
+    return_history_id: bool = False
+) -> Union[List[Dict[str, str]], Tuple[List[Dict[str, str]], Optional[str]]]:
     """
     Fetch recent unread emails from Gmail.
 
     Retrieves emails matching the search query and extracts metadata
     (sender, subject, date, snippet, ID) for each message.
 
+    Incremental fetches (after_timestamp given) ask users.history.list for the
+    messages added since the historyId saved by the previous fetch instead of
+    searching again. Queries history can't evaluate, and expired historyIds,
+    fall back to the search. The fetch never saves a historyId itself: the
+    caller passes the one it gets back to save_history_id() once the emails
+    are processed.
+
     Args:
         service: Authenticated Gmail API service instance
         max_results: Maximum number of emails to fetch (default: 30)
         query: Gmail search query (default: unread emails from last 24 hours)
         after_timestamp: Fetch only emails after this timestamp (ISO format, optional)
+        return_history_id: Also return the mailbox historyId to save after processing
 
     Returns:
-        list: List of email dictionaries, each containing:
+        list: List of email dictionaries (or a tuple of that list and the new
+            historyId when return_history_id is True), each containing:
             - id: Email message ID
             - from: Sender email address
             - subject: Email subject line
@@ -166,7 +584,6 @@ def fetch_recent_emails(
     """
     # Add after filter to query if timestamp provided
     if after_timestamp:
-        from datetime import datetime
         try:
             dt = datetime.fromisoformat(after_timestamp)
             epoch_seconds = int(dt.timestamp())
@@ -180,58 +597,100 @@ def fetch_recent_emails(
     metrics = get_metrics_tracker()
 
     try:
-        # Execute Gmail API search query
-        try:
-            results = service.users().messages().list(
-                userId='me',
-                q=query,
-                maxResults=max_results
-            ).execute()
+        delta = None
+        history_id = _load_history_id() if after_timestamp else None
+        if history_id:
+            try:
+                delta = _list_added_since(service, history_id, query, max_results)
+            except Exception as e:
+                logger.warning(f"Gmail history sync failed, falling back to search: {e}")
+                metrics.record_error(__name__, type(e).__name__, f"History sync failed: {e}")
 
+        if delta is not None:
+            message_ids, new_history_id = delta
+            messages = [{'id': message_id} for message_id in message_ids]
             elapsed = time.time() - start_time
             log_api_call(logger, "Gmail", True)
-            metrics.record_api_call("Gmail", "list_messages", True, False, elapsed)
+            metrics.record_api_call("Gmail", "list_history", True, False, elapsed)
+            logger.info(f"History sync since {history_id}: {len(messages)} new emails")
+        else:
+            # Record the mailbox position before searching so nothing that
+            # arrives during the fetch is skipped by the next history sync
+            new_history_id = _current_history_id(service) if return_history_id else None
+
+            # Execute Gmail API search query
+            try:
+                results = service.users().messages().list(
+                    userId='me',
+                    q=query,
+                    maxResults=max_results
+                ).execute()
 
-        except HttpError as e:
-            error_msg = f"Gmail API error while listing messages: {e}"
-            logger.error(error_msg)
-            metrics.record_error(__name__, "HttpError", error_msg)
-            raise EmailFetchError(error_msg)
-        except Exception as e:
-            error_msg = f"Unexpected error while listing messages: {e}"
-            logger.error(error_msg)
-            metrics.record_error(__name__, type(e).__name__, error_msg)
-            raise EmailFetchError(error_msg)
+                elapsed = time.time() - start_time
+                log_api_call(logger, "Gmail", True)
+                metrics.record_api_call("Gmail", "list_messages", True, False, elapsed)
+
+            except HttpError as e:
+                error_msg = f"Gmail API error while listing messages: {e}"
+                logger.error(error_msg)
+                metrics.record_error(__name__, "HttpError", error_msg)
+                raise EmailFetchError(error_msg)
+            except Exception as e:
+                error_msg = f"Unexpected error while listing messages: {e}"
+                logger.error(error_msg)
+                metrics.record_error(__name__, type(e).__name__, error_msg)
+                raise EmailFetchError(error_msg)
+
+            messages = results.get('messages', [])
 
-        messages = results.get('messages', [])
         email_list = []
 
         if not messages:
             logger.info('No new messages found.')
             print('No new messages found.')
-            return email_list
+            return (email_list, new_history_id) if return_history_id else email_list
 
         logger.info(f"Found {len(messages)} emails. Fetching content...")
         print(f"Found {len(messages)} emails. Fetching content...\n")
 
-        # Extract metadata from each message
-        for idx, message in enumerate(messages, 1):
-            try:
-                msg_start_time = time.time()
+        # Messages seen by an earlier fetch come from memory; get the rest in
+        # batched requests, then extract metadata in list order
+        cached = {}
+        for message in messages:
+            email_dict = _cached_metadata(message['id'])
+            if email_dict is not None:
+                cached[message['id']] = email_dict
+        missing = [message['id'] for message in messages if message['id'] not in cached]
+        if cached:
+            logger.debug(f"Using cached metadata for {len(cached)}/{len(messages)} emails")
+        fetched = _batch_get_messages(
+            service, missing, "batch_get_message",
+            format='metadata', metadataHeaders=METADATA_HEADERS
+        ) if missing else {}
 
-                msg = service.users().messages().get(
-                    userId='me',
-                    id=message['id']
-                ).execute()
+        for idx, message in enumerate(messages, 1):
+            email_dict = cached.get(message['id'])
+            if email_dict is not None:
+                email_list.append(email_dict)
+                continue
 
-                msg_elapsed = time.time() - msg_start_time
-                metrics.record_api_call("Gmail", "get_message", True, False, msg_elapsed)
+            msg, exception = fetched.get(message['id'], (None, None))
+            if msg is None:
+                # Individual failures don't stop the rest of the batch
+                if exception is not None:
+                    logger.warning(f"Failed to fetch email {message['id']}: {exception}")
+                    metrics.record_error(__name__, type(exception).__name__, f"Failed to fetch email: {exception}")
+                continue
 
-                # Parse email headers
+            try:
+                # Parse email headers (indexed once by lowercased name)
                 headers = msg.get('payload', {}).get('headers', [])
-                subject = next((h['value'] for h in headers if h['name'] == 'Subject'), 'No Subject')
-                sender = next((h['value'] for h in headers if h['name'] == 'From'), 'Unknown Sender')
-                date = next((h['value'] for h in headers if h['name'] == 'Date'), 'Unknown Date')
+                header_index = {h['name'].lower(): h['value'] for h in headers}
+                subject = header_index.get('subject', 'No Subject')
+                # Senders repeat across a mailbox (newsletters, notifications):
+                # interning keeps one copy of each in the email list and caches
+                sender = sys.intern(header_index.get('from', 'Unknown Sender'))
+                date = header_index.get('date', 'Unknown Date')
 
                 # Get snippet (preview text)
                 snippet = msg.get('snippet', '')
@@ -246,14 +705,11 @@ def fetch_recent_emails(
                 }
 
                 email_list.append(email_dict)
+                _cache_metadata(message['id'], email_dict)
                 logger.debug(f"Fetched email {idx}/{len(messages)}: {subject[:50]}")
 
-            except HttpError as e:
-                logger.warning(f"Failed to fetch email {message['id']}: {e}")
-                metrics.record_error(__name__, "HttpError", f"Failed to fetch email: {e}")
-                continue
             except Exception as e:
-                logger.warning(f"Unexpected error fetching email {message['id']}: {e}")
+                logger.warning(f"Unexpected error parsing email {message['id']}: {e}")
                 metrics.record_error(__name__, type(e).__name__, f"Unexpected error: {e}")
                 continue
 
@@ -261,7 +717,7 @@ def fetch_recent_emails(
         log_performance(logger, f"Fetch {len(email_list)} emails", elapsed)
         logger.info(f"Successfully fetched {len(email_list)} emails in {elapsed:.2f}s")
 
-        return email_list
+        return (email_list, new_history_id) if return_history_id else email_list
 
     except Exception as e:
         elapsed = time.time() - start_time
@@ -273,6 +729,116 @@ def fetch_recent_emails(
         raise
 
 
+def _decode_base64(data: str) -> str:
+    """
+    Decode Gmail's URL-safe base64 body data to text.
+
+    Maps the URL-safe alphabet with a translation table and calls binascii
+    directly; undecodable UTF-8 bytes become U+FFFD instead of losing the body.
+    """
+    try:
+        raw = data.encode('ascii').translate(_URLSAFE_TO_STD_B64)
+        return binascii.a2b_base64(raw + b'=' * (-len(raw) % 4)).decode('utf-8', errors='replace')
+    except Exception as e:
+        logger.warning(f"Failed to decode base64 content: {e}")
+        return ""
+
+
+def _body_from_message(msg: Dict[str, Any], email_id: str) -> str:
+    """
+    Extract the plain-text body from a Gmail message fetched with format='full'.
+
+    Args:
+        msg: Gmail API message resource
+        email_id: Gmail message ID (for logging)
+
+    Returns:
+        str: Body text, or the snippet if no text part was found
+    """
+    payload = msg.get('payload', {})
+
+    # Check if body is directly in payload (simple emails)
+    if 'body' in payload and payload['body'].get('data'):
+        body = _decode_base64(payload['body']['data'])
+        logger.debug(f"Extracted body (direct) for {email_id}: {len(body)} chars")
+        return body
+
+    # Handle multipart messages (emails with attachments or HTML): walk every
+    # part once, at any nesting depth, taking the first text/plain part and
+    # remembering the first text/html part as the fallback
+    html_data = None
+    pending = deque(payload.get('parts', ()))
+    while pending:
+        part = pending.popleft()
+        data = part.get('body', {}).get('data')
+        mime_type = part.get('mimeType')
+        if data and mime_type == 'text/plain':
+            body = _decode_base64(data)
+            logger.debug(f"Extracted body (text/plain) for {email_id}: {len(body)} chars")
+            return body
+        if data and mime_type == 'text/html' and html_data is None:
+            html_data = data
+        if 'parts' in part:
+            pending.extend(part['parts'])
+
+    if html_data is not None:
+        html_content = _decode_base64(html_data)
+        # Strip HTML tags (skipped when there are none)
+        text = _HTML_TAG_RE.sub('', html_content) if '<' in html_content else html_content
+        logger.debug(f"Extracted body (text/html) for {email_id}: {len(text)} chars")
+        return text
+
+    # Fallback: return snippet if body extraction failed
+    snippet = msg.get('snippet', '')
+    logger.warning(f"Could not extract full body for {email_id}, using snippet: {len(snippet)} chars")
+    return snippet
+
+
+def _cached_body(email_id: str) -> Optional[str]:
+    """Get a previously extracted body, marking it most recently used."""
+    with _body_cache_lock:
+        body = _body_cache.get(email_id)
+        if body is not None:
+            _body_cache.move_to_end(email_id)
+        return body
+
+
+def _cache_body(email_id: str, body: str) -> None:
+    """Remember an extracted body, evicting the least recently used past BODY_CACHE_SIZE."""
+    with _body_cache_lock:
+        _body_cache[email_id] = body
+        _body_cache.move_to_end(email_id)
+        if len(_body_cache) > BODY_CACHE_SIZE:
+            _body_cache.popitem(last=False)
+
+
+def _cached_metadata(email_id: str) -> Optional[Dict[str, Any]]:
+    """Get a copy of a previously fetched email dict, marking it most recently used."""
+    with _metadata_cache_lock:
+        email_dict = _metadata_cache.get(email_id)
+        if email_dict is None:
+            return None
+        _metadata_cache.move_to_end(email_id)
+        return dict(email_dict)
+
+
+def _cache_metadata(email_id: str, email_dict: Dict[str, Any]) -> None:
+    """Remember a fetched email dict, evicting the least recently used past METADATA_CACHE_SIZE."""
+    with _metadata_cache_lock:
+        _metadata_cache[email_id] = dict(email_dict)
+        _metadata_cache.move_to_end(email_id)
+        if len(_metadata_cache) > METADATA_CACHE_SIZE:
+            _metadata_cache.popitem(last=False)
+
+
+def forget_email_body(email_id: str) -> None:
+    """Drop a message's cached body and metadata (e.g. after it is trashed)."""
+    with _body_cache_lock:
+        _body_cache.pop(email_id, None)
+    with _metadata_cache_lock:
+        _metadata_cache.pop(email_id, None)
+
+
 def extract_email_body(service: Any, email_id: str) -> str:
     """
     Extract full email body content from a specific email.
@@ -292,7 +858,13 @@ def extract_email_body(service: Any, email_id: str) -> str:
         - Handles nested multipart messages
         - Removes HTML tags from HTML content
         - Falls back to snippet if body extraction fails
+        - Keeps the last BODY_CACHE_SIZE bodies in memory; failures are not cached
     """
+    body = _cached_body(email_id)
+    if body is not None:
+        logger.debug(f"Using cached body for email: {email_id}")
+        return body
+
     logger.debug(f"Extracting body for email: {email_id}")
     start_time = time.time()
     metrics = get_metrics_tracker()
@@ -318,52 +890,9 @@ def extract_email_body(service: Any, email_id: str) -> str:
             metrics.record_error(__name__, type(e).__name__, f"Unexpected error: {e}")
             return ""
 
-        def decode_base64(data: str) -> str:
-            """Decode base64-encoded email content."""
-            try:
-                return base64.urlsafe_b64decode(data).decode('utf-8')
-            except Exception as e:
-                logger.warning(f"Failed to decode base64 content: {e}")
-                return ""
-
-        payload = msg.get('payload', {})
-
-        # Check if body is directly in payload (simple emails)
-        if 'body' in payload and payload['body'].get('data'):
-            body = decode_base64(payload['body']['data'])
-            logger.debug(f"Extracted body (direct) for {email_id}: {len(body)} chars")
-            return body
-
-        # Handle multipart messages (emails with attachments or HTML)
-        if 'parts' in payload:
-            # First pass: look for plain text
-            for part in payload['parts']:
-                if part.get('mimeType') == 'text/plain' and part.get('body', {}).get('data'):
-                    body = decode_base64(part['body']['data'])
-                    logger.debug(f"Extracted body (text/plain) for {email_id}: {len(body)} chars")
-                    return body
-
-            # Second pass: fall back to HTML if plain text not found
-            for part in payload['parts']:
-                if part.get('mimeType') == 'text/html' and part.get('body', {}).get('data'):
-                    html_content = decode_base64(part['body']['data'])
-                    # Strip HTML tags using regex
-                    text = re.sub('<[^<]+?>', '', html_content)
-                    logger.debug(f"Extracted body (text/html) for {email_id}: {len(text)} chars")
-                    return text
-
-                # Check nested parts (e.g., multipart/alternative)
-                if 'parts' in part:
-                    for subpart in part['parts']:
-                        if subpart.get('mimeType') == 'text/plain' and subpart.get('body', {}).get('data'):
-                            body = decode_base64(subpart['body']['data'])
-                            logger.debug(f"Extracted body (nested) for {email_id}: {len(body)} chars")
-                            return body
-
-        # Fallback: return snippet if body extraction failed
-        snippet = msg.get('snippet', '')
-        logger.warning(f"Could not extract full body for {email_id}, using snippet: {len(snippet)} chars")
-        return snippet
+        body = _body_from_message(msg, email_id)
+        _cache_body(email_id, body)
+        return body
 
     except Exception as e:
         log_exception(logger, e, f"Error extracting email body for {email_id}")
@@ -371,6 +900,58 @@ def extract_email_body(service: Any, email_id: str) -> str:
         return ""
 
 
+def extract_email_bodies(service: Any, email_ids: List[str]) -> Dict[str, str]:
+    """
+    Extract the bodies of several emails in batched Gmail requests.
+
+    Sends GMAIL_BATCH_LIMIT message gets per HTTP round-trip instead of one
+    request per email; each body is extracted as in extract_email_body().
+    Bodies already in the in-memory cache are not fetched again.
+
+    Args:
+        service: Authenticated Gmail API service instance
+        email_ids: Gmail message IDs
+
+    Returns:
+        dict: Message ID -> body text ('' for messages that failed to fetch)
+    """
+    bodies = {}
+    missing = []
+    for email_id in email_ids:
+        body = _cached_body(email_id)
+        if body is None:
+            missing.append(email_id)
+        else:
+            bodies[email_id] = body
+
+    if len(missing) <= 1:
+        for email_id in missing:
+            bodies[email_id] = extract_email_body(service, email_id)
+        return bodies
+
+    logger.debug(f"Extracting {len(missing)} email bodies in batches of {GMAIL_BATCH_LIMIT}")
+    metrics = get_metrics_tracker()
+
+    messages = _batch_get_messages(service, missing, "batch_get_message_full", format='full')
+    for email_id in missing:
+        msg, exception = messages.get(email_id, (None, None))
+        if msg is None:
+            if exception is not None:
+                logger.error(f"Gmail API error extracting body for {email_id}: {exception}")
+                metrics.record_error(__name__, type(exception).__name__, f"Failed to extract email body: {exception}")
+            bodies[email_id] = ""
+            continue
+        try:
+            bodies[email_id] = _body_from_message(msg, email_id)
+            _cache_body(email_id, bodies[email_id])
+        except Exception as e:
+            log_exception(logger, e, f"Error extracting email body for {email_id}")
+            metrics.record_error(__name__, type(e).__name__, f"Error extracting email body: {e}")
+            bodies[email_id] = ""
+
+    return bodies
+
+
 def display_emails(email_list: List[Dict[str, str]]) -> None:
     """
     Display emails in a clean, formatted console output.
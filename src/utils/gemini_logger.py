@@ -1,14 +1,45 @@
 """
 Gemini Interaction Logger
 Logs all Gemini API requests and responses to a separate file with daily rotation.
-Provides high readability with formatted output and metadata.
+Each interaction is one JSON object per line (timestamp, operation, metadata,
+request, response) in a gzip-compressed file, written as one complete gzip
+member per batch so several processes can append to the same day's file;
+uncompressed files and the older multi-line text format are still read.
 """
 
+import atexit
+import gzip
 import os
 import json
+import queue
+import threading
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Iterator, Optional
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:  # Optional dependency - fall back to stdlib json
+    _json_loads = json.loads
+
+# Daily log files are named gemini_interactions_YYYY-MM-DD.log.gz
+LOG_FILE_PREFIX = 'gemini_interactions_'
+LOG_FILE_SUFFIX = '.log.gz'
+# Uncompressed daily files written before compression (still read)
+PLAIN_LOG_FILE_SUFFIX = '.log'
+
+# Fastest gzip level: repeated prompt/JSON text still compresses several times over
+GZIP_COMPRESSLEVEL = 1
+
+# Entry separator of the older multi-line text format (still readable)
+SEPARATOR = "=" * 100
+
+# Entries waiting for the background writer; new entries are dropped when full
+MAX_PENDING_ENTRIES = 1024
+# Most entries the writer appends in one write, and how long it waits to fill a batch
+WRITE_BATCH_SIZE = 64
+WRITE_BATCH_WAIT_SECONDS = 0.1
 
 
 class GeminiLogger:
@@ -29,10 +60,19 @@ class GeminiLogger:
         self.log_dir = Path(log_dir)
         self.log_dir.mkdir(parents=True, exist_ok=True)
 
+        # (log file, entry text) pairs written by a daemon thread started on first use
+        self._queue = queue.Queue(maxsize=MAX_PENDING_ENTRIES)
+        self._writer_thread = None
+        self._writer_lock = threading.Lock()
+
+        # Unbuffered append handle for the current day's file, owned by the writer thread
+        self._fh = None
+        self._fh_path = None
+
     def _get_log_file_path(self) -> Path:
         """Get current log file path with date-based naming."""
         today = datetime.now().strftime('%Y-%m-%d')
-        return self.log_dir / f'gemini_interactions_{today}.log'
+        return self.log_dir / f'{LOG_FILE_PREFIX}{today}{LOG_FILE_SUFFIX}'
 
     def _format_prompt(self, prompt: str, max_length: int = 500) -> str:
         """Format prompt for display, truncating if too long."""
@@ -45,11 +85,13 @@ class GeminiLogger:
         if isinstance(response, dict):
             return json.dumps(response, indent=2)
         elif isinstance(response, str):
+            # Only text that looks like a JSON object/array is worth parsing
+            if response.lstrip()[:1] not in ('{', '['):
+                return response
             try:
-                # Try to parse as JSON for pretty printing
-                parsed = json.loads(response)
-                return json.dumps(parsed, indent=2)
-            except:
+                # Pretty print JSON responses
+                return json.dumps(_json_loads(response), indent=2)
+            except ValueError:
                 return response
         return str(response)
 
@@ -72,43 +114,88 @@ class GeminiLogger:
         log_file = self._get_log_file_path()
         timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S.%f')[:-3]
 
-        # Build log entry
-        separator = "=" * 100
-        entry_parts = [
-            f"\n{separator}",
-            f"TIMESTAMP: {timestamp}",
-            f"OPERATION: {operation}",
-        ]
-
-        # Add metadata if provided
-        if metadata:
-            entry_parts.append("METADATA:")
-            for key, value in metadata.items():
-                entry_parts.append(f"  - {key}: {value}")
-
-        # Add prompt
-        entry_parts.extend([
-            f"\n{'REQUEST (Prompt):':-^100}",
-            self._format_prompt(prompt),
-        ])
-
-        # Add response
-        entry_parts.extend([
-            f"\n{'RESPONSE:':-^100}",
-            self._format_response(response),
-        ])
-
-        entry_parts.append(separator)
-
-        # Write to file
-        log_entry = "\n".join(entry_parts) + "\n"
+        log_entry = json.dumps({
+            'timestamp': timestamp,
+            'operation': operation,
+            'metadata': {key: str(value) for key, value in (metadata or {}).items()},
+            'request': self._format_prompt(prompt),
+            'response': self._format_response(response)
+        }, ensure_ascii=False) + "\n"
 
+        # Hand the write to the background thread so the caller doesn't wait on disk
+        self._ensure_writer()
         try:
-            with open(log_file, 'a', encoding='utf-8') as f:
-                f.write(log_entry)
-        except Exception as e:
-            # Fail silently - don't break the main application
-            print(f"Warning: Failed to write Gemini log: {e}")
+            self._queue.put_nowait((log_file, log_entry))
+        except queue.Full:
+            # Fail silently - don't break (or block) the main application
+            print("Warning: Gemini log queue full, dropping entry")
+
+    def _ensure_writer(self):
+        """Start the background writer thread on first use."""
+        if self._writer_thread is not None:
+            return
+        with self._writer_lock:
+            if self._writer_thread is None:
+                self._writer_thread = threading.Thread(target=self._writer, name='gemini-log-writer', daemon=True)
+                self._writer_thread.start()
+                atexit.register(self.close)
+
+    def _writer(self):
+        """Append queued entries to their log files, batching bursts into one write per file."""
+        while True:
+            batch = [self._queue.get()]
+            try:
+                while len(batch) < WRITE_BATCH_SIZE:
+                    batch.append(self._queue.get(timeout=WRITE_BATCH_WAIT_SECONDS))
+            except queue.Empty:
+                pass
+
+            # Group by file (a batch can span midnight), keeping entry order
+            by_file = {}
+            for log_file, log_entry in batch:
+                by_file.setdefault(log_file, []).append(log_entry)
+            for log_file, entries in by_file.items():
+                try:
+                    # One complete gzip member per batch, appended in a single
+                    # write, so members from other processes never interleave
+                    member = gzip.compress("".join(entries).encode('utf-8'), compresslevel=GZIP_COMPRESSLEVEL)
+                    self._open_log_file(log_file).write(member)
+                except Exception as e:
+                    # Fail silently - don't break the main application
+                    print(f"Warning: Failed to write Gemini log: {e}")
+                    self._close_log_file()
+
+            for _ in batch:
+                self._queue.task_done()
+
+    def _open_log_file(self, log_file: Path):
+        """Get the append handle for log_file, reopening only when the day's file changes."""
+        if self._fh is None or self._fh_path != log_file:
+            self._close_log_file()
+            # Readers decompress the appended gzip members in sequence
+            self._fh = open(log_file, 'ab', buffering=0)
+            self._fh_path = log_file
+        return self._fh
+
+    def _close_log_file(self):
+        """Close the cached log file handle, if any."""
+        if self._fh is not None:
+            try:
+                self._fh.close()
+            except Exception:
+                pass
+            self._fh = None
+            self._fh_path = None
+
+    def flush(self):
+        """Block until every logged interaction has been written to disk."""
+        if self._writer_thread is not None:
+            self._queue.join()
+
+    def close(self):
+        """Write pending interactions and close the log file."""
+        self.flush()
+        self._close_log_file()
 
     def get_log_entries(self, date: Optional[str] = None) -> list:
         """
@@ -120,37 +207,78 @@ class GeminiLogger:
         Returns:
             List of log entry dictionaries
         """
-        if date is None:
-            date = datetime.now().strftime('%Y-%m-%d')
+        return list(self.iter_log_entries(date))
 
-        log_file = self.log_dir / f'gemini_interactions_{date}.log'
+    def iter_log_entries(self, date: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Stream log entries for a specific date or today, one line at a time.
 
-        if not log_file.exists():
-            return []
+        Args:
+            date: Date string in YYYY-MM-DD format. Defaults to today.
 
-        entries = []
-        try:
-            with open(log_file, 'r', encoding='utf-8') as f:
-                content = f.read()
+        Yields:
+            Log entry dictionaries (timestamp, operation, metadata, request, response)
+        """
+        if date is None:
+            date = datetime.now().strftime('%Y-%m-%d')
 
-            # Split by separator
-            raw_entries = content.split("=" * 100)
+        # Include entries still waiting for the background writer
+        self.flush()
 
-            for raw_entry in raw_entries:
-                if not raw_entry.strip():
-                    continue
+        # A day's uncompressed file (from before compression) holds its earlier entries
+        for suffix in (PLAIN_LOG_FILE_SUFFIX, LOG_FILE_SUFFIX):
+            log_file = self.log_dir / f'{LOG_FILE_PREFIX}{date}{suffix}'
+            if log_file.exists():
+                yield from self._iter_file_entries(log_file)
 
-                entry = self._parse_log_entry(raw_entry)
-                if entry:
-                    entries.append(entry)
+    def _iter_file_entries(self, log_file: Path) -> Iterator[Dict[str, Any]]:
+        """Stream the entries of one log file, compressed or not."""
+        # Lines of older text-format entries (files written before the JSON format)
+        legacy_lines = []
+        try:
+            if log_file.name.endswith('.gz'):
+                f = gzip.open(log_file, 'rt', encoding='utf-8')
+            else:
+                f = open(log_file, 'r', encoding='utf-8')
+            with f:
+                try:
+                    for line in f:
+                        if line.startswith('{'):
+                            try:
+                                entry = _json_loads(line)
+                            except ValueError:
+                                entry = None
+                            if isinstance(entry, dict) and 'timestamp' in entry:
+                                # Keep file order: text entries before this line come first
+                                yield from self._parse_legacy_entries(legacy_lines)
+                                legacy_lines = []
+                                yield entry
+                                continue
+                        legacy_lines.append(line)
+                except EOFError:
+                    # A member cut short (e.g. a process killed mid-write):
+                    # keep the entries read before it
+                    pass
+
+            yield from self._parse_legacy_entries(legacy_lines)
 
         except Exception as e:
             print(f"Error reading Gemini logs: {e}")
 
-        return entries
+    def _parse_legacy_entries(self, lines: list) -> Iterator[Dict[str, Any]]:
+        """Parse consecutive lines of text-format entries."""
+        if not lines:
+            return
+        for raw_entry in "".join(lines).split(SEPARATOR):
+            if not raw_entry.strip():
+                continue
+
+            entry = self._parse_log_entry(raw_entry)
+            if entry:
+                yield entry
 
     def _parse_log_entry(self, raw_entry: str) -> Optional[Dict[str, Any]]:
-        """Parse a raw log entry into structured data."""
+        """Parse a raw text-format log entry into structured data."""
         try:
             lines = raw_entry.strip().split('\n')
 
@@ -201,11 +329,18 @@ class GeminiLogger:
 
     def get_available_dates(self) -> list:
         """Get list of dates that have log files."""
-        dates = []
-        for log_file in self.log_dir.glob('gemini_interactions_*.log'):
-            # Extract date from filename
-            date_str = log_file.stem.replace('gemini_interactions_', '')
-            dates.append(date_str)
+        # Scan names directly (no Path per entry) and slice the date out
+        prefix_len = len(LOG_FILE_PREFIX)
+        dates = set()
+        with os.scandir(self.log_dir) as entries:
+            for entry in entries:
+                name = entry.name
+                if not name.startswith(LOG_FILE_PREFIX):
+                    continue
+                for suffix in (LOG_FILE_SUFFIX, PLAIN_LOG_FILE_SUFFIX):
+                    if name.endswith(suffix):
+                        dates.add(name[prefix_len:-len(suffix)])
+                        break
         return sorted(dates, reverse=True)
 
 
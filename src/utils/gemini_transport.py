@@ -0,0 +1,103 @@
+"""
+Gemini Client Transport
+Builds one process-wide Gemini client per API key with a bounded, keep-alive
+HTTP connection pool and SDK-level server-error retries, so concurrent
+categorization and automation calls share warm connections instead of each
+client's defaults.
+"""
+
+import os
+import threading
+from typing import Dict, Optional
+
+import google.genai as genai
+import httpx
+from google.genai import types
+
+from .logger_utils import setup_logger
+
+# Initialize logger
+logger = setup_logger(__name__)
+
+# Connection pool bounds shared by every Gemini request in the process
+MAX_CONNECTIONS = 64
+MAX_KEEPALIVE_CONNECTIONS = 32
+
+# Retry transient server errors with exponential backoff. Rate limits (429) are
+# retried once, by retry_on_rate_limit around each request, not here as well.
+RETRY_ATTEMPTS = 5
+RETRY_INITIAL_DELAY_SECONDS = 0.5
+RETRY_STATUS_CODES = [500, 502, 503, 504]
+
+# Pricing/latency tier for automation and context calls, e.g. GEMINI_TIER=flex;
+# unset leaves the API default (standard)
+GEMINI_TIER_ENV = 'GEMINI_TIER'
+
+# api_key -> genai.Client
+_clients: Dict[str, genai.Client] = {}
+_clients_lock = threading.Lock()
+
+
+def _http_options() -> types.HttpOptions:
+    """Build the pooled transport and retry settings for a Gemini client."""
+    limits = httpx.Limits(
+        max_connections=MAX_CONNECTIONS,
+        max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS
+    )
+    return types.HttpOptions(
+        client_args={'limits': limits},
+        async_client_args={'limits': limits},
+        retry_options=types.HttpRetryOptions(
+            attempts=RETRY_ATTEMPTS,
+            initial_delay=RETRY_INITIAL_DELAY_SECONDS,
+            exp_base=2,
+            http_status_codes=RETRY_STATUS_CODES
+        )
+    )
+
+
+def get_client(api_key: str) -> genai.Client:
+    """
+    Get the shared Gemini client for an API key, creating it on first use.
+
+    Args:
+        api_key: Gemini API key
+
+    Returns:
+        genai.Client: Process-wide client reused by all callers with this key
+    """
+    with _clients_lock:
+        client = _clients.get(api_key)
+        if client is None:
+            client = genai.Client(api_key=api_key, http_options=_http_options())
+            _clients[api_key] = client
+            logger.info(
+                "Created shared Gemini client (max_connections=%d, retry_attempts=%d)",
+                MAX_CONNECTIONS, RETRY_ATTEMPTS
+            )
+        return client
+
+
+def get_service_tier() -> Optional['types.ServiceTier']:
+    """
+    Resolve the GEMINI_TIER setting to the SDK's service tier.
+
+    The tier is dropped (with a warning) when it is unknown or when the
+    installed SDK's GenerateContentConfig has no service_tier field, since
+    that config rejects unknown keys and every request would fail.
+
+    Returns:
+        types.ServiceTier: Tier to send with generate_content, or None to leave it unset
+    """
+    name = os.getenv(GEMINI_TIER_ENV, '').strip()
+    if not name:
+        return None
+    service_tier = getattr(types, 'ServiceTier', None)
+    if service_tier is None or 'service_tier' not in getattr(types.GenerateContentConfig, 'model_fields', {}):
+        logger.warning("Ignoring %s=%s: installed google-genai does not support service tiers", GEMINI_TIER_ENV, name)
+        return None
+    try:
+        return service_tier(name.lower())
+    except ValueError:
+        logger.warning("Ignoring unknown %s=%s", GEMINI_TIER_ENV, name)
+        return None
@@ -5,18 +5,201 @@ with comprehensive error handling, logging, and metrics tracking.
 """
 
 import json
+import re
+import threading
 import time
 import traceback
+from concurrent.futures import Future, ThreadPoolExecutor
 from typing import List, Dict, Any, Optional
 
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:  # Optional dependency - fall back to stdlib json
+    _json_loads = json.loads
+
 from .logger_utils import setup_logger, log_exception, log_api_call, log_performance
 from .metrics_utils import get_metrics_tracker
 from .gemini_logger import get_gemini_logger
+from .rate_limiter import TokenBucket, retry_on_rate_limit
+from .response_cache import get_response_cache
 
 # Initialize logger
 logger = setup_logger(__name__)
 gemini_logger = get_gemini_logger()
 
+# Categorization requests in flight at once; each still waits for a rate-limit token
+MAX_CONCURRENT_CATEGORIZATIONS = 8
+
+# Emails categorized per Gemini request (one round-trip and one copy of the rules)
+CATEGORIZATION_BATCH_SIZE = 10
+
+# Response cache prompt type: categorizations keyed by a hash of from/subject/snippet
+CATEGORIZE_PROMPT_TYPE = 'categorize'
+
+# Fields of a categorization result, as described to Gemini
+_CATEGORIZATION_FIELDS = """  "category": "<one of: Need-Action, FYI, Newsletter, Marketing, SPAM>",
+  "subcategory": "<one of: Bill-Due, Credit-Card-Payment, Service-Change, Package-Tracker, JobAlert, General>",
+  "summary": "<one sentence summary>",
+  "action_item": "<one of: AddToCalendar, AddToNotes, Unsubscribe, Delete, None>",
+  "date_due": "<date if applicable, otherwise null>",
+  "unsubscribe_email": "<for SPAM only: extract unsubscribe email from message body, otherwise null>\""""
+
+_CLASSIFICATION_RULES = """Classification Rules:
+- Need-Action: Requires user response (bills, important tasks)
+- FYI: Information only (receipts, updates, confirmations, package delivery updates, online orders)
+- Marketing: Promotional content, sales, offers
+- Newsletter: Regular newsletters, digests
+- SPAM: Unwanted content, suspicious emails
+
+For SPAM emails: Look for unsubscribe email addresses in the message body (like "unsubscribe@company.com" or "optout@domain.com")."""
+
+# Returned in place of a categorization when the Gemini request fails
+_FALLBACK_CATEGORIZATION = {
+    "category": "Unknown",
+    "subcategory": "None",
+    "summary": "Failed to categorize",
+    "action_item": "None",
+    "date_due": None
+}
+
+# Gemini structured output: JSON mode plus a schema (OpenAPI subset) per response type
+_JSON_RESPONSE_CONFIG = {'response_mime_type': 'application/json'}
+_NULLABLE_STRING = {'type': 'STRING', 'nullable': True}
+_CATEGORIZATION_SCHEMA = {
+    'type': 'OBJECT',
+    'properties': {
+        'category': {'type': 'STRING', 'enum': ['Need-Action', 'FYI', 'Newsletter', 'Marketing', 'SPAM']},
+        'subcategory': {
+            'type': 'STRING',
+            'enum': ['Bill-Due', 'Credit-Card-Payment', 'Service-Change', 'Package-Tracker', 'JobAlert', 'General']
+        },
+        'summary': {'type': 'STRING'},
+        'action_item': {'type': 'STRING', 'enum': ['AddToCalendar', 'AddToNotes', 'Unsubscribe', 'Delete', 'None']},
+        'date_due': _NULLABLE_STRING,
+        'unsubscribe_email': _NULLABLE_STRING,
+    },
+    'required': ['category', 'subcategory', 'summary', 'action_item', 'date_due', 'unsubscribe_email'],
+}
+_CATEGORIZATION_BATCH_SCHEMA = {
+    'type': 'OBJECT',
+    'properties': {
+        'results': {
+            'type': 'ARRAY',
+            'items': {
+                **_CATEGORIZATION_SCHEMA,
+                'properties': {'index': {'type': 'INTEGER'}, **_CATEGORIZATION_SCHEMA['properties']},
+                'required': ['index', *_CATEGORIZATION_SCHEMA['required']],
+            },
+        },
+    },
+    'required': ['results'],
+}
+_NEWSLETTER_SUMMARY_SCHEMA = {
+    'type': 'OBJECT',
+    'properties': {
+        'bullet1': {'type': 'STRING'},
+        'bullet2': {'type': 'STRING'},
+        'bullet3': {'type': 'STRING'},
+    },
+    'required': ['bullet1', 'bullet2', 'bullet3'],
+}
+_CATEGORY_SUMMARY_SCHEMA = {
+    'type': 'OBJECT',
+    'properties': {
+        'summary_points': {'type': 'ARRAY', 'items': {'type': 'STRING'}},
+    },
+    'required': ['summary_points'],
+}
+
+# Full prompt templates, built once at import. Placeholders are filled with
+# str.format per call, so literal JSON braces are doubled inside the f-strings
+_EMAIL_BLOCK = "From: {from}\nSubject: {subject}\nContent: {snippet}"
+_BATCH_EMAIL_BLOCK = "Email {0}:\nFrom: {from}\nSubject: {subject}\nContent: {snippet}"
+
+_CATEGORIZE_PROMPT = f"""Analyze the following email and respond ONLY with a valid JSON object (no markdown, no code blocks, just pure JSON):
+
+{{email_block}}
+
+Respond with this exact JSON structure:
+{{{{
+{_CATEGORIZATION_FIELDS}
+}}}}
+
+{_CLASSIFICATION_RULES}
+
+Only return the JSON object, nothing else."""
+
+_CATEGORIZE_BATCH_PROMPT = f"""Analyze each of the following {{count}} emails and respond ONLY with a valid JSON object (no markdown, no code blocks, just pure JSON):
+
+{{email_blocks}}
+
+Respond with this exact JSON structure, with one object in "results" per email:
+{{{{"results": [...]}}}}
+
+where each object is:
+{{{{
+  "index": <email number>,
+{_CATEGORIZATION_FIELDS}
+}}}}
+
+{_CLASSIFICATION_RULES}
+
+Only return the JSON object, nothing else."""
+
+_NEWSLETTER_SUMMARY_PROMPT = """Analyze the following newsletter email and create a concise 3-bullet point summary.
+
+Subject: {subject}
+
+Email Content:
+{body}
+
+Respond ONLY with a JSON object containing exactly 3 bullet points:
+{{
+  "bullet1": "<first key point>",
+  "bullet2": "<second key point>",
+  "bullet3": "<third key point>"
+}}
+
+Each bullet point should be:
+- One clear, informative sentence
+- Capture the main topics or insights
+- Be specific and actionable when possible
+
+Only return the JSON object, nothing else."""
+
+_CATEGORY_SUMMARY_PROMPT = """Analyze the following {category_name} emails and create a consolidated bullet point summary.
+
+Emails:
+{emails}
+
+Respond ONLY with a JSON object containing bullet points (up to 5 key points):
+{{
+  "summary_points": ["<point 1>", "<point 2>", "<point 3>", ...]
+}}
+
+Each bullet point should:
+- Highlight the most important or urgent items
+- Group similar items together when applicable
+- Be clear and actionable
+
+Only return the JSON object, nothing else."""
+
+# Responses that still arrive wrapped in a ```json fence
+_FENCE = re.compile(r'^```(?:json)?\s*|\s*```$')
+
+
+def _strip_fence(text: str) -> str:
+    """Strip a ```json fence from stripped response text; bare JSON skips the regex."""
+    if text.startswith('`') or text.endswith('`'):
+        return _FENCE.sub('', text)
+    return text
+
+
+# requests_per_minute -> TokenBucket shared by every categorize_emails() call at that rate
+_limiters: Dict[int, TokenBucket] = {}
+_limiters_lock = threading.Lock()
+
 
 class GeminiAPIError(Exception):
     """Raised when Gemini API call fails."""
@@ -57,6 +240,17 @@ def _safe_extract_text(response) -> str:
             return ""
 
 
+def _json_config(response_schema: Dict[str, Any]) -> Dict[str, Any]:
+    """Build a generation config asking for JSON that follows response_schema."""
+    return dict(_JSON_RESPONSE_CONFIG, response_schema=response_schema)
+
+
+@retry_on_rate_limit(max_attempts=3, base=2.0, jitter=True)
+def _generate_content(client: Any, model_name: str, prompt: str, config: Optional[Dict[str, Any]] = None) -> Any:
+    """Send one prompt to Gemini, backing off and retrying on HTTP 429."""
+    return client.models.generate_content(model=model_name, contents=prompt, config=config)
+
+
 def categorize_email_with_gemini(email_dict: Dict[str, str], client: Any, model_name: str) -> Dict[str, Any]:
     """
     Categorize a single email using Gemini AI.
@@ -78,44 +272,29 @@ def categorize_email_with_gemini(email_dict: Dict[str, str], client: Any, model_
             - date_due: Due date if applicable, otherwise None
 
     Note:
-        Returns fallback categorization with "Unknown" category on error
+        Returns fallback categorization with "Unknown" category on error.
+        Emails with the same sender, subject and snippet as an earlier one
+        reuse its categorization from the response cache.
     """
     logger.debug(f"Categorizing email: {email_dict.get('subject', 'No Subject')[:50]}")
     start_time = time.time()
     metrics = get_metrics_tracker()
 
-    # Construct structured prompt for Gemini
-    prompt = f"""Analyze the following email and respond ONLY with a valid JSON object (no markdown, no code blocks, just pure JSON):
-
-From: {email_dict['from']}
-Subject: {email_dict['subject']}
-Content: {email_dict['snippet']}
-
-Respond with this exact JSON structure:
-{{
-  "category": "<one of: Need-Action, FYI, Newsletter, Marketing, SPAM>",
-  "subcategory": "<one of: Bill-Due, Credit-Card-Payment, Service-Change, Package-Tracker, JobAlert, General>",
-  "summary": "<one sentence summary>",
-  "action_item": "<one of: AddToCalendar, AddToNotes, Unsubscribe, Delete, None>",
-  "date_due": "<date if applicable, otherwise null>",
-  "unsubscribe_email": "<for SPAM only: extract unsubscribe email from message body, otherwise null>"
-}}
-
-Classification Rules:
-- Need-Action: Requires user response (bills, important tasks)
-- FYI: Information only (receipts, updates, confirmations, package delivery updates, online orders)
-- Marketing: Promotional content, sales, offers
-- Newsletter: Regular newsletters, digests
-- SPAM: Unwanted content, suspicious emails
+    response_cache = get_response_cache()
+    cached = response_cache.get(CATEGORIZE_PROMPT_TYPE, email_dict)
+    if cached is not None:
+        log_api_call(logger, "Gemini", True, cached=True)
+        metrics.record_api_call("Gemini", "categorize_email", True, True, 0.0)
+        return cached
 
-For SPAM emails: Look for unsubscribe email addresses in the message body (like "unsubscribe@company.com" or "optout@domain.com").
-
-Only return the JSON object, nothing else."""
+    # Construct structured prompt for Gemini
+    email_block = _EMAIL_BLOCK.format(**email_dict)
+    prompt = _CATEGORIZE_PROMPT.format(email_block=email_block)
 
     try:
         # Generate response from Gemini
         try:
-            response = client.models.generate_content(model=model_name, contents=prompt)
+            response = _generate_content(client, model_name, prompt, _json_config(_CATEGORIZATION_SCHEMA))
             elapsed = time.time() - start_time
 
             log_api_call(logger, "Gemini", True)
@@ -134,19 +313,14 @@ Only return the JSON object, nothing else."""
         if not response_text:
             raise GeminiAPIError("Empty response from Gemini (no text content)")
 
-        # Clean markdown code blocks from response
-        if response_text.startswith('```json'):
-            response_text = response_text[7:]
-        if response_text.startswith('```'):
-            response_text = response_text[3:]
-        if response_text.endswith('```'):
-            response_text = response_text[:-3]
-        response_text = response_text.strip()
+        # Structured output is bare JSON; strip a fence in case one still arrives
+        response_text = _strip_fence(response_text)
 
         # Parse JSON response
         try:
-            categorization = json.loads(response_text)
+            categorization = _json_loads(response_text)
             logger.debug(f"Successfully categorized email as: {categorization.get('category')}")
+            response_cache.set(CATEGORIZE_PROMPT_TYPE, email_dict, categorization)
 
             # Log to Gemini logger
             gemini_logger.log_interaction(
@@ -190,39 +364,174 @@ Only return the JSON object, nothing else."""
         # Return fallback categorization on error
         logger.warning("Returning fallback categorization due to error")
         print(f"⚠️  Error categorizing email: {e}")
-        return {
-            "category": "Unknown",
-            "subcategory": "None",
-            "summary": "Failed to categorize",
-            "action_item": "None",
-            "date_due": None
+        return dict(_FALLBACK_CATEGORIZATION)
+
+
+def categorize_email_batch(
+    emails: List[Dict[str, str]],
+    client: Any,
+    model_name: str
+) -> List[Optional[Dict[str, Any]]]:
+    """
+    Categorize several emails in a single Gemini request.
+
+    The emails are numbered in one prompt that shares the classification
+    rules, and Gemini answers with one result per number.
+
+    Args:
+        emails: Email dictionaries (from, subject, snippet)
+        client: Initialized Gemini client instance (google.genai.Client)
+        model_name: Name of the Gemini model to use
+
+    Returns:
+        list: Categorization per email, in input order (same keys as
+            categorize_email_with_gemini()); None for emails missing from the
+            response. If the request itself fails, every email gets the
+            fallback ("Unknown") categorization instead, so callers don't
+            retry them one by one right after an outage or rate limit
+    """
+    logger.debug(f"Categorizing batch of {len(emails)} emails")
+    start_time = time.time()
+    metrics = get_metrics_tracker()
+    results: List[Optional[Dict[str, Any]]] = [None] * len(emails)
+
+    email_blocks = "\n\n".join(
+        _BATCH_EMAIL_BLOCK.format(index, **email) for index, email in enumerate(emails, 1)
+    )
+    prompt = _CATEGORIZE_BATCH_PROMPT.format(count=len(emails), email_blocks=email_blocks)
+
+    try:
+        response = _generate_content(client, model_name, prompt, _json_config(_CATEGORIZATION_BATCH_SCHEMA))
+        elapsed = time.time() - start_time
+        log_api_call(logger, "Gemini", True)
+        metrics.record_api_call("Gemini", "categorize_email_batch", True, False, elapsed)
+    except Exception as e:
+        elapsed = time.time() - start_time
+        logger.error(f"Gemini batch categorization failed for {len(emails)} emails: {e}")
+        log_api_call(logger, "Gemini", False)
+        metrics.record_api_call("Gemini", "categorize_email_batch", False, False, elapsed)
+        metrics.record_error(__name__, type(e).__name__, f"Gemini batch categorization failed: {e}", traceback.format_exc())
+        print(f"⚠️  Error categorizing {len(emails)} emails: {e}")
+        return [dict(_FALLBACK_CATEGORIZATION) for _ in emails]
+
+    response_text = _strip_fence(_safe_extract_text(response).strip())
+    try:
+        parsed = _json_loads(response_text)
+    except json.JSONDecodeError as e:
+        logger.error(f"Invalid JSON in batch categorization: {e}\nResponse text: {response_text[:200]}")
+        metrics.record_error(__name__, "JSONDecodeError", f"Invalid JSON response from Gemini: {e}")
+        parsed = None
+
+    entries = parsed.get('results') if isinstance(parsed, dict) else parsed
+    for entry in entries if isinstance(entries, list) else ():
+        if not isinstance(entry, dict):
+            continue
+        index = entry.pop('index', None)
+        # Map results back by their email number; ignore unknown or duplicate numbers
+        if isinstance(index, int) and 1 <= index <= len(emails) and results[index - 1] is None and 'category' in entry:
+            results[index - 1] = entry
+
+    response_cache = get_response_cache()
+    for email, categorization in zip(emails, results):
+        if categorization is not None:
+            response_cache.set(CATEGORIZE_PROMPT_TYPE, email, categorization)
+
+    missing = results.count(None)
+    if missing:
+        logger.warning(f"Batch categorization returned no result for {missing}/{len(emails)} emails")
+
+    gemini_logger.log_interaction(
+        operation="categorize_email_batch",
+        prompt=prompt,
+        response=response_text,
+        metadata={
+            "model_name": model_name,
+            "latency_seconds": f"{elapsed:.3f}",
+            "batch_size": len(emails),
+            "missing_results": missing
         }
+    )
+
+    return results
+
+
+def _get_limiter(requests_per_minute: int) -> TokenBucket:
+    """Get the shared token bucket for a request rate: bursts a minute's budget, then paces."""
+    with _limiters_lock:
+        limiter = _limiters.get(requests_per_minute)
+        if limiter is None:
+            limiter = TokenBucket(rate=requests_per_minute / 60, capacity=requests_per_minute)
+            _limiters[requests_per_minute] = limiter
+        return limiter
+
+
+def _categorize_paced(email: Dict[str, str], client: Any, model_name: str, limiter: TokenBucket) -> tuple:
+    """Wait for a rate-limit token, then categorize one email; returns (categorization, seconds)."""
+    limiter.acquire()
+    email_start_time = time.time()
+    categorization = categorize_email_with_gemini(email, client, model_name)
+    return categorization, time.time() - email_start_time
+
+
+def _categorize_batch_paced(
+    emails: List[Dict[str, str]],
+    client: Any,
+    model_name: str,
+    limiter: TokenBucket
+) -> List[tuple]:
+    """
+    Categorize a batch in one paced request, falling back to single-email
+    requests for emails a successful batch response left out.
+
+    Returns:
+        list: (categorization, seconds) per email, in input order
+    """
+    if len(emails) == 1:
+        return [_categorize_paced(emails[0], client, model_name, limiter)]
+
+    limiter.acquire()
+    batch_start_time = time.time()
+    categorizations = categorize_email_batch(emails, client, model_name)
+    # The round-trip is shared, so each email is charged an equal part of it
+    per_email_elapsed = (time.time() - batch_start_time) / len(emails)
+
+    return [
+        (categorization, per_email_elapsed) if categorization is not None
+        else _categorize_paced(email, client, model_name, limiter)
+        for email, categorization in zip(emails, categorizations)
+    ]
 
 
 def categorize_emails(
     email_list: List[Dict[str, str]],
     client: Any,
     model_name: str,
-    requests_per_minute: int = 30
+    requests_per_minute: int = 30,
+    batch_size: int = CATEGORIZATION_BATCH_SIZE
 ) -> List[Dict[str, Any]]:
     """
     Categorize multiple emails with rate limiting.
 
-    Processes each email through Gemini AI categorization while respecting
-    API rate limits to avoid quota errors.
+    Emails already categorized by an earlier run (same sender, subject and
+    snippet) come from the response cache. The rest are sent batch_size at
+    a time in one request (see categorize_email_batch()); any email a batch
+    response leaves out is retried on its own. Batches run concurrently on worker threads (up to
+    MAX_CONCURRENT_CATEGORIZATIONS at once), each request first taking a
+    token from a bucket shared by all callers at the same rate.
 
     Args:
         email_list: List of email dictionaries from fetch_recent_emails()
         client: Initialized Gemini client instance (google.genai.Client)
         model_name: Name of the Gemini model to use
         requests_per_minute: API rate limit (default: 30 for gemini-3-flash-preview)
+        batch_size: Emails per Gemini request (default: CATEGORIZATION_BATCH_SIZE)
 
     Returns:
         list: Categorized emails with added fields (category, subcategory, etc.)
 
     Note:
-        Automatically adds delays between requests based on rate limit.
-        Displays progress and categorization results to console.
+        Requests beyond a minute's budget wait for the rate limit.
+        Displays progress and categorization results to console, in list order.
     """
     logger.info(f"Starting categorization of {len(email_list)} emails")
     start_time = time.time()
@@ -236,66 +545,89 @@ def categorize_emails(
     successful_count = 0
     failed_count = 0
 
-    # Calculate delay to stay within rate limit
-    delay_between_requests = 1  # Conservative delay between requests
+    limiter = _get_limiter(requests_per_minute)
+    batch_size = max(1, batch_size)
 
     try:
-        for idx, email in enumerate(email_list, 1):
-            print(f"Processing Email #{idx}/{len(email_list)}...")
-            email_start_time = time.time()
-
-            try:
-                # Get categorization from Gemini
-                categorization = categorize_email_with_gemini(email, client, model_name)
-
-                # Merge original email data with categorization
-                categorized_email = {
-                    **email,  # Original email fields
-                    **categorization  # Add categorization fields
-                }
-
-                categorized_emails.append(categorized_email)
-
-                # Track processing time
-                email_elapsed = time.time() - email_start_time
-                metrics.record_email_processing(
-                    email.get('id', 'unknown'),
-                    categorization.get('category', 'Unknown'),
-                    email_elapsed
+        # Cache hits become completed futures so every email is collected the same way
+        response_cache = get_response_cache()
+        hits = {}
+        misses = []
+        for idx, email in enumerate(email_list):
+            cached = response_cache.get(CATEGORIZE_PROMPT_TYPE, email)
+            if cached is None:
+                misses.append(idx)
+                continue
+            log_api_call(logger, "Gemini", True, cached=True)
+            metrics.record_api_call("Gemini", "categorize_email", True, True, 0.0)
+            hits[idx] = Future()
+            hits[idx].set_result([(cached, 0.0)])
+        if hits:
+            logger.info(f"Using cached categorizations for {len(hits)}/{len(email_list)} emails")
+
+        batches = [misses[start:start + batch_size] for start in range(0, len(misses), batch_size)]
+
+        with ThreadPoolExecutor(max_workers=max(1, min(len(batches), MAX_CONCURRENT_CATEGORIZATIONS))) as executor:
+            # List index -> (its batch's future, position in the batch)
+            jobs = {idx: (future, 0) for idx, future in hits.items()}
+            for batch in batches:
+                future = executor.submit(
+                    _categorize_batch_paced, [email_list[idx] for idx in batch], client, model_name, limiter
                 )
-
-                # Display categorization result
-                print(f"  Subject: {email['subject'][:50]}...")
-                print(f"  Category: {categorization['category']}")
-                print(f"  Subcategory: {categorization['subcategory']}")
-                print(f"  Action: {categorization['action_item']}")
-                print(f"  Summary: {categorization['summary'][:80]}...")
-                print("-" * 80)
-
-                if categorization['category'] != 'Unknown':
-                    successful_count += 1
-                else:
+                for position, idx in enumerate(batch):
+                    jobs[idx] = (future, position)
+
+            # Collect in list order while later requests are still in flight
+            for idx, email in enumerate(email_list, 1):
+                future, position = jobs[idx - 1]
+                print(f"Processing Email #{idx}/{len(email_list)}...")
+
+                try:
+                    # Get categorization from Gemini
+                    categorization, email_elapsed = future.result()[position]
+
+                    # Merge original email data with categorization
+                    categorized_email = {
+                        **email,  # Original email fields
+                        **categorization  # Add categorization fields
+                    }
+
+                    categorized_emails.append(categorized_email)
+
+                    # Track processing time
+                    metrics.record_email_processing(
+                        email.get('id', 'unknown'),
+                        categorization.get('category', 'Unknown'),
+                        email_elapsed
+                    )
+
+                    # Display categorization result
+                    print(f"  Subject: {email['subject'][:50]}...")
+                    print(f"  Category: {categorization['category']}")
+                    print(f"  Subcategory: {categorization['subcategory']}")
+                    print(f"  Action: {categorization['action_item']}")
+                    print(f"  Summary: {categorization['summary'][:80]}...")
+                    print("-" * 80)
+
+                    if categorization['category'] != 'Unknown':
+                        successful_count += 1
+                    else:
+                        failed_count += 1
+
+                except Exception as e:
+                    logger.error(f"Failed to process email #{idx}: {e}")
+                    metrics.record_error(__name__, type(e).__name__, f"Failed to process email: {e}")
                     failed_count += 1
 
-            except Exception as e:
-                logger.error(f"Failed to process email #{idx}: {e}")
-                metrics.record_error(__name__, type(e).__name__, f"Failed to process email: {e}")
-                failed_count += 1
-
-                # Add email with fallback categorization
-                categorized_emails.append({
-                    **email,
-                    "category": "Unknown",
-                    "subcategory": "None",
-                    "summary": "Processing failed",
-                    "action_item": "None",
-                    "date_due": None
-                })
-
-            # Rate limiting: Wait between requests
-            if idx < len(email_list):  # Skip wait after last email
-                print(f"  ⏳ Waiting {delay_between_requests:.0f} seconds to respect rate limits...")
-                time.sleep(delay_between_requests)
+                    # Add email with fallback categorization
+                    categorized_emails.append({
+                        **email,
+                        "category": "Unknown",
+                        "subcategory": "None",
+                        "summary": "Processing failed",
+                        "action_item": "None",
+                        "date_due": None
+                    })
 
         elapsed = time.time() - start_time
         log_performance(logger, f"Categorize {len(email_list)} emails", elapsed)
@@ -345,31 +677,12 @@ def generate_newsletter_summary(
     # Truncate email body to avoid token limits
     truncated_body = email_body[:max_chars] if len(email_body) > max_chars else email_body
 
-    prompt = f"""Analyze the following newsletter email and create a concise 3-bullet point summary.
-
-Subject: {subject}
-
-Email Content:
-{truncated_body}
-
-Respond ONLY with a JSON object containing exactly 3 bullet points:
-{{
-  "bullet1": "<first key point>",
-  "bullet2": "<second key point>",
-  "bullet3": "<third key point>"
-}}
-
-Each bullet point should be:
-- One clear, informative sentence
-- Capture the main topics or insights
-- Be specific and actionable when possible
-
-Only return the JSON object, nothing else."""
+    prompt = _NEWSLETTER_SUMMARY_PROMPT.format(subject=subject, body=truncated_body)
 
     try:
         # Generate response from Gemini
         try:
-            response = client.models.generate_content(model=model_name, contents=prompt)
+            response = _generate_content(client, model_name, prompt, _json_config(_NEWSLETTER_SUMMARY_SCHEMA))
             elapsed = time.time() - start_time
 
             log_api_call(logger, "Gemini", True)
@@ -388,18 +701,12 @@ Only return the JSON object, nothing else."""
         if not response_text:
             raise GeminiAPIError("Empty response from Gemini (no text content)")
 
-        # Clean markdown code blocks
-        if response_text.startswith('```json'):
-            response_text = response_text[7:]
-        if response_text.startswith('```'):
-            response_text = response_text[3:]
-        if response_text.endswith('```'):
-            response_text = response_text[:-3]
-        response_text = response_text.strip()
+        # Structured output is bare JSON; strip a fence in case one still arrives
+        response_text = _strip_fence(response_text)
 
         # Parse and extract bullet points
         try:
-            summary = json.loads(response_text)
+            summary = _json_loads(response_text)
             bullet_points = [
                 summary.get('bullet1', ''),
                 summary.get('bullet2', ''),
@@ -501,27 +808,12 @@ def generate_category_summary(
     # Limit to max_emails to avoid token limits
     combined_text = "\n".join(email_summaries[:max_emails])
 
-    prompt = f"""Analyze the following {category_name} emails and create a consolidated bullet point summary.
-
-Emails:
-{combined_text}
-
-Respond ONLY with a JSON object containing bullet points (up to 5 key points):
-{{
-  "summary_points": ["<point 1>", "<point 2>", "<point 3>", ...]
-}}
-
-Each bullet point should:
-- Highlight the most important or urgent items
-- Group similar items together when applicable
-- Be clear and actionable
-
-Only return the JSON object, nothing else."""
+    prompt = _CATEGORY_SUMMARY_PROMPT.format(category_name=category_name, emails=combined_text)
 
     try:
         # Generate response from Gemini
         try:
-            response = client.models.generate_content(model=model_name, contents=prompt)
+            response = _generate_content(client, model_name, prompt, _json_config(_CATEGORY_SUMMARY_SCHEMA))
             elapsed = time.time() - start_time
 
             log_api_call(logger, "Gemini", True)
@@ -540,18 +832,12 @@ Only return the JSON object, nothing else."""
         if not response_text:
             raise GeminiAPIError("Empty response from Gemini (no text content)")
 
-        # Clean markdown code blocks
-        if response_text.startswith('```json'):
-            response_text = response_text[7:]
-        if response_text.startswith('```'):
-            response_text = response_text[3:]
-        if response_text.endswith('```'):
-            response_text = response_text[:-3]
-        response_text = response_text.strip()
+        # Structured output is bare JSON; strip a fence in case one still arrives
+        response_text = _strip_fence(response_text)
 
         # Parse summary points
         try:
-            summary = json.loads(response_text)
+            summary = _json_loads(response_text)
             summary_points = summary.get('summary_points', [])
             logger.debug(f"Successfully generated category summary with {len(summary_points)} points")
 
@@ -3,15 +3,72 @@ Logging Utility Module
 Provides centralized logging configuration for the Email Assistant application.
 """
 
+import atexit
+import functools
 import logging
+import logging.handlers
 import os
+import queue
+import threading
 from datetime import datetime
 from pathlib import Path
-
-
+from typing import Optional
+
+# Log directory at the project root, created on first logger setup
+LOG_DIR = Path(__file__).parent.parent.parent / 'logs'
+
+# Every logger enqueues records here; one background listener owns the real
+# file and console handlers so callers never block on disk writes
+_log_queue: queue.Queue = queue.Queue(-1)
+_listener: Optional[logging.handlers.QueueListener] = None
+_listener_lock = threading.Lock()
+
+
+def _start_listener(log_dir: Path) -> None:
+    """Start the shared QueueListener writing to the log file and console, once per process."""
+    global _listener
+    with _listener_lock:
+        if _listener is not None:
+            return
+
+        # Create formatters
+        detailed_formatter = logging.Formatter(
+            '%(asctime)s - %(name)s - %(levelname)s - %(funcName)s:%(lineno)d - %(message)s',
+            datefmt='%Y-%m-%d %H:%M:%S'
+        )
+
+        console_formatter = logging.Formatter(
+            '%(levelname)s - %(message)s'
+        )
+
+        # File handler (detailed logs)
+        log_file = log_dir / 'email_assistant.log'
+        file_handler = logging.FileHandler(log_file, encoding='utf-8')
+        file_handler.setLevel(logging.DEBUG)  # Capture all levels in file
+        file_handler.setFormatter(detailed_formatter)
+
+        # Console handler; each logger's own level decides what reaches it
+        console_handler = logging.StreamHandler()
+        console_handler.setLevel(logging.DEBUG)
+        console_handler.setFormatter(console_formatter)
+
+        _listener = logging.handlers.QueueListener(
+            _log_queue, file_handler, console_handler, respect_handler_level=True
+        )
+        _listener.start()
+        # stop() drains the queue so records logged just before exit are written
+        atexit.register(_listener.stop)
+
+
+@functools.lru_cache(maxsize=None)
 def setup_logger(name: str, log_level: str = 'INFO') -> logging.Logger:
     """
-    Set up and configure a logger with file and console handlers.
+    Set up and configure a logger that hands records to the shared file and console handlers.
+
+    The logger only gets a QueueHandler; a background QueueListener writes
+    the records, so logging calls on hot paths don't wait on the disk.
+    Results are cached per (name, log_level), so repeat calls from module
+    imports return the configured logger without redoing any setup.
 
     Args:
         name: Logger name (typically __name__ of the calling module)
@@ -21,8 +78,8 @@ def setup_logger(name: str, log_level: str = 'INFO') -> logging.Logger:
         logging.Logger: Configured logger instance
     """
     # Create logs directory if it doesn't exist
-    log_dir = Path(__file__).parent.parent.parent / 'logs'
-    log_dir.mkdir(exist_ok=True)
+    if not LOG_DIR.exists():
+        LOG_DIR.mkdir(exist_ok=True)
 
     # Create logger
     logger = logging.getLogger(name)
@@ -32,30 +89,10 @@ def setup_logger(name: str, log_level: str = 'INFO') -> logging.Logger:
     if logger.handlers:
         return logger
 
-    # Create formatters
-    detailed_formatter = logging.Formatter(
-        '%(asctime)s - %(name)s - %(levelname)s - %(funcName)s:%(lineno)d - %(message)s',
-        datefmt='%Y-%m-%d %H:%M:%S'
-    )
-
-    console_formatter = logging.Formatter(
-        '%(levelname)s - %(message)s'
-    )
-
-    # File handler (detailed logs)
-    log_file = log_dir / 'email_assistant.log'
-    file_handler = logging.FileHandler(log_file, encoding='utf-8')
-    file_handler.setLevel(logging.DEBUG)  # Capture all levels in file
-    file_handler.setFormatter(detailed_formatter)
-
-    # Console handler (INFO and above)
-    console_handler = logging.StreamHandler()
-    console_handler.setLevel(getattr(logging, log_level.upper()))
-    console_handler.setFormatter(console_formatter)
-
-    # Add handlers to logger
-    logger.addHandler(file_handler)
-    logger.addHandler(console_handler)
+    _start_listener(LOG_DIR)
+
+    # Only enqueue here; the listener thread does the formatting and I/O
+    logger.addHandler(logging.handlers.QueueHandler(_log_queue))
 
     return logger
 
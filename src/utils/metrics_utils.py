@@ -8,7 +8,7 @@ import sqlite3
 import json
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Callable, Iterable, Tuple, Union
 import threading
 
 # Thread-safe database connection
@@ -18,12 +18,13 @@ _db_lock = threading.Lock()
 class MetricsTracker:
     """Tracks and stores observability metrics in SQLite database."""
 
-    def __init__(self, db_path: Optional[str] = None):
+    def __init__(self, db_path: Optional[str] = None, store_stack_traces: bool = True):
         """
         Initialize metrics tracker.
 
         Args:
             db_path: Path to SQLite database file. If None, uses default location.
+            store_stack_traces: Whether record_error() persists stack traces
         """
         if db_path is None:
             db_dir = Path(__file__).parent.parent.parent / 'data' / 'metrics'
@@ -31,6 +32,7 @@ class MetricsTracker:
             db_path = db_dir / 'metrics.db'
 
         self.db_path = str(db_path)
+        self.store_stack_traces = store_stack_traces
         self._initialize_database()
 
     def _get_connection(self) -> sqlite3.Connection:
@@ -158,6 +160,28 @@ class MetricsTracker:
             finally:
                 conn.close()
 
+    def record_api_calls(self, calls: Iterable[Tuple[str, str, bool, bool, float]]):
+        """
+        Record several API calls in one transaction.
+
+        Args:
+            calls: (api_name, operation, success, cached, response_time) tuples
+        """
+        calls = list(calls)
+        if not calls:
+            return
+
+        with _db_lock:
+            conn = self._get_connection()
+            try:
+                conn.executemany('''
+                    INSERT INTO api_calls (api_name, operation, success, cached, response_time)
+                    VALUES (?, ?, ?, ?, ?)
+                ''', calls)
+                conn.commit()
+            finally:
+                conn.close()
+
     def record_cache_operation(self, operation: str, key_type: str, hit: bool = None):
         """Record cache operation metrics."""
         with _db_lock:
@@ -172,8 +196,24 @@ class MetricsTracker:
             finally:
                 conn.close()
 
-    def record_error(self, module: str, error_type: str, error_message: str, stack_trace: str = None):
-        """Record error information."""
+    def record_error(
+        self,
+        module: str,
+        error_type: str,
+        error_message: str,
+        stack_trace: Union[str, Callable[[], str], None] = None
+    ):
+        """
+        Record error information.
+
+        stack_trace may be a string or a zero-argument callable (e.g.
+        traceback.format_exc) that is only invoked when traces are stored.
+        """
+        if not self.store_stack_traces:
+            stack_trace = None
+        elif callable(stack_trace):
+            stack_trace = stack_trace()
+
         with _db_lock:
             conn = self._get_connection()
             try:
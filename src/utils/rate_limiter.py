@@ -0,0 +1,101 @@
+"""
+API Rate Limiting
+Token-bucket pacing shared across threads, plus exponential backoff for
+rate-limited (HTTP 429) API calls.
+"""
+
+import functools
+import random
+import threading
+import time
+from typing import Any, Callable, TypeVar
+
+from .logger_utils import setup_logger
+
+# Initialize logger
+logger = setup_logger(__name__)
+
+F = TypeVar('F', bound=Callable[..., Any])
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket: bursts up to capacity, then rate tokens per second.
+
+    acquire() returns immediately while tokens remain and otherwise sleeps only
+    until the next token is due, instead of a fixed delay after every request.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        """
+        Initialize the bucket full.
+
+        Args:
+            rate: Tokens added per second (e.g. 10 / 60 for 10 requests per minute)
+            capacity: Maximum tokens held, i.e. the largest burst allowed
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """
+        Take one token, sleeping until it is available.
+
+        Returns:
+            float: Seconds spent waiting
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            # Reserve the token now (the balance may go negative) so concurrent
+            # callers queue up behind each other instead of waking together
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+
+def is_rate_limit_error(error: BaseException) -> bool:
+    """Check whether an API exception reports HTTP 429 / quota exhaustion."""
+    if getattr(error, 'code', None) == 429 or getattr(error, 'status_code', None) == 429:
+        return True
+    message = str(error)
+    return '429' in message or 'RESOURCE_EXHAUSTED' in message
+
+
+def retry_on_rate_limit(max_attempts: int = 3, base: float = 2.0, jitter: bool = True) -> Callable[[F], F]:
+    """
+    Retry a call that fails with a rate-limit error, backing off exponentially.
+
+    Other exceptions, and the last rate-limit error, are re-raised unchanged.
+
+    Args:
+        max_attempts: Total attempts including the first call
+        base: Backoff base in seconds; attempt n waits base ** n
+        jitter: Randomize each wait to 50-100% so retries don't synchronize
+    """
+    def decorator(func: F) -> F:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            for attempt in range(1, max_attempts + 1):
+                try:
+                    return func(*args, **kwargs)
+                except Exception as e:
+                    if attempt == max_attempts or not is_rate_limit_error(e):
+                        raise
+                    delay = base ** attempt
+                    if jitter:
+                        delay *= random.uniform(0.5, 1.0)
+                    logger.warning(
+                        "Rate limited in %s (attempt %d/%d), retrying in %.1fs",
+                        func.__name__, attempt, max_attempts, delay
+                    )
+                    time.sleep(delay)
+        return wrapper
+    return decorator
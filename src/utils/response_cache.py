@@ -0,0 +1,211 @@
+"""
+Gemini Response Cache
+Persists parsed Gemini responses keyed by a hash of the email content so that
+recurring emails (same sender, subject and body template) skip the API call.
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+from .logger_utils import setup_logger
+
+# Initialize logger
+logger = setup_logger(__name__)
+
+# Thread-safe database access
+_db_lock = threading.Lock()
+
+# Time-to-live per prompt type (seconds); unknown types use DEFAULT_TTL_SECONDS
+DAY_SECONDS = 24 * 60 * 60
+TTL_SECONDS = {
+    'categorize': 7 * DAY_SECONDS,
+    'spam': 30 * DAY_SECONDS,
+    'autopay': 7 * DAY_SECONDS,
+    'event': 1 * DAY_SECONDS,
+}
+DEFAULT_TTL_SECONDS = 1 * DAY_SECONDS
+
+# Only the start of the snippet is hashed; templated emails differ mostly at the end
+SNIPPET_KEY_CHARS = 512
+
+# Part of every key; bump when prompt templates change so stale responses are not reused
+PROMPT_VERSION = 1
+
+
+def content_key(prompt_type: str, email: Dict[str, Any]) -> str:
+    """
+    Build a stable cache key for an email and prompt type.
+
+    Args:
+        prompt_type: Prompt/task name (e.g. 'event', 'autopay', 'spam')
+        email: Email dictionary with from, subject and snippet
+
+    Returns:
+        str: 32-character hex digest
+    """
+    content = (
+        f"{PROMPT_VERSION}|{prompt_type}|{email.get('from') or ''}|{email.get('subject') or ''}|"
+        f"{(email.get('snippet') or '')[:SNIPPET_KEY_CHARS]}"
+    )
+    return hashlib.blake2b(content.encode('utf-8'), digest_size=16).hexdigest()
+
+
+def payload_key(prompt_type: str, payload: str) -> str:
+    """
+    Build a stable cache key for a prompt type and its full dynamic payload.
+
+    Used for multi-email prompts (context compression, summaries) where the
+    whole serialized email list determines the response.
+
+    Args:
+        prompt_type: Prompt name (e.g. 'compressed_context')
+        payload: Serialized per-call prompt input
+
+    Returns:
+        str: 32-character hex digest
+    """
+    content = f"{PROMPT_VERSION}|{prompt_type}|{payload}"
+    return hashlib.blake2b(content.encode('utf-8'), digest_size=16).hexdigest()
+
+
+class ResponseCache:
+    """SQLite-backed cache of parsed Gemini responses with per-type TTL."""
+
+    def __init__(self, db_path: Optional[str] = None):
+        """
+        Initialize response cache.
+
+        Args:
+            db_path: Path to SQLite database file. If None, uses default location.
+        """
+        if db_path is None:
+            db_dir = Path(__file__).parent.parent.parent / 'data' / 'cache'
+            db_dir.mkdir(parents=True, exist_ok=True)
+            db_path = db_dir / 'gemini_responses.db'
+
+        self.db_path = str(db_path)
+        self._initialize_database()
+
+    def _get_connection(self) -> sqlite3.Connection:
+        """Get a database connection."""
+        return sqlite3.connect(self.db_path)
+
+    def _initialize_database(self):
+        """Create the responses table and drop expired rows."""
+        with _db_lock:
+            conn = self._get_connection()
+            try:
+                conn.execute('''
+                    CREATE TABLE IF NOT EXISTS responses (
+                        key TEXT PRIMARY KEY,
+                        prompt_type TEXT NOT NULL,
+                        response TEXT NOT NULL,
+                        expires_at REAL NOT NULL
+                    )
+                ''')
+                conn.execute('DELETE FROM responses WHERE expires_at <= ?', (time.time(),))
+                conn.commit()
+            finally:
+                conn.close()
+
+    def get(self, prompt_type: str, email: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached response.
+
+        Args:
+            prompt_type: Prompt/task name
+            email: Email dictionary
+
+        Returns:
+            dict: Cached parsed response, or None on miss/expiry/error
+        """
+        return self.get_key(content_key(prompt_type, email), prompt_type)
+
+    def get_key(self, key: str, prompt_type: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached response by precomputed key.
+
+        Args:
+            key: Key from content_key() or payload_key()
+            prompt_type: Prompt name (for logging)
+
+        Returns:
+            dict: Cached parsed response, or None on miss/expiry/error
+        """
+        try:
+            with _db_lock:
+                conn = self._get_connection()
+                try:
+                    row = conn.execute(
+                        'SELECT response FROM responses WHERE key = ? AND expires_at > ?',
+                        (key, time.time())
+                    ).fetchone()
+                finally:
+                    conn.close()
+
+            return json.loads(row[0]) if row else None
+
+        except Exception as e:
+            logger.warning(f"Response cache lookup failed for {prompt_type}: {e}")
+            return None
+
+    def set(self, prompt_type: str, email: Dict[str, Any], response: Dict[str, Any]) -> bool:
+        """
+        Store a parsed response.
+
+        Args:
+            prompt_type: Prompt/task name (selects the TTL)
+            email: Email dictionary
+            response: Parsed Gemini response
+
+        Returns:
+            bool: True if stored, False otherwise
+        """
+        return self.set_key(content_key(prompt_type, email), prompt_type, response)
+
+    def set_key(self, key: str, prompt_type: str, response: Dict[str, Any]) -> bool:
+        """
+        Store a parsed response under a precomputed key.
+
+        Args:
+            key: Key from content_key() or payload_key()
+            prompt_type: Prompt name (selects the TTL)
+            response: Parsed Gemini response
+
+        Returns:
+            bool: True if stored, False otherwise
+        """
+        expires_at = time.time() + TTL_SECONDS.get(prompt_type, DEFAULT_TTL_SECONDS)
+        try:
+            with _db_lock:
+                conn = self._get_connection()
+                try:
+                    conn.execute(
+                        'INSERT OR REPLACE INTO responses (key, prompt_type, response, expires_at) VALUES (?, ?, ?, ?)',
+                        (key, prompt_type, json.dumps(response), expires_at)
+                    )
+                    conn.commit()
+                finally:
+                    conn.close()
+            return True
+
+        except Exception as e:
+            logger.warning(f"Response cache store failed for {prompt_type}: {e}")
+            return False
+
+
+# Global response cache instance
+_response_cache = None
+
+
+def get_response_cache() -> ResponseCache:
+    """Get or create the global response cache instance."""
+    global _response_cache
+    if _response_cache is None:
+        _response_cache = ResponseCache()
+    return _response_cache
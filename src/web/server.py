@@ -17,12 +17,12 @@ from flask import Flask, render_template, jsonify, request
 from google.auth.transport.requests import Request
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
-from googleapiclient.discovery import build
 
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from utils.logger_utils import setup_logger, log_exception
+from utils.email_utils import build_google_service, forget_email_body
 from utils.metrics_utils import get_metrics_tracker
 from core.context_memory import ContextMemoryManager
 
@@ -102,10 +102,10 @@ def init_google_services():
             except Exception as e:
                 logger.warning(f"Failed to save token.json: {e}")
 
-        # Build service instances
-        gmail_service = build('gmail', 'v1', credentials=creds)
-        calendar_service = build('calendar', 'v3', credentials=creds)
-        tasks_service = build('tasks', 'v1', credentials=creds)
+        # Build service instances (each keeps its own keep-alive connection)
+        gmail_service = build_google_service('gmail', 'v1', creds)
+        calendar_service = build_google_service('calendar', 'v3', creds)
+        tasks_service = build_google_service('tasks', 'v1', creds)
 
         logger.info("Google services initialized successfully")
 
@@ -652,10 +652,10 @@ def get_gemini_review():
     metrics = get_metrics_tracker()
 
     try:
-        import google.genai as genai
         from core.config_manager import ConfigManager
         from utils.email_utils import connect_to_gmail, fetch_recent_emails
         from utils.gemini_utils import categorize_emails
+        from utils.gemini_transport import get_client
         from utils.automation_workflow import process_need_action_automations, process_spam_automations
 
         # Load configuration
@@ -696,7 +696,7 @@ def get_gemini_review():
         logger.info(f"Fetched {len(emails)} emails, categorizing with Gemini")
 
         # Initialize Gemini client
-        gemini_client = genai.Client(api_key=api_key)
+        gemini_client = get_client(api_key)
 
         # Categorize all emails
         categorized_emails = categorize_emails(emails, gemini_client, model_name)
@@ -794,6 +794,7 @@ def delete_email():
         # Delete email from Gmail
         api_call = f"gmail_service.users().messages().trash(userId='me', id='{email_id}')"
         gmail_service.users().messages().trash(userId='me', id=email_id).execute()
+        forget_email_body(email_id)
 
         elapsed = time.time() - start_time
 
@@ -10,6 +10,7 @@ This file contains:
 
 import json
 import os
+import re
 import sys
 import tempfile
 from pathlib import Path
@@ -23,6 +24,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
 
 from core.cache_manager import CacheManager
 from core.config_manager import ConfigManager
+from utils import response_cache
 
 
 # ==============================================================================
@@ -43,6 +45,22 @@ def temp_cache_dir(tmp_path):
     return cache_dir
 
 
+@pytest.fixture(autouse=True)
+def isolated_response_cache(tmp_path, monkeypatch):
+    """
+    Give every test a fresh Gemini response cache under tmp_path.
+
+    Replaces the global instance behind get_response_cache(), so no module's
+    results leak between tests or into data/cache.
+
+    Returns:
+        ResponseCache: The cache used for this test
+    """
+    cache = response_cache.ResponseCache(db_path=str(tmp_path / 'responses.db'))
+    monkeypatch.setattr(response_cache, '_response_cache', cache)
+    return cache
+
+
 @pytest.fixture
 def temp_data_dir(tmp_path):
     """
@@ -119,11 +137,23 @@ def mock_gemini_client(mock_gemini_responses):
     """
     client = MagicMock()
 
-    # Mock the models.generate_content method (new google.genai API)
-    def generate_content_side_effect(model, contents):
+    # Mock the models.generate_content method (new google.genai API), answering
+    # with the fixture that matches the requested response schema
+    def generate_content_side_effect(model, contents, config=None):
         response = MagicMock()
-        # Return first mock categorization response
-        response.text = json.dumps(mock_gemini_responses['categorization_success'])
+        properties = ((config or {}).get('response_schema') or {}).get('properties', {})
+        categorization = mock_gemini_responses['categorization_success']
+        if 'summary_points' in properties:
+            result = mock_gemini_responses['category_summary_success']
+        elif 'bullet1' in properties:
+            result = mock_gemini_responses['newsletter_summary_success']
+        elif 'results' in properties:
+            email_count = len(re.findall(r'^Email \d+:$', contents, re.MULTILINE))
+            result = {'results': [{'index': i, **categorization} for i in range(1, email_count + 1)]}
+        else:
+            # Return first mock categorization response
+            result = categorization
+        response.text = json.dumps(result)
         return response
 
     client.models.generate_content.side_effect = generate_content_side_effect
@@ -188,8 +218,29 @@ def mock_gmail_service(sample_emails):
         }
         return result
 
+    # Mock batch HTTP requests: execute each added request and report it via the callback
+    def new_batch_side_effect(callback):
+        batch = MagicMock()
+        added = []
+        batch.add.side_effect = lambda request, request_id: added.append((request_id, request))
+
+        def execute(http=None):
+            for request_id, request in added:
+                try:
+                    callback(request_id, request.execute(), None)
+                except Exception as e:
+                    callback(request_id, None, e)
+
+        batch.execute.side_effect = execute
+        return batch
+
     service.users().messages().list.side_effect = list_side_effect
     service.users().messages().get.side_effect = get_side_effect
+    service.new_batch_http_request.side_effect = new_batch_side_effect
+
+    # Mock the mailbox history position and an empty history delta
+    service.users().getProfile.return_value.execute.return_value = {'historyId': '1'}
+    service.users().history().list.return_value.execute.return_value = {'historyId': '1'}
 
     return service
 
@@ -23,7 +23,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'src'))
 
 from core.cache_manager import CacheManager
 from utils.gemini_utils import categorize_emails
-from utils.display_utils import generate_daily_digest
+from utils.display_utils import Section, generate_daily_digest
 
 
 # ==============================================================================
@@ -93,9 +93,9 @@ def test_complete_email_processing_flow(
     )
 
     # Verify digest structure
-    assert 'need_action' in digest, "Digest should have need_action section"
-    assert 'fyi' in digest, "Digest should have fyi section"
-    assert 'newsletters' in digest, "Digest should have newsletters section"
+    assert isinstance(digest.need_action, Section), "Digest should have need_action section"
+    assert isinstance(digest.fyi, Section), "Digest should have fyi section"
+    assert isinstance(digest.newsletters, list), "Digest should have newsletters section"
 
     # Step 5: Save digest to JSON (simulate web data)
     digest_file = tmp_path / 'test_digest.json'
@@ -105,7 +105,7 @@ def test_complete_email_processing_flow(
             'execution_time': 1.5,
             'total_emails': len(categorized)
         },
-        'digest': digest,
+        'digest': digest.to_dict(),
         'categorized_emails': categorized
     }
 
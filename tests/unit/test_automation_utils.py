@@ -0,0 +1,342 @@
+"""
+Unit Tests for Automation Utils
+
+Tests Gemini-backed automation extraction with a mocked client:
+- Single-task extractors parse JSON responses
+- Batched analysis combines tasks into one Gemini call
+- Repeated email content is answered from the response cache
+- Failures degrade to None instead of raising
+- The service tier is opt-in and skipped on SDKs without service_tier
+- Calendar/Tasks/Gmail writes are pipelined through batch HTTP requests
+"""
+
+import json
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'src'))
+
+import utils.automation_utils as automation_utils
+import utils.gemini_transport as gemini_transport
+from utils.automation_utils import (
+    analyze_email_batched,
+    create_calendar_event,
+    create_tasks_batch,
+    extract_event_details,
+    send_unsubscribe_request,
+)
+
+
+def _mock_client(payload):
+    """Create a mock Gemini client that returns payload as JSON text."""
+    client = MagicMock()
+    client.models.generate_content.return_value.text = json.dumps(payload)
+    return client
+
+
+@pytest.fixture
+def bill_email():
+    """Need-Action bill email used across automation tests."""
+    return pytest.create_test_categorized_email(
+        email_id="bill_1",
+        category="Need-Action",
+        subcategory="Bill-Due",
+        subject="Your electricity bill is due",
+        snippet="Your bill of $120 is due on 2025-02-01. Meeting with advisor on 2025-01-20."
+    )
+
+
+# ==============================================================================
+# UNIT TEST: Single-task extraction
+# ==============================================================================
+
+@pytest.mark.unit
+@pytest.mark.basic
+def test_extract_event_details_parses_json(bill_email):
+    """
+    Test that extract_event_details() returns the parsed Gemini JSON.
+    """
+    client = _mock_client({'has_event': True, 'date': '2025-01-20', 'time': None,
+                           'title': 'Advisor meeting', 'description': None})
+
+    result = extract_event_details(bill_email, client, 'test-model')
+
+    assert result['has_event'] is True
+    assert result['date'] == '2025-01-20'
+    assert client.models.generate_content.call_count == 1
+
+
+@pytest.mark.unit
+@pytest.mark.extended
+def test_extract_event_details_requests_schema_and_strips_fence(bill_email):
+    """
+    Test that the task schema is sent and a stray code fence is tolerated.
+    """
+    client = MagicMock()
+    client.models.generate_content.return_value.text = '```json\n{"has_event": false}\n```'
+
+    assert extract_event_details(bill_email, client, 'test-model') == {'has_event': False}
+    config = client.models.generate_content.call_args.kwargs['config']
+    assert config['response_mime_type'] == 'application/json'
+    assert 'has_event' in config['response_schema']['properties']
+
+
+@pytest.mark.unit
+@pytest.mark.extended
+def test_service_tier_sent_unless_disabled(bill_email, monkeypatch):
+    """
+    Test that the configured Gemini service tier is sent, and omitted when empty.
+    """
+    client = _mock_client({'has_event': False})
+
+    monkeypatch.setattr(automation_utils, 'GEMINI_SERVICE_TIER', 'flex')
+    extract_event_details(bill_email, client, 'test-model')
+    assert client.models.generate_content.call_args.kwargs['config']['service_tier'] == 'flex'
+
+    monkeypatch.setattr(automation_utils, 'GEMINI_SERVICE_TIER', '')
+    extract_event_details(dict(bill_email, snippet='Meeting on 2025-03-01'), client, 'test-model')
+    assert 'service_tier' not in client.models.generate_content.call_args.kwargs['config']
+
+
+@pytest.mark.unit
+@pytest.mark.extended
+def test_service_tier_unset_by_default_and_dropped_when_unsupported(monkeypatch):
+    """
+    Test that GEMINI_TIER is unset by default and ignored if the SDK config lacks service_tier.
+    """
+    monkeypatch.delenv('GEMINI_TIER', raising=False)
+    assert gemini_transport.get_service_tier() is None
+
+    monkeypatch.setenv('GEMINI_TIER', 'flex')
+    monkeypatch.setattr(gemini_transport, 'types', SimpleNamespace(
+        GenerateContentConfig=SimpleNamespace(model_fields={'temperature': None})
+    ))
+    assert gemini_transport.get_service_tier() is None
+
+
+@pytest.mark.unit
+@pytest.mark.extended
+def test_extract_event_details_api_failure_returns_none(bill_email):
+    """
+    Test that an API error is swallowed and reported as None.
+    """
+    client = MagicMock()
+    client.models.generate_content.side_effect = RuntimeError("quota exceeded")
+
+    assert extract_event_details(bill_email, client, 'test-model') is None
+
+
+@pytest.mark.unit
+@pytest.mark.basic
+def test_repeated_email_served_from_response_cache(bill_email):
+    """
+    Test that identical email content skips the Gemini call.
+    """
+    client = _mock_client({'has_event': True, 'date': '2025-01-20'})
+
+    first = extract_event_details(bill_email, client, 'test-model')
+    second = extract_event_details(dict(bill_email, id='bill_2'), client, 'test-model')
+
+    assert first == second
+    assert client.models.generate_content.call_count == 1, "Second lookup should hit the cache"
+
+
+@pytest.mark.unit
+@pytest.mark.basic
+def test_prefilter_skips_gemini_without_keywords():
+    """
+    Test that emails without any task keywords never reach Gemini.
+
+    Verifies:
+    - No generate_content call is made
+    - Each task gets its negative result
+    """
+    email = pytest.create_test_categorized_email(
+        email_id="plain_1",
+        category="SPAM",
+        subject="Hello there",
+        snippet="Just checking in to say hi."
+    )
+    client = _mock_client({})
+
+    results = analyze_email_batched(email, client, 'test-model', tasks=['event', 'autopay', 'spam'])
+
+    client.models.generate_content.assert_not_called()
+    assert results['event']['has_event'] is False
+    assert results['autopay']['has_autopay'] is False
+    assert results['spam']['unsubscribe_email'] is None
+
+
+# ==============================================================================
+# UNIT TEST: Batched analysis
+# ==============================================================================
+
+@pytest.mark.unit
+@pytest.mark.basic
+def test_analyze_email_batched_single_call(bill_email):
+    """
+    Test that multiple tasks are answered by one Gemini call.
+
+    Verifies:
+    - Only one generate_content call is made
+    - The combined response is split per task
+    """
+    client = _mock_client({
+        'event': {'has_event': True, 'date': '2025-01-20'},
+        'autopay': {'has_autopay': False, 'due_date': '2025-02-01', 'amount': '$120'}
+    })
+
+    results = analyze_email_batched(bill_email, client, 'test-model', tasks=['event', 'autopay'])
+
+    assert client.models.generate_content.call_count == 1
+    assert results['event']['date'] == '2025-01-20'
+    assert results['autopay']['has_autopay'] is False
+
+
+@pytest.mark.unit
+@pytest.mark.extended
+def test_analyze_email_batched_missing_task_is_none(bill_email):
+    """
+    Test that a task missing from the combined response maps to None.
+    """
+    client = _mock_client({'event': {'has_event': False}})
+
+    results = analyze_email_batched(bill_email, client, 'test-model', tasks=['event', 'autopay'])
+
+    assert results['event'] == {'has_event': False}
+    assert results['autopay'] is None
+
+
+# ==============================================================================
+# UNIT TEST: Batched Google API writes
+# ==============================================================================
+
+def _mock_batch_service(failing_ids=()):
+    """Create a mock Google service whose batch requests invoke their callbacks."""
+    service = MagicMock()
+    added = []
+
+    def new_batch_http_request(callback):
+        batch = MagicMock()
+        batch.add.side_effect = lambda request, request_id: added.append(request_id)
+
+        def execute():
+            for request_id in added:
+                if request_id in failing_ids:
+                    callback(request_id, None, RuntimeError("backend error"))
+                else:
+                    callback(request_id, {'id': f"task_{request_id}"}, None)
+
+        batch.execute.side_effect = execute
+        return batch
+
+    service.new_batch_http_request.side_effect = new_batch_http_request
+    return service
+
+
+@pytest.mark.unit
+@pytest.mark.basic
+def test_create_tasks_batch_single_round_trip(bill_email):
+    """
+    Test that several tasks are submitted in one batch request.
+
+    Verifies:
+    - One batch is created and executed
+    - Per-item results follow the batch callbacks
+    """
+    service = _mock_batch_service(failing_ids=('1',))
+    items = [({'amount': '$120'}, bill_email), ({'due_date': '2025-02-01'}, bill_email)]
+
+    results = create_tasks_batch(service, items)
+
+    assert results == [True, False]
+    assert service.new_batch_http_request.call_count == 1
+    service.tasks.return_value.insert.return_value.execute.assert_not_called()
+
+
+@pytest.mark.unit
+@pytest.mark.extended
+def test_create_calendar_event_single_item(bill_email):
+    """
+    Test that the single-item wrapper executes directly without a batch.
+    """
+    service = MagicMock()
+    service.events.return_value.insert.return_value.execute.return_value = {'htmlLink': 'link'}
+
+    assert create_calendar_event(service, {'date': '2025-01-20', 'time': '10:00'}, bill_email) is True
+    service.new_batch_http_request.assert_not_called()
+    body = service.events.return_value.insert.call_args.kwargs['body']
+    assert body['end']['dateTime'] == '2025-01-20T11:00:00'
+
+    assert create_calendar_event(service, {'title': 'No date'}, bill_email) is False
+
+
+@pytest.mark.unit
+@pytest.mark.extended
+def test_create_tasks_batch_handles_missing_subject_and_sender():
+    """
+    Test that emails with None subject/from still produce a task.
+    """
+    service = MagicMock()
+    service.tasks.return_value.insert.return_value.execute.return_value = {'id': 't1'}
+    email = {'id': 'x', 'subject': None, 'from': None, 'snippet': None}
+
+    assert create_tasks_batch(service, [({'amount': None}, email)]) == [True]
+    body = service.tasks.return_value.insert.call_args.kwargs['body']
+    assert body['title'] == 'Bill Payment'
+    assert body['notes'].startswith('From: Unknown\nAmount: N/A')
+
+
+@pytest.mark.unit
+@pytest.mark.extended
+def test_create_calendar_event_all_day_and_seconds(bill_email):
+    """
+    Test all-day end dates and event times that already include seconds.
+    """
+    service = MagicMock()
+    service.events.return_value.insert.return_value.execute.return_value = {'htmlLink': 'link'}
+
+    assert create_calendar_event(service, {'date': '2025-01-31'}, bill_email) is True
+    body = service.events.return_value.insert.call_args.kwargs['body']
+    assert body['start']['date'] == '2025-01-31'
+    assert body['end']['date'] == '2025-02-01'
+    assert 'timeZone' not in body['start'], "All-day events are date-only"
+
+    assert create_calendar_event(service, {'date': '2025-01-20', 'time': '23:30:15'}, bill_email) is True
+    body = service.events.return_value.insert.call_args.kwargs['body']
+    assert body['start']['dateTime'] == '2025-01-20T23:30:15'
+    assert body['end']['dateTime'] == '2025-01-21T00:30:15'
+
+
+@pytest.mark.unit
+@pytest.mark.extended
+def test_send_unsubscribe_request_message_format():
+    """
+    Test the hand-built unsubscribe message and the header-injection guard.
+
+    Verifies:
+    - The raw message parses as a UTF-8 email with the expected headers/body
+    - Addresses containing line breaks are rejected without a send
+    """
+    import base64
+    from email import message_from_bytes
+
+    service = MagicMock()
+    service.users.return_value.messages.return_value.send.return_value.execute.return_value = {'id': 'm1'}
+    email = pytest.create_test_categorized_email(category="SPAM", subject="Café deals")
+
+    assert send_unsubscribe_request(service, {'unsubscribe_email': 'off@list.example'}, email) is True
+    raw = service.users.return_value.messages.return_value.send.call_args.kwargs['body']['raw']
+    message = message_from_bytes(base64.urlsafe_b64decode(raw))
+    assert message['To'] == 'off@list.example'
+    assert message['Subject'] == 'Unsubscribe Request'
+    assert 'Original Subject: Café deals' in message.get_payload(decode=True).decode('utf-8')
+
+    injected = {'unsubscribe_email': 'a@b.example\r\nBcc: victim@example.com'}
+    assert send_unsubscribe_request(service, injected, email) is False
+    assert service.users.return_value.messages.return_value.send.call_count == 1
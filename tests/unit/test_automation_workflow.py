@@ -0,0 +1,309 @@
+"""
+Unit Tests for Automation Workflow
+
+Tests automation candidate detection with a mocked Gemini client:
+- Need-Action emails produce calendar event and task candidates
+- SPAM emails produce unsubscribe candidates
+- Results keep the input email order when analyzed concurrently
+- A failing email is skipped without aborting the others
+- Batch Mode submits one JSONL job and demultiplexes results by key
+- The confirmation summary is written in a single stdout write
+- Confirmed actions are dispatched to all three Google APIs
+- Services with pending writes are warmed up during the confirmation prompt
+"""
+
+import json
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'src'))
+
+import utils.automation_workflow as automation_workflow
+from utils.automation_workflow import (
+    display_automation_summary,
+    execute_automations_with_confirmation,
+    process_need_action_automations,
+    process_spam_automations
+)
+
+
+def _response(payload):
+    """Create a mock Gemini response carrying payload as JSON text."""
+    response = MagicMock()
+    response.text = json.dumps(payload)
+    return response
+
+
+# ==============================================================================
+# UNIT TEST: Need-Action processing
+# ==============================================================================
+
+@pytest.mark.unit
+@pytest.mark.basic
+def test_process_need_action_automations_keeps_order():
+    """
+    Test that concurrent analysis returns candidates in email order.
+
+    Verifies:
+    - Every email with an event becomes a calendar candidate
+    - Candidates follow the input order
+    - Bill emails without autopay become task candidates
+    - Candidates carry a precomputed EmailView
+    """
+    emails = [
+        pytest.create_test_categorized_email(
+            email_id=f"meet_{i}",
+            category="Need-Action",
+            subject=f"Meeting {i}",
+            snippet=f"Team meeting on 2025-01-{10 + i:02d}"
+        )
+        for i in range(5)
+    ]
+    emails.append(pytest.create_test_categorized_email(
+        email_id="bill_1",
+        category="Need-Action",
+        subcategory="Bill-Due",
+        subject="Your bill is ready",
+        snippet="Payment of $50 due 2025-02-01"
+    ))
+
+    def generate_content(model, contents, config):
+        if '"autopay"' in contents:
+            return _response({
+                'event': {'has_event': False},
+                'autopay': {'has_autopay': False, 'due_date': '2025-02-01', 'amount': '$50'}
+            })
+        day = contents.split('2025-01-')[1][:2]
+        return _response({'has_event': True, 'date': f'2025-01-{day}', 'title': f'Meeting {day}'})
+
+    client = MagicMock()
+    client.models.generate_content.side_effect = generate_content
+
+    results = process_need_action_automations(emails, None, None, None, client, 'test-model')
+
+    assert [item['email']['id'] for item in results['calendar_events']] == [f"meet_{i}" for i in range(5)]
+    assert [item['email']['id'] for item in results['tasks']] == ["bill_1"]
+    assert results['tasks'][0]['view'].subject60 == "Your bill is ready"
+
+
+@pytest.mark.unit
+@pytest.mark.extended
+def test_process_need_action_automations_isolates_failures(monkeypatch):
+    """
+    Test that one failing email is recorded and skipped without dropping the rest.
+    """
+    emails = [
+        pytest.create_test_categorized_email(
+            email_id=f"meet_{i}",
+            category="Need-Action",
+            subject=f"Meeting {i}",
+            snippet=f"Team meeting on 2025-01-{10 + i:02d}"
+        )
+        for i in range(3)
+    ]
+
+    def analyze(email, client, model_name, tasks=None):
+        if email['id'] == 'meet_1':
+            raise ValueError("malformed email")
+        return {'event': {'has_event': True, 'date': '2025-01-10', 'title': email['subject']}}
+
+    metrics = MagicMock()
+    monkeypatch.setattr(automation_workflow, 'analyze_email_batched', analyze)
+    monkeypatch.setattr(automation_workflow, 'get_metrics_tracker', lambda: metrics)
+
+    results = process_need_action_automations(emails, None, None, None, MagicMock(), 'test-model')
+
+    assert [item['email']['id'] for item in results['calendar_events']] == ["meet_0", "meet_2"]
+    assert metrics.record_error.call_count == 1
+
+
+# ==============================================================================
+# UNIT TEST: SPAM processing
+# ==============================================================================
+
+@pytest.mark.unit
+@pytest.mark.basic
+def test_process_spam_automations_finds_candidates():
+    """
+    Test that confident SPAM verdicts with an unsubscribe option are returned.
+    """
+    emails = [
+        pytest.create_test_categorized_email(
+            email_id="spam_1",
+            category="SPAM",
+            subject="Huge sale",
+            snippet="Click here to unsubscribe"
+        ),
+        pytest.create_test_categorized_email(
+            email_id="spam_2",
+            category="SPAM",
+            subject="Weekly promo",
+            snippet="Manage preferences or unsubscribe below"
+        )
+    ]
+
+    def generate_content(model, contents, config):
+        confidence = 'high' if 'Huge sale' in contents else 'low'
+        return _response({'is_spam': True, 'confidence': confidence,
+                          'unsubscribe_link': None, 'unsubscribe_email': 'off@list.example',
+                          'reason': 'promo'})
+
+    client = MagicMock()
+    client.models.generate_content.side_effect = generate_content
+
+    candidates = process_spam_automations(emails, None, client, 'test-model')
+
+    assert [item['email']['id'] for item in candidates] == ["spam_1"]
+
+
+# ==============================================================================
+# UNIT TEST: Gemini Batch Mode
+# ==============================================================================
+
+@pytest.mark.unit
+@pytest.mark.extended
+def test_process_spam_automations_batch_mode():
+    """
+    Test that batch=True submits one JSONL job and maps results back per email.
+
+    Verifies:
+    - One file upload and one batch job, no synchronous calls
+    - Results are matched to emails by "<task>::<id>" key
+    """
+    emails = [
+        pytest.create_test_categorized_email(
+            email_id=f"spam_{i}",
+            category="SPAM",
+            subject=f"Promo {i}",
+            snippet="Click to unsubscribe"
+        )
+        for i in range(3)
+    ]
+    uploaded_keys = []
+
+    def upload(file, config):
+        with open(file, encoding='utf-8') as f:
+            uploaded_keys.extend(json.loads(line)['key'] for line in f)
+        return MagicMock(name='files/input')
+
+    def download(file):
+        lines = []
+        for key in uploaded_keys:
+            verdict = {'is_spam': True, 'confidence': 'high' if key != 'spam::spam_1' else 'low',
+                       'unsubscribe_link': None, 'unsubscribe_email': 'off@list.example', 'reason': 'promo'}
+            lines.append(json.dumps({
+                'key': key,
+                'response': {'candidates': [{'content': {'parts': [{'text': json.dumps(verdict)}]}}]}
+            }))
+        return '\n'.join(lines).encode('utf-8')
+
+    client = MagicMock()
+    client.files.upload.side_effect = upload
+    client.files.download.side_effect = download
+    client.batches.create.return_value.state.name = 'JOB_STATE_SUCCEEDED'
+
+    candidates = process_spam_automations(emails, None, client, 'test-model', batch=True)
+
+    assert uploaded_keys == ['spam::spam_0', 'spam::spam_1', 'spam::spam_2']
+    assert client.batches.create.call_count == 1
+    client.models.generate_content.assert_not_called()
+    assert [item['email']['id'] for item in candidates] == ['spam_0', 'spam_2']
+
+
+# ==============================================================================
+# UNIT TEST: Summary display
+# ==============================================================================
+
+@pytest.mark.unit
+@pytest.mark.basic
+def test_display_automation_summary_single_write(monkeypatch):
+    """
+    Test that the summary lists every pending action in one stdout write.
+    """
+    need_action_results = {
+        'calendar_events': [{'event_details': {'title': 'Standup', 'date': '2025-01-10'},
+                             'email': {'subject': 'Team standup'}}],
+        'tasks': [{'task_details': {'due_date': '2025-02-01', 'amount': '$50'},
+                   'email': {'subject': 'Your bill is ready'}}]
+    }
+    spam_results = [{'spam_info': {'confidence': 'high', 'reason': 'promo', 'unsubscribe_email': 'off@list.example'},
+                     'email': {'subject': 'Huge sale', 'from': 'deals@shop.example'}}]
+    stdout = MagicMock()
+    monkeypatch.setattr(sys, 'stdout', stdout)
+
+    display_automation_summary(need_action_results, spam_results)
+
+    assert stdout.write.call_count == 1
+    output = stdout.write.call_args.args[0]
+    assert "Standup" in output and "(all-day)" in output
+    assert "Your bill is ready" in output
+    assert "Unsubscribe email: off@list.example" in output
+
+
+# ==============================================================================
+# UNIT TEST: Execution
+# ==============================================================================
+
+@pytest.mark.unit
+@pytest.mark.extended
+def test_execute_automations_counts_successes(monkeypatch):
+    """
+    Test that confirmed automations run every batch and count successes.
+
+    Verifies:
+    - Each Google API receives its own items
+    - Only successful writes are counted
+    """
+    need_action_results = {
+        'calendar_events': [{'event_details': {'title': f'Event {i}', 'date': '2025-01-10'},
+                             'email': {'subject': f'Event {i}'}} for i in range(2)],
+        'tasks': [{'task_details': {'due_date': '2025-02-01'}, 'email': {'subject': 'Bill'}}]
+    }
+    spam_results = [{'spam_info': {'confidence': 'high', 'reason': 'promo', 'unsubscribe_email': 'off@list.example'},
+                     'email': {'subject': 'Sale', 'from': 'deals@shop.example'}}]
+    calls = {}
+
+    def fake_batch(name, results):
+        def run(service, items):
+            calls[name] = (service, len(items))
+            return results
+        return run
+
+    monkeypatch.setattr(automation_workflow, 'create_calendar_events_batch', fake_batch('calendar', [True, False]))
+    monkeypatch.setattr(automation_workflow, 'create_tasks_batch', fake_batch('tasks', [True]))
+    monkeypatch.setattr(automation_workflow, 'send_unsubscribe_requests_batch', fake_batch('gmail', [True]))
+    monkeypatch.setattr('builtins.input', lambda prompt: 'yes')
+
+    stats = execute_automations_with_confirmation(need_action_results, spam_results, 'gmail', 'calendar', 'tasks')
+
+    assert calls == {'calendar': ('calendar', 2), 'tasks': ('tasks', 1), 'gmail': ('gmail', 1)}
+    assert stats == {'events_created': 1, 'tasks_created': 1, 'unsubscribe_sent': 1}
+
+
+@pytest.mark.unit
+@pytest.mark.extended
+def test_execute_automations_warms_up_services_during_prompt(monkeypatch):
+    """
+    Test that services with pending writes are warmed up before the prompt returns.
+    """
+    need_action_results = {
+        'calendar_events': [{'event_details': {'title': 'Standup', 'date': '2025-01-10'},
+                             'email': {'subject': 'Standup'}}],
+        'tasks': []
+    }
+    calendar_service, tasks_service, gmail_service = MagicMock(), MagicMock(), MagicMock()
+    monkeypatch.setattr(automation_workflow, 'create_calendar_events_batch', lambda service, items: [True])
+    monkeypatch.setattr('builtins.input', lambda prompt: 'yes')
+
+    stats = execute_automations_with_confirmation(
+        need_action_results, [], gmail_service, calendar_service, tasks_service
+    )
+
+    assert stats['events_created'] == 1
+    calendar_service.calendars().get.assert_called_with(calendarId='primary')
+    assert not tasks_service.tasklists().get.called
+    assert not gmail_service.users().getProfile.called
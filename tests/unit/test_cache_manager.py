@@ -77,6 +77,26 @@ def test_cache_get_nonexistent(test_cache_manager):
     assert not test_cache_manager.has("nonexistent_id"), "has() should return False for missing key"
 
 
+@pytest.mark.unit
+@pytest.mark.basic
+def test_cache_get_many(test_cache_manager):
+    """
+    Test bulk retrieval of cached entries.
+
+    Verifies:
+    - get_many() returns only the requested IDs that are cached
+    - Misses and the metadata entry are omitted
+    """
+    test_cache_manager.set("email_a", {'category': 'FYI'})
+    test_cache_manager.set("email_b", {'category': 'SPAM'})
+    test_cache_manager.set("email_c", {'category': 'Newsletter'})
+    test_cache_manager.save()  # Adds _metadata entry
+
+    found = test_cache_manager.get_many(["email_a", "email_c", "missing", "_metadata"])
+
+    assert found == {'email_a': {'category': 'FYI'}, 'email_c': {'category': 'Newsletter'}}
+
+
 # ==============================================================================
 # UNIT TEST: Timestamp Tracking for Incremental Fetching
 # ==============================================================================
@@ -0,0 +1,159 @@
+"""
+Unit Tests for ContextMemoryManager
+
+Tests SQLite-backed context memory storage:
+- Saving and retrieving context entries
+- Compressed storage of compressed_context (with legacy TEXT rows)
+- Trigger-maintained statistics counters
+"""
+
+import sqlite3
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'src'))
+
+from core.context_memory import ContextMemoryManager
+
+
+@pytest.fixture
+def context_manager(tmp_path):
+    """
+    Create a ContextMemoryManager backed by a temporary database.
+
+    Returns:
+        ContextMemoryManager: Manager instance (closed after the test)
+    """
+    manager = ContextMemoryManager(db_path=str(tmp_path / 'context_memory.db'))
+    yield manager
+    manager.close()
+
+
+# ==============================================================================
+# UNIT TEST: Save and Retrieve
+# ==============================================================================
+
+@pytest.mark.unit
+@pytest.mark.basic
+def test_save_and_get_latest_context(context_manager):
+    """
+    Test that a saved context can be read back.
+
+    Verifies:
+    - save_context() returns True
+    - get_latest_context() returns the same values
+    """
+    assert context_manager.save_context('{"key_topics": ["billing"]}', ['Point 1'], 3, ['Need-Action'])
+
+    latest = context_manager.get_latest_context()
+    assert latest is not None, "Should return the saved entry"
+    assert latest['compressed_context'] == '{"key_topics": ["billing"]}'
+    assert latest['elaborate_summary'] == ['Point 1']
+    assert latest['email_count'] == 3
+    assert latest['categories'] == ['Need-Action']
+
+
+@pytest.mark.unit
+@pytest.mark.extended
+def test_compressed_context_stored_as_blob(context_manager):
+    """
+    Test that compressed_context is stored compressed and decoded on read.
+
+    Verifies:
+    - Stored value is a format-tagged BLOB, not the raw text
+    - Reads return the original string
+    """
+    context = '{"compressed_summary": "' + 'Bill due Friday. ' * 50 + '"}'
+    context_manager.save_context(context, ['Point'], 1, ['Need-Action'])
+
+    raw = context_manager.conn.execute("SELECT compressed_context FROM context_memory").fetchone()[0]
+    assert isinstance(raw, bytes), "Should store a BLOB"
+    assert len(raw) < len(context), "Stored BLOB should be smaller than the text"
+
+    assert context_manager.get_latest_context()['compressed_context'] == context
+    assert context_manager.get_all_contexts()[0]['compressed_context'] == context
+
+
+@pytest.mark.unit
+@pytest.mark.extended
+def test_legacy_text_context_still_readable(context_manager):
+    """
+    Test that rows written before compression (plain TEXT) still decode.
+    """
+    context_manager.conn.execute(
+        "INSERT INTO context_memory (timestamp, compressed_context, elaborate_summary, email_count, categories) "
+        "VALUES ('2025-01-15T10:00:00', '{\"legacy\": true}', '[]', 1, '[]')"
+    )
+    context_manager.conn.commit()
+
+    context = context_manager.get_context_by_date('2025-01-15')
+    assert context['compressed_context'] == '{"legacy": true}'
+
+
+# ==============================================================================
+# UNIT TEST: Statistics Counters
+# ==============================================================================
+
+@pytest.mark.unit
+@pytest.mark.basic
+def test_get_stats_tracks_inserts(context_manager):
+    """
+    Test that get_stats() reflects saved entries via trigger counters.
+
+    Verifies:
+    - Empty database reports zero counts
+    - Counters increase with each save_context() call
+    - Earliest/latest dates come from stored timestamps
+    """
+    empty = context_manager.get_stats()
+    assert empty['total_entries'] == 0
+    assert empty['total_emails'] == 0
+    assert empty['earliest_date'] is None
+
+    context_manager.save_context('{}', ['A'], 4, ['FYI'])
+    context_manager.save_context('{}', ['B'], 6, ['Need-Action'])
+
+    stats = context_manager.get_stats()
+    assert stats['total_entries'] == 2, "Should count both entries"
+    assert stats['total_emails'] == 10, "Should sum email counts"
+    assert stats['earliest_date'] <= stats['latest_date']
+
+
+@pytest.mark.unit
+@pytest.mark.extended
+def test_get_stats_seeds_existing_database(tmp_path):
+    """
+    Test that counters are seeded from rows written before the stats table existed.
+
+    Verifies:
+    - Pre-existing rows are counted on first initialization
+    """
+    db_path = tmp_path / 'legacy.db'
+    conn = sqlite3.connect(str(db_path))
+    conn.execute("""
+        CREATE TABLE context_memory (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            timestamp TEXT NOT NULL,
+            compressed_context TEXT NOT NULL,
+            elaborate_summary TEXT NOT NULL,
+            email_count INTEGER NOT NULL,
+            categories TEXT NOT NULL,
+            metadata TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    conn.execute(
+        "INSERT INTO context_memory (timestamp, compressed_context, elaborate_summary, email_count, categories) "
+        "VALUES ('2025-01-15T10:00:00', '{}', '[]', 5, '[]')"
+    )
+    conn.commit()
+    conn.close()
+
+    with ContextMemoryManager(db_path=str(db_path)) as manager:
+        stats = manager.get_stats()
+
+    assert stats['total_entries'] == 1
+    assert stats['total_emails'] == 5
@@ -0,0 +1,122 @@
+"""
+Unit Tests for Context Utils
+
+Tests Gemini-backed context compression and summaries with a mocked client:
+- Combined context + summary generation uses a single Gemini call
+- Identical email sets are answered from the response cache
+- Failures degrade to error values instead of raising
+- Single-purpose prompts request JSON mode with a response schema
+"""
+
+import json
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'src'))
+
+from utils.context_utils import generate_compressed_context, generate_context_bundle, generate_elaborate_summary
+
+
+@pytest.fixture
+def context_emails():
+    """Categorized emails used across context tests."""
+    return [
+        pytest.create_test_categorized_email(email_id="na_1", category="Need-Action", summary="Pay rent"),
+        pytest.create_test_categorized_email(email_id="fyi_1", category="FYI", summary="Package shipped"),
+        pytest.create_test_categorized_email(email_id="spam_1", category="SPAM", summary="Sale")
+    ]
+
+
+# ==============================================================================
+# UNIT TEST: Context bundle
+# ==============================================================================
+
+@pytest.mark.unit
+@pytest.mark.basic
+def test_generate_context_bundle_single_call(context_emails):
+    """
+    Test that context and summary come from one Gemini call.
+
+    Verifies:
+    - Exactly one generate_content call with a response schema
+    - Compressed context is returned as a JSON string
+    - Summary points are capped at max_bullets
+    """
+    client = MagicMock()
+    client.models.generate_content.return_value.text = json.dumps({
+        'compressed_context': {'key_topics': ['rent'], 'action_items': ['pay rent'], 'people': [],
+                               'dates': [], 'compressed_summary': 'Rent due.'},
+        'summary_points': ['Pay rent', 'Package shipped', 'Extra point']
+    })
+
+    context, points = generate_context_bundle(
+        context_emails, ['Need-Action', 'FYI'], client, 'test-model', max_bullets=2
+    )
+
+    assert client.models.generate_content.call_count == 1
+    assert 'response_schema' in client.models.generate_content.call_args.kwargs['config']
+    assert json.loads(context)['key_topics'] == ['rent']
+    assert points == ['Pay rent', 'Package shipped']
+    assert 'Sale' not in client.models.generate_content.call_args.kwargs['contents']
+
+
+@pytest.mark.unit
+@pytest.mark.basic
+def test_elaborate_summary_served_from_cache(context_emails):
+    """
+    Test that summarizing the same emails twice calls Gemini once.
+    """
+    client = MagicMock()
+    client.models.generate_content.return_value.text = json.dumps({'summary_points': ['Pay rent']})
+
+    first = generate_elaborate_summary(context_emails, ['Need-Action'], client, 'test-model')
+    second = generate_elaborate_summary(context_emails, ['Need-Action'], client, 'test-model')
+
+    assert first == second == ['Pay rent']
+    assert client.models.generate_content.call_count == 1
+
+
+@pytest.mark.unit
+@pytest.mark.extended
+def test_generate_context_bundle_api_failure(context_emails):
+    """
+    Test that an API error returns error values instead of raising.
+    """
+    client = MagicMock()
+    client.models.generate_content.side_effect = RuntimeError("quota exceeded")
+
+    context, points = generate_context_bundle(context_emails, ['FYI'], client, 'test-model')
+
+    assert 'error' in json.loads(context)
+    assert points[0].startswith('Failed to generate summary')
+
+
+# ==============================================================================
+# UNIT TEST: JSON mode
+# ==============================================================================
+
+@pytest.mark.unit
+@pytest.mark.extended
+def test_compressed_context_requests_json_mode(context_emails):
+    """
+    Test that compressed context is requested in JSON mode with a schema.
+
+    Verifies:
+    - generate_content receives response_mime_type and response_schema
+    - The bare JSON response is returned as-is
+    """
+    response_json = json.dumps({'key_topics': ['rent'], 'action_items': [], 'people': [],
+                                'dates': [], 'compressed_summary': 'Rent due.'})
+    client = MagicMock()
+    client.models.generate_content.return_value.text = response_json
+
+    context = generate_compressed_context(context_emails, ['Need-Action'], client, 'test-model')
+
+    config = client.models.generate_content.call_args.kwargs['config']
+    assert config['response_mime_type'] == 'application/json'
+    assert 'compressed_summary' in config['response_schema']['properties']
+    assert context == response_json
\ No newline at end of file
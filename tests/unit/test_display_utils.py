@@ -3,21 +3,38 @@ Unit Tests for Display Utils
 
 Tests digest generation and email grouping logic:
 - Category grouping (Need-Action, FYI, Newsletter, Marketing, SPAM)
+- Unknown categories keep their own group
 - Summary regeneration logic when new emails added
 - Newsletter summary generation
 - Category summary generation
 - Digest data structure validation
+- Summaries run concurrently and keep their order
+- Newsletter bodies are fetched batch by batch while earlier batches summarize
+- Display output is written in a single stdout write
+- Digest converts to and from its JSON dict form
 """
 
 import sys
+import threading
+import time
 from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import MagicMock
 
 import pytest
 
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'src'))
 
-from utils.display_utils import generate_daily_digest
+import utils.display_utils as display_utils
+from utils.display_utils import Section, generate_daily_digest
+from utils.rate_limiter import TokenBucket
+
+
+@pytest.fixture(autouse=True)
+def unlimited_summary_limiter(monkeypatch):
+    """Replace the digest's shared Gemini rate limiter with one that never waits."""
+    monkeypatch.setattr(display_utils, '_limiter', TokenBucket(rate=1e9, capacity=1e9))
 
 
 # ==============================================================================
@@ -49,20 +66,20 @@ def test_generate_digest_structure(
     )
 
     # Verify main sections exist
-    assert 'need_action' in digest, "Digest should have need_action section"
-    assert 'fyi' in digest, "Digest should have fyi section"
-    assert 'newsletters' in digest, "Digest should have newsletters section"
+    assert isinstance(digest.need_action, Section), "Digest should have need_action section"
+    assert isinstance(digest.fyi, Section), "Digest should have fyi section"
+    assert isinstance(digest.newsletters, list), "Digest should have newsletters section"
 
     # Verify need_action structure
-    assert 'emails' in digest['need_action'], "need_action should have emails list"
-    assert 'summary' in digest['need_action'], "need_action should have summary"
+    assert isinstance(digest.need_action.emails, list), "need_action should have emails list"
+    assert isinstance(digest.need_action.summary, list), "need_action should have summary"
 
     # Verify fyi structure
-    assert 'emails' in digest['fyi'], "fyi should have emails list"
-    assert 'summary' in digest['fyi'], "fyi should have summary"
+    assert isinstance(digest.fyi.emails, list), "fyi should have emails list"
+    assert isinstance(digest.fyi.summary, list), "fyi should have summary"
 
     # Verify newsletters structure (list of newsletter summaries)
-    assert isinstance(digest['newsletters'], list), "newsletters should be a list"
+    assert isinstance(digest.newsletters, list), "newsletters should be a list"
 
 
 # ==============================================================================
@@ -100,10 +117,32 @@ def test_emails_grouped_by_category(
     newsletter_count = len([e for e in sample_categorized_emails if e['category'] == 'Newsletter'])
 
     # Verify grouping
-    assert len(digest['need_action']['emails']) == need_action_count, "Need-Action count should match"
-    assert len(digest['fyi']['emails']) == fyi_count, "FYI count should match"
+    assert len(digest.need_action.emails) == need_action_count, "Need-Action count should match"
+    assert len(digest.fyi.emails) == fyi_count, "FYI count should match"
     # Newsletters are summarized, not just grouped
-    assert len(digest['newsletters']) <= newsletter_count, "Newsletter summaries should be created"
+    assert len(digest.newsletters) <= newsletter_count, "Newsletter summaries should be created"
+
+
+@pytest.mark.unit
+@pytest.mark.extended
+def test_group_by_category_known_and_custom_categories():
+    """
+    Test that grouping keeps known categories in order and unknown values separate.
+    """
+    emails = [
+        {'id': '1', 'category': 'FYI'},
+        {'id': '2', 'category': 'Promotions'},
+        {'id': '3'},
+        {'id': '4', 'category': 'FYI'},
+    ]
+
+    groups = display_utils.group_by_category(emails)
+
+    assert list(groups)[:len(display_utils.CATEGORIES)] == list(display_utils.CATEGORIES)
+    assert [e['id'] for e in groups['FYI']] == ['1', '4']
+    assert [e['id'] for e in groups['Unknown']] == ['3']
+    assert [e['id'] for e in groups['Promotions']] == ['2']
+    assert groups['SPAM'] == []
 
 
 @pytest.mark.unit
@@ -138,11 +177,11 @@ def test_empty_category_handling(mock_gmail_service, mock_gemini_model):
     )
 
     # need_action should be empty
-    assert len(digest['need_action']['emails']) == 0, "Need-Action should be empty"
-    assert digest['need_action']['summary'] == [], "Need-Action summary should be empty list"
+    assert len(digest.need_action.emails) == 0, "Need-Action should be empty"
+    assert digest.need_action.summary == [], "Need-Action summary should be empty list"
 
     # fyi should have all 3 emails
-    assert len(digest['fyi']['emails']) == 3, "FYI should have 3 emails"
+    assert len(digest.fyi.emails) == 3, "FYI should have 3 emails"
 
 
 # ==============================================================================
@@ -190,12 +229,12 @@ def test_summary_regeneration_with_new_emails(
     )
 
     # Both should have valid structure
-    assert 'need_action' in digest_cached
-    assert 'need_action' in digest_regenerated
+    assert isinstance(digest_cached.need_action, Section)
+    assert isinstance(digest_regenerated.need_action, Section)
 
     # Summaries should exist in both cases
-    assert isinstance(digest_cached['need_action']['summary'], list)
-    assert isinstance(digest_regenerated['need_action']['summary'], list)
+    assert isinstance(digest_cached.need_action.summary, list)
+    assert isinstance(digest_regenerated.need_action.summary, list)
 
 
 # ==============================================================================
@@ -246,7 +285,7 @@ def test_newsletter_summary_creation(
     )
 
     # Verify newsletter summaries
-    newsletters = digest['newsletters']
+    newsletters = digest.newsletters
     assert isinstance(newsletters, list), "Newsletters should be a list"
 
     # Each newsletter should have subject, from, summary_points
@@ -300,7 +339,7 @@ def test_category_summary_for_need_action(
     )
 
     # Verify summary exists and is a list
-    summary = digest['need_action']['summary']
+    summary = digest.need_action.summary
     assert isinstance(summary, list), "Summary should be a list"
 
     # Summary should have bullet points (at least 1)
@@ -344,7 +383,7 @@ def test_category_summary_for_fyi(
     )
 
     # Verify FYI summary
-    summary = digest['fyi']['summary']
+    summary = digest.fyi.summary
     assert isinstance(summary, list), "FYI summary should be a list"
     assert len(summary) > 0, "FYI summary should have content"
 
@@ -388,9 +427,9 @@ def test_digest_with_all_categories(
     )
 
     # Verify counts
-    need_action_count = len(digest['need_action']['emails'])
-    fyi_count = len(digest['fyi']['emails'])
-    newsletter_count = len(digest['newsletters'])
+    need_action_count = len(digest.need_action.emails)
+    fyi_count = len(digest.fyi.emails)
+    newsletter_count = len(digest.newsletters)
 
     assert need_action_count == 2, "Should have 2 Need-Action emails"
     assert fyi_count == 2, "Should have 2 FYI emails"
@@ -438,7 +477,7 @@ def test_email_data_preserved_in_digest(
     )
 
     # Get the email from digest
-    digest_email = digest['need_action']['emails'][0]
+    digest_email = digest.need_action.emails[0]
 
     # Verify all fields preserved
     assert digest_email['id'] == 'preserve_test'
@@ -447,3 +486,179 @@ def test_email_data_preserved_in_digest(
     assert digest_email['snippet'] == 'Please complete this task urgently'
     assert digest_email['category'] == 'Need-Action'
     assert digest_email['summary'] == 'Urgent action required on project'
+
+
+# ==============================================================================
+# UNIT TEST: Concurrent Summary Generation
+# ==============================================================================
+
+@pytest.mark.unit
+@pytest.mark.extended
+def test_newsletter_summaries_overlap_and_keep_order(monkeypatch):
+    """
+    Test that newsletter summaries run concurrently and keep inbox order.
+
+    Verifies:
+    - More than one Gemini call is in flight at once
+    - Newsletters appear in the digest in their original order
+    """
+    newsletter_emails = [
+        pytest.create_test_categorized_email(
+            email_id=f"newsletter_{i}",
+            category='Newsletter',
+            subject=f'Issue {i}'
+        )
+        for i in range(4)
+    ]
+    in_flight = {'now': 0, 'peak': 0}
+    lock = threading.Lock()
+
+    def summarize(email_body, subject, client, model_name):
+        with lock:
+            in_flight['now'] += 1
+            in_flight['peak'] = max(in_flight['peak'], in_flight['now'])
+        time.sleep(0.05)
+        with lock:
+            in_flight['now'] -= 1
+        return [subject, 'point 2', 'point 3']
+
+    monkeypatch.setattr(display_utils, 'extract_email_bodies', lambda service, ids: dict.fromkeys(ids, 'body'))
+    monkeypatch.setattr(display_utils, 'generate_newsletter_summary', summarize)
+
+    digest = generate_daily_digest(newsletter_emails, None, None, 'test-model', cache=None, new_emails_count=4)
+
+    assert [n['summary_points'][0] for n in digest.newsletters] == [f'Issue {i}' for i in range(4)]
+    assert in_flight['peak'] > 1, "Newsletter summaries should overlap"
+
+
+@pytest.mark.unit
+@pytest.mark.extended
+def test_newsletter_batches_summarized_while_next_batch_fetched(monkeypatch):
+    """
+    Test that each Gmail batch of bodies is summarized before the next is fetched.
+    """
+    newsletter_emails = [
+        pytest.create_test_categorized_email(
+            email_id=f"newsletter_{i}",
+            category='Newsletter',
+            subject=f'Issue {i}'
+        )
+        for i in range(3)
+    ]
+    events = []
+    first_summary_started = threading.Event()
+
+    def fetch(service, ids):
+        if events:
+            # Second batch: the first batch's summary should already be running
+            assert first_summary_started.wait(timeout=5)
+        events.append(('fetch', list(ids)))
+        return dict.fromkeys(ids, 'body')
+
+    def summarize(email_body, subject, client, model_name):
+        first_summary_started.set()
+        return [subject, 'point 2', 'point 3']
+
+    monkeypatch.setattr(display_utils, 'GMAIL_BATCH_LIMIT', 2)
+    monkeypatch.setattr(display_utils, 'extract_email_bodies', fetch)
+    monkeypatch.setattr(display_utils, 'generate_newsletter_summary', summarize)
+
+    digest = generate_daily_digest(newsletter_emails, None, None, 'test-model', cache=None, new_emails_count=3)
+
+    assert events == [
+        ('fetch', ['newsletter_0', 'newsletter_1']),
+        ('fetch', ['newsletter_2'])
+    ]
+    assert [n['summary_points'][0] for n in digest.newsletters] == ['Issue 0', 'Issue 1', 'Issue 2']
+
+
+@pytest.mark.unit
+@pytest.mark.extended
+def test_newsletter_cache_looked_up_once(monkeypatch):
+    """
+    Test that each newsletter's cache entry is read once and merged on write.
+    """
+    newsletter = pytest.create_test_categorized_email(
+        email_id="newsletter_1",
+        category='Newsletter',
+        subject='Issue 1'
+    )
+    cache = MagicMock()
+    cache.get.return_value = {'category': 'Newsletter'}
+
+    monkeypatch.setattr(display_utils, 'extract_email_bodies', lambda service, ids: dict.fromkeys(ids, 'body'))
+    monkeypatch.setattr(display_utils, 'generate_newsletter_summary', lambda *args: ['a', 'b', 'c'])
+
+    generate_daily_digest([newsletter], None, None, 'test-model', cache=cache, new_emails_count=1)
+
+    cache.get.assert_called_once_with('newsletter_1')
+    assert not cache.has.called
+    cache.set.assert_called_once_with(
+        'newsletter_1', {'category': 'Newsletter', 'newsletter_summary': ['a', 'b', 'c']}
+    )
+
+
+@pytest.mark.unit
+@pytest.mark.extended
+def test_category_key_is_order_independent_digest():
+    """
+    Test that category cache keys are fixed-size and ignore email order.
+    """
+    emails = [{'id': f'msg_{i}'} for i in range(50)]
+
+    key = display_utils._category_key('category_summary_fyi_', emails)
+
+    assert key == display_utils._category_key('category_summary_fyi_', list(reversed(emails)))
+    assert len(key) == len('category_summary_fyi_') + 32
+    assert key != display_utils._category_key('category_summary_fyi_', emails[:-1])
+
+
+# ==============================================================================
+# UNIT TEST: Digest Display
+# ==============================================================================
+
+@pytest.mark.unit
+@pytest.mark.extended
+def test_display_daily_digest_single_write(monkeypatch):
+    """
+    Test that the digest is written to stdout in one write with every section.
+    """
+    digest = {
+        'need_action': {'emails': [{'subject': 'Pay rent'}], 'summary': []},
+        'fyi': {'emails': [{'subject': 'Order shipped'}], 'summary': ['Package arrives Friday']},
+        'newsletters': [{'subject': 'AI Weekly', 'from': 'hello@aiweekly.co', 'summary_points': ['New model']}]
+    }
+    # Replace the module's sys rather than sys.stdout itself: pytest's live
+    # logging swaps sys.stdout back while the digest logs
+    stdout = MagicMock()
+    monkeypatch.setattr(display_utils, 'sys', SimpleNamespace(stdout=stdout))
+
+    display_utils.display_daily_digest(digest)
+
+    assert stdout.write.call_count == 1
+    output = stdout.write.call_args.args[0]
+    assert "  • Pay rent" in output
+    assert "  • Package arrives Friday" in output
+    assert "        • New model" in output
+    assert "Total emails processed: 3" in output
+
+
+@pytest.mark.unit
+@pytest.mark.basic
+def test_digest_to_dict_round_trip():
+    """
+    Test that Digest converts to the JSON nested-dict form and back.
+    """
+    digest = display_utils.Digest(
+        need_action=Section([{'id': '1', 'subject': 'Pay rent'}], ['Rent due Friday']),
+        newsletters=[{'subject': 'AI Weekly', 'from': 'hello@aiweekly.co', 'summary_points': ['New model']}]
+    )
+
+    data = digest.to_dict()
+
+    assert data == {
+        'need_action': {'emails': [{'id': '1', 'subject': 'Pay rent'}], 'summary': ['Rent due Friday']},
+        'fyi': {'emails': [], 'summary': []},
+        'newsletters': [{'subject': 'AI Weekly', 'from': 'hello@aiweekly.co', 'summary_points': ['New model']}]
+    }
+    assert display_utils.Digest.from_dict(data) == digest
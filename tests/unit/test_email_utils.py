@@ -6,18 +6,35 @@ Tests email fetching and timestamp conversion logic:
 - Timestamp conversion to Gmail epoch format
 - Email data extraction and formatting
 - Error handling for invalid timestamps
+- Batched message and body fetching (Gmail resources built once per fetch)
+- In-memory body and metadata caches
+- Per-thread Gmail service reuse, token caching and background token refresh
+- Incremental fetches via history.list with search fallback
 """
 
+import base64
+import json
 import sys
+import threading
 from pathlib import Path
-from datetime import datetime
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock
 
 import pytest
 
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'src'))
 
-from utils.email_utils import fetch_recent_emails
+import utils.email_utils as email_utils
+from utils.email_utils import extract_email_bodies, fetch_recent_emails
+
+
+@pytest.fixture(autouse=True)
+def gmail_state_file(tmp_path, monkeypatch):
+    """Keep each test's saved Gmail historyId in its own temporary file."""
+    state_file = tmp_path / '.gmail_state.json'
+    monkeypatch.setattr(email_utils, 'GMAIL_STATE_FILE', str(state_file))
+    return state_file
 
 
 # ==============================================================================
@@ -341,3 +358,383 @@ def test_email_snippet_extraction(mock_gmail_service):
 
         assert isinstance(snippet, str), "Snippet should be a string"
         assert len(snippet) > 0, "Snippet should not be empty"
+
+
+@pytest.mark.unit
+@pytest.mark.extended
+def test_fetch_recent_emails_uses_batch_request(mock_gmail_service, sample_emails):
+    """
+    Test that message metadata is fetched in one batch request.
+
+    Verifies:
+    - All message gets share a single batch HTTP request
+    - Only metadata headers are requested, not full payloads
+    - Emails keep the order returned by the list call
+    - A message that fails to fetch is skipped
+    """
+    ids = [email['id'] for email in sample_emails[:5]]
+    get_side_effect = mock_gmail_service.users().messages().get.side_effect
+
+    def get(**kwargs):
+        request = get_side_effect(**kwargs)
+        if kwargs['id'] == ids[1]:
+            request.execute.side_effect = RuntimeError("404 Not Found")
+        return request
+
+    mock_gmail_service.users().messages().get.side_effect = get
+
+    emails = fetch_recent_emails(mock_gmail_service, max_results=5, query='is:unread')
+
+    assert mock_gmail_service.new_batch_http_request.call_count == 1
+    get_kwargs = mock_gmail_service.users().messages().get.call_args.kwargs
+    assert get_kwargs['format'] == 'metadata'
+    assert get_kwargs['metadataHeaders'] == ['Subject', 'From', 'Date']
+    assert [email['id'] for email in emails] == ids[:1] + ids[2:]
+
+
+@pytest.mark.unit
+@pytest.mark.extended
+def test_refetch_uses_cached_metadata(mock_gmail_service, sample_emails):
+    """
+    Test that messages seen by an earlier fetch are not fetched again.
+
+    Verifies:
+    - A repeated poll returns the same emails without any message gets
+    - Cached emails are copies, so callers can't change the cache
+    - Only messages missing from the cache are fetched
+    - forget_email_body() drops the cached metadata too
+    """
+    get = mock_gmail_service.users().messages().get
+    first = fetch_recent_emails(mock_gmail_service, max_results=5, query='is:unread')
+    assert get.call_count == 5
+
+    first[0]['subject'] = 'changed by caller'
+    second = fetch_recent_emails(mock_gmail_service, max_results=5, query='is:unread')
+    assert get.call_count == 5
+    assert [email['id'] for email in second] == [email['id'] for email in first]
+    assert second[0]['subject'] == sample_emails[0]['subject']
+
+    email_utils.forget_email_body(sample_emails[2]['id'])
+    fetch_recent_emails(mock_gmail_service, max_results=5, query='is:unread')
+    assert get.call_count == 6
+    assert get.call_args.kwargs['id'] == sample_emails[2]['id']
+
+
+@pytest.mark.unit
+@pytest.mark.extended
+def test_incremental_fetch_uses_history_since_last_fetch(mock_gmail_service, sample_emails, gmail_state_file):
+    """
+    Test that a fetch returns the historyId and the next one reads only the delta.
+
+    Verifies:
+    - A full search returns the mailbox historyId from getProfile without saving it
+    - The next incremental fetch calls history.list with the saved historyId
+    - Only added messages with the queried labels are fetched, newest first
+    - An expired historyId (404) falls back to the search
+    - Fetches that don't ask for the historyId never touch the state file
+    """
+    from googleapiclient.errors import HttpError
+
+    users = mock_gmail_service.users()
+    users.getProfile.return_value.execute.return_value = {'historyId': '100'}
+    emails, history_id = fetch_recent_emails(
+        mock_gmail_service, max_results=5, query='is:unread newer_than:1d', return_history_id=True
+    )
+    assert len(emails) == 5 and history_id == '100'
+    assert not gmail_state_file.exists()
+    email_utils.save_history_id(history_id)
+    assert json.loads(gmail_state_file.read_text())['history_id'] == '100'
+
+    ids = [email['id'] for email in sample_emails[:4]]
+    users.history().list.return_value.execute.return_value = {
+        'history': [
+            {'messagesAdded': [{'message': {'id': ids[0], 'labelIds': ['INBOX', 'UNREAD']}}]},
+            {'messagesAdded': [{'message': {'id': ids[1], 'labelIds': ['INBOX']}}]},
+            {'messagesAdded': [{'message': {'id': ids[2], 'labelIds': ['SPAM', 'UNREAD']}},
+                               {'message': {'id': ids[3], 'labelIds': ['UNREAD']}}]}
+        ],
+        'historyId': '120'
+    }
+    users.messages().list.reset_mock()
+
+    emails, history_id = fetch_recent_emails(
+        mock_gmail_service, max_results=5, query='is:unread newer_than:1d',
+        after_timestamp='2025-01-15T10:00:00', return_history_id=True
+    )
+
+    history_kwargs = users.history().list.call_args.kwargs
+    assert history_kwargs['startHistoryId'] == '100'
+    assert history_kwargs['historyTypes'] == ['messageAdded']
+    assert not users.messages().list.called
+    assert [email['id'] for email in emails] == [ids[3], ids[0]]
+    assert history_id == '120'
+    assert json.loads(gmail_state_file.read_text())['history_id'] == '100'
+
+    users.history().list.return_value.execute.side_effect = HttpError(MagicMock(status=404), b'History expired')
+    users.getProfile.reset_mock()
+    emails = fetch_recent_emails(
+        mock_gmail_service, max_results=5, query='is:unread newer_than:1d',
+        after_timestamp='2025-01-15T10:00:00'
+    )
+
+    assert users.messages().list.called
+    assert len(emails) == 5
+    assert not users.getProfile.called
+    assert json.loads(gmail_state_file.read_text())['history_id'] == '100'
+
+
+@pytest.mark.unit
+@pytest.mark.extended
+def test_connect_to_gmail_reuses_service(monkeypatch):
+    """
+    Test that each thread builds its Gmail service once and reuses it while credentials are valid.
+    """
+    creds = MagicMock(valid=True)
+    load = MagicMock(return_value=creds)
+    build_service = MagicMock(side_effect=lambda *args: MagicMock())
+    monkeypatch.setattr(email_utils, '_gmail_local', threading.local())
+    monkeypatch.setattr(email_utils, '_gmail_creds', None)
+    monkeypatch.setattr(email_utils, '_token_cache', None)
+    monkeypatch.setattr(email_utils, '_token_mtime', lambda: 1.0)
+    monkeypatch.setattr(email_utils, 'Credentials', MagicMock(from_authorized_user_file=load))
+    monkeypatch.setattr(email_utils, 'build_google_service', build_service)
+    monkeypatch.setattr(email_utils, '_refresh_token_loop', lambda creds: None)
+
+    first = email_utils.connect_to_gmail()
+    assert email_utils.connect_to_gmail() is first
+    assert build_service.call_count == 1
+
+    # Another thread gets its own service over the same credentials
+    other = []
+    worker = threading.Thread(target=lambda: other.append(email_utils.connect_to_gmail()))
+    worker.start()
+    worker.join()
+    assert other[0] is not first
+    assert build_service.call_args.args[2] is creds
+    assert build_service.call_count == 2
+    assert load.call_count == 1
+
+    # Invalid credentials force a fresh connection
+    creds.valid = False
+    creds.expired = True
+    creds.refresh_token = 'refresh'
+    monkeypatch.setattr(email_utils, 'Request', MagicMock())
+    monkeypatch.setattr('builtins.open', MagicMock())
+    assert email_utils.connect_to_gmail() is not first
+    assert build_service.call_count == 3
+
+
+@pytest.mark.unit
+@pytest.mark.extended
+def test_token_file_parsed_once_while_unchanged(monkeypatch):
+    """
+    Test that token.json is only parsed again after it changes on disk.
+    """
+    mtime = {'value': 1.0}
+    load = MagicMock(side_effect=lambda *args: MagicMock())
+    monkeypatch.setattr(email_utils, '_token_cache', None)
+    monkeypatch.setattr(email_utils, '_token_mtime', lambda: mtime['value'])
+    monkeypatch.setattr(email_utils, 'Credentials', MagicMock(from_authorized_user_file=load))
+
+    first = email_utils._load_token()
+    assert email_utils._load_token() is first
+    assert load.call_count == 1
+
+    mtime['value'] = 2.0
+    assert email_utils._load_token() is not first
+    assert load.call_count == 2
+
+
+@pytest.mark.unit
+@pytest.mark.extended
+def test_token_refreshed_before_expiry(monkeypatch):
+    """
+    Test that the background loop refreshes and saves a token nearing expiry,
+    and stops once the credentials are replaced.
+    """
+    creds = MagicMock(expiry=datetime.utcnow() + timedelta(minutes=1))
+    saved = []
+
+    def refresh(request):
+        creds.expiry = datetime.utcnow() + timedelta(hours=1)
+        # A reconnect replaces the shared credentials; the loop should exit
+        email_utils._gmail_creds = None
+
+    creds.refresh.side_effect = refresh
+    monkeypatch.setattr(email_utils, '_gmail_creds', creds)
+    monkeypatch.setattr(email_utils, 'Request', MagicMock())
+    monkeypatch.setattr(email_utils, '_save_token', saved.append)
+    monkeypatch.setattr(email_utils.time, 'sleep', lambda seconds: None)
+
+    email_utils._refresh_token_loop(creds)
+
+    assert creds.refresh.call_count == 1
+    assert saved == [creds]
+    assert email_utils._seconds_until_refresh(creds) > 50 * 60
+
+
+# ==============================================================================
+# UNIT TEST: Batched Body Extraction
+# ==============================================================================
+
+@pytest.fixture(autouse=True)
+def empty_caches(monkeypatch):
+    """Give each test empty in-memory body and metadata caches."""
+    monkeypatch.setattr(email_utils, '_body_cache', email_utils.OrderedDict())
+    monkeypatch.setattr(email_utils, '_metadata_cache', email_utils.OrderedDict())
+
+
+def _fake_batch_service(messages):
+    """Create a mock Gmail service whose batch requests answer from messages by ID."""
+    service = MagicMock()
+    batches = []
+    executed_with = []
+
+    def get(userId, id, format):
+        return id
+
+    def new_batch_http_request(callback):
+        batch = MagicMock()
+        added = []
+        batch.add.side_effect = lambda request, request_id: added.append(request_id)
+
+        def execute(http=None):
+            executed_with.append(http)
+            for request_id in added:
+                if request_id in messages:
+                    callback(request_id, messages[request_id], None)
+                else:
+                    callback(request_id, None, RuntimeError("404 Not Found"))
+
+        batch.execute.side_effect = execute
+        batches.append(added)
+        return batch
+
+    service.users().messages().get.side_effect = get
+    service.new_batch_http_request.side_effect = new_batch_http_request
+    service.executed_with = executed_with
+    return service, batches
+
+
+@pytest.mark.unit
+@pytest.mark.extended
+def test_extract_email_bodies_uses_one_batch():
+    """
+    Test that several bodies are fetched in one batch request.
+
+    Verifies:
+    - All message gets share a single batch HTTP request
+    - Bodies are decoded per message ID (HTML tags stripped)
+    - Nested plain text is preferred over an HTML part
+    - A failed message yields an empty body
+    """
+    encode = lambda text: base64.urlsafe_b64encode(text.encode()).decode()
+    messages = {
+        'm1': {'payload': {'body': {'data': encode('First body')}}},
+        'm2': {'payload': {'parts': [{'mimeType': 'text/plain', 'body': {'data': encode('Second body')}}]}},
+        'm3': {'payload': {'parts': [{'mimeType': 'text/html', 'body': {'data': encode('<p>Third <b>body</b></p>')}}]}},
+        'm4': {'payload': {'parts': [
+            {'mimeType': 'text/html', 'body': {'data': encode('<p>HTML copy</p>')}},
+            {'mimeType': 'multipart/mixed', 'parts': [
+                {'mimeType': 'multipart/alternative', 'parts': [
+                    {'mimeType': 'text/plain', 'body': {'data': encode('Deep plain body')}}
+                ]}
+            ]}
+        ]}},
+    }
+    service, batches = _fake_batch_service(messages)
+
+    bodies = extract_email_bodies(service, ['m1', 'm2', 'm3', 'm4', 'missing'])
+
+    assert bodies == {
+        'm1': 'First body', 'm2': 'Second body', 'm3': 'Third body', 'm4': 'Deep plain body', 'missing': ''
+    }
+    assert batches == [['m1', 'm2', 'm3', 'm4', 'missing']]
+
+
+@pytest.mark.unit
+@pytest.mark.extended
+def test_decode_base64_handles_padding_and_bad_utf8():
+    """
+    Test URL-safe base64 decoding of Gmail body data.
+
+    Verifies:
+    - URL-safe characters and missing padding are accepted
+    - Invalid UTF-8 is replaced rather than dropping the whole body
+    """
+    text = 'Ünïcode body ~~~???>>>'
+    encoded = base64.urlsafe_b64encode(text.encode()).decode().rstrip('=')
+    assert '-' in encoded or '_' in encoded
+
+    assert email_utils._decode_base64(encoded) == text
+    assert email_utils._decode_base64(base64.urlsafe_b64encode(b'ok \xff end').decode()) == 'ok \ufffd end'
+
+
+@pytest.mark.unit
+@pytest.mark.extended
+def test_extract_email_bodies_runs_batches_concurrently(monkeypatch):
+    """
+    Test that bodies beyond one batch are fetched in parallel batches.
+
+    Verifies:
+    - IDs are split into GMAIL_BATCH_LIMIT-sized batches
+    - Concurrent batches execute over worker HTTP transports
+    - The messages resource is built once, not once per message
+    - Every body is returned
+    - Worker transports are reused across calls
+    """
+    encode = lambda text: base64.urlsafe_b64encode(text.encode()).decode()
+    ids = [f'm{i}' for i in range(120)]
+    messages = {email_id: {'payload': {'body': {'data': encode(email_id)}}} for email_id in ids}
+    service, batches = _fake_batch_service(messages)
+    built = []
+    monkeypatch.setattr(email_utils, '_idle_batch_https', {})
+    monkeypatch.setattr(email_utils, '_batch_http', lambda service: built.append(object()) or built[-1])
+    service.users.reset_mock()
+
+    bodies = email_utils.extract_email_bodies(service, ids)
+
+    assert service.users.call_count == 1
+    assert [len(batch) for batch in batches] == [50, 50, 20]
+    assert len(service.executed_with) == 3
+    assert all(http is not None for http in service.executed_with)
+    assert bodies == {email_id: email_id for email_id in ids}
+
+    # Worker transports are kept open and reused by the next fetch
+    transports_built = len(built)
+    email_utils._body_cache.clear()
+    email_utils.extract_email_bodies(service, ids)
+    assert len(built) == transports_built
+
+
+@pytest.mark.unit
+@pytest.mark.extended
+def test_extracted_bodies_served_from_memory(monkeypatch):
+    """
+    Test that extracted bodies are cached in memory with LRU eviction.
+
+    Verifies:
+    - A second extraction of the same messages makes no Gmail request
+    - Failed messages are not cached
+    - The least recently used body is evicted past BODY_CACHE_SIZE
+    - forget_email_body() drops a cached body
+    """
+    encode = lambda text: base64.urlsafe_b64encode(text.encode()).decode()
+    messages = {email_id: {'payload': {'body': {'data': encode(email_id)}}} for email_id in ('m1', 'm2', 'm3', 'm4')}
+    service, batches = _fake_batch_service(messages)
+
+    email_utils.extract_email_bodies(service, ['m1', 'm2', 'missing'])
+    bodies = email_utils.extract_email_bodies(service, ['m1', 'm2', 'missing'])
+
+    assert bodies == {'m1': 'm1', 'm2': 'm2', 'missing': ''}
+    assert batches == [['m1', 'm2', 'missing']]
+    assert list(email_utils._body_cache) == ['m1', 'm2']
+
+    # m1 is used again, so m2 is the least recently used when m4 arrives
+    monkeypatch.setattr(email_utils, 'BODY_CACHE_SIZE', 3)
+    email_utils.extract_email_bodies(service, ['m1'])
+    email_utils.extract_email_bodies(service, ['m3', 'm4'])
+    assert list(email_utils._body_cache) == ['m1', 'm3', 'm4']
+
+    email_utils.forget_email_body('m3')
+    assert list(email_utils._body_cache) == ['m1', 'm4']
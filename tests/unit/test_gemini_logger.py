@@ -0,0 +1,200 @@
+"""
+Unit Tests for Gemini Logger
+
+Tests the Gemini interaction log:
+- Logged interactions round-trip through get_log_entries()
+- Writes happen on a background thread and flush() waits for them
+- The day's log file is kept open between writes
+- Entries are JSON lines; older text-format files are still read
+- Log files are gzip-compressed and readable while still being written
+- Two writers appending to the same day's file don't corrupt each other's entries
+- Only JSON-looking responses are pretty printed
+- Available dates are listed newest first
+"""
+
+import gzip
+import json
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'src'))
+
+from utils.gemini_logger import GeminiLogger
+
+
+@pytest.mark.unit
+@pytest.mark.basic
+def test_logged_interactions_read_back(tmp_path):
+    """
+    Test that logged interactions are parsed back with metadata, request and response.
+    """
+    gemini_logger = GeminiLogger(log_dir=tmp_path)
+
+    gemini_logger.log_interaction('categorize_email', 'Prompt one', {'category': 'FYI'}, {'model': 'flash'})
+    gemini_logger.log_interaction('generate_summary', 'Prompt two', 'plain text')
+
+    entries = gemini_logger.get_log_entries()
+
+    assert [entry['operation'] for entry in entries] == ['categorize_email', 'generate_summary']
+    assert entries[0]['metadata'] == {'model': 'flash'}
+    assert entries[0]['request'] == 'Prompt one'
+    assert entries[0]['response'] == '{\n  "category": "FYI"\n}'
+    assert entries[1]['response'] == 'plain text'
+
+
+@pytest.mark.unit
+@pytest.mark.extended
+def test_log_writes_happen_off_the_calling_thread(tmp_path, monkeypatch):
+    """
+    Test that log_interaction() returns before the write and flush() waits for it.
+    """
+    gemini_logger = GeminiLogger(log_dir=tmp_path)
+    writer_threads = []
+    real_open = open
+
+    def recording_open(*args, **kwargs):
+        writer_threads.append(threading.current_thread())
+        return real_open(*args, **kwargs)
+
+    monkeypatch.setattr('builtins.open', recording_open)
+
+    for i in range(3):
+        gemini_logger.log_interaction('categorize_email', f'Prompt {i}', 'ok')
+    gemini_logger.close()
+
+    assert writer_threads
+    assert threading.current_thread() not in writer_threads
+    log_text = gzip.open(gemini_logger._get_log_file_path(), 'rt', encoding='utf-8').read()
+    assert log_text.count('"operation": "categorize_email"') == 3
+
+
+@pytest.mark.unit
+@pytest.mark.extended
+def test_log_file_opened_once_per_day(tmp_path, monkeypatch):
+    """
+    Test that the day's log file stays open across writes and reopens on a new day.
+    """
+    gemini_logger = GeminiLogger(log_dir=tmp_path)
+    opened = []
+    real_open = open
+
+    def recording_open(path, *args, **kwargs):
+        opened.append(Path(path).name)
+        return real_open(path, *args, **kwargs)
+
+    monkeypatch.setattr('builtins.open', recording_open)
+
+    for i in range(2):
+        gemini_logger.log_interaction('categorize_email', f'Prompt {i}', 'ok')
+        gemini_logger.flush()
+    monkeypatch.setattr(gemini_logger, '_get_log_file_path', lambda: tmp_path / 'gemini_interactions_2099-01-01.log.gz')
+    gemini_logger.log_interaction('categorize_email', 'Next day', 'ok')
+    gemini_logger.flush()
+
+    assert len(opened) == 2
+    assert opened[1] == 'gemini_interactions_2099-01-01.log.gz'
+
+
+@pytest.mark.unit
+@pytest.mark.extended
+def test_reads_one_json_object_per_line_and_legacy_entries(tmp_path):
+    """
+    Test that entries are stored as JSON lines and older text entries are still read.
+    """
+    gemini_logger = GeminiLogger(log_dir=tmp_path)
+    log_file = gemini_logger._get_log_file_path()
+    separator = "=" * 100
+    # Uncompressed file from before compression, same day
+    log_file.with_suffix('').write_text(
+        f"\n{separator}\nTIMESTAMP: 2025-01-15 09:00:00.000\nOPERATION: legacy_call\n"
+        f"\n{'REQUEST (Prompt):':-^100}\nOld prompt\n\n{'RESPONSE:':-^100}\n{{\n  \"ok\": true\n}}\n{separator}\n",
+        encoding='utf-8'
+    )
+
+    gemini_logger.log_interaction('categorize_email', 'New prompt', 'done', {'latency': 1.5})
+    entries = gemini_logger.get_log_entries()
+    gemini_logger.close()
+
+    last_line = gzip.open(log_file, 'rt', encoding='utf-8').read().splitlines()[-1]
+    assert json.loads(last_line)['operation'] == 'categorize_email'
+
+    assert [entry['operation'] for entry in entries] == ['legacy_call', 'categorize_email']
+    assert entries[0]['response'] == '{\n  "ok": true\n}'
+    assert entries[1]['metadata'] == {'latency': '1.5'}
+
+
+@pytest.mark.unit
+@pytest.mark.extended
+def test_log_file_compressed_and_readable_while_open(tmp_path):
+    """
+    Test that the day's file is gzip data that can be read before and after it is closed.
+    """
+    gemini_logger = GeminiLogger(log_dir=tmp_path)
+    log_file = gemini_logger._get_log_file_path()
+
+    gemini_logger.log_interaction('categorize_email', 'Prompt ' * 200, 'ok')
+    assert log_file.name.endswith('.log.gz')
+    assert len(gemini_logger.get_log_entries()) == 1
+
+    gemini_logger.log_interaction('generate_summary', 'Prompt ' * 200, 'ok')
+    gemini_logger.close()
+    assert log_file.read_bytes()[:2] == b'\x1f\x8b'
+    assert log_file.stat().st_size < 1000
+
+    # A later writer appends a second gzip member to the same file
+    later_logger = GeminiLogger(log_dir=tmp_path)
+    later_logger.log_interaction('categorize_email', 'Third', 'ok')
+    later_logger.flush()
+    entries = gemini_logger.get_log_entries()
+    assert [entry['operation'] for entry in entries] == ['categorize_email', 'generate_summary', 'categorize_email']
+
+
+@pytest.mark.unit
+@pytest.mark.extended
+def test_concurrent_writers_share_day_file(tmp_path):
+    """
+    Test that interleaved batches from two loggers (e.g. the CLI and the web server) all read back.
+    """
+    cli_logger = GeminiLogger(log_dir=tmp_path)
+    web_logger = GeminiLogger(log_dir=tmp_path)
+
+    for i in range(3):
+        cli_logger.log_interaction('categorize_email', f'CLI prompt {i}', 'ok')
+        cli_logger.flush()
+        web_logger.log_interaction('gemini_review', f'Web prompt {i}', 'ok')
+        web_logger.flush()
+
+    requests = [entry['request'] for entry in cli_logger.get_log_entries()]
+    assert requests == [f'{source} prompt {i}' for i in range(3) for source in ('CLI', 'Web')]
+
+
+@pytest.mark.unit
+@pytest.mark.basic
+def test_format_response_pretty_prints_only_json(tmp_path):
+    """
+    Test that JSON responses are pretty printed and other text is kept verbatim.
+    """
+    gemini_logger = GeminiLogger(log_dir=tmp_path)
+
+    assert gemini_logger._format_response(' {"a": [1]}') == '{\n  "a": [\n    1\n  ]\n}'
+    assert gemini_logger._format_response('Plain summary') == 'Plain summary'
+    assert gemini_logger._format_response('[not json') == '[not json'
+    assert gemini_logger._format_response('') == ''
+    assert gemini_logger._format_response(42) == '42'
+
+
+@pytest.mark.unit
+@pytest.mark.basic
+def test_available_dates_newest_first(tmp_path):
+    """
+    Test that available dates come from log file names, newest first.
+    """
+    for name in ('gemini_interactions_2025-01-14.log', 'gemini_interactions_2025-01-15.log.gz',
+                 'gemini_interactions_2025-01-15.log', 'other.log'):
+        (tmp_path / name).write_text('', encoding='utf-8')
+
+    assert GeminiLogger(log_dir=tmp_path).get_available_dates() == ['2025-01-15', '2025-01-14']
@@ -0,0 +1,278 @@
+"""
+Unit Tests for Gemini Utils
+
+Tests batch email categorization:
+- Emails are categorized concurrently and returned in input order
+- Several emails share one request; emails missing from its response are retried alone
+- A failed batch request falls back for all its emails without single retries
+- Every request takes a token from a rate limiter shared per request rate
+- A failed email gets the fallback categorization without stopping the rest
+- Fenced JSON responses are parsed; invalid JSON falls back to Unknown
+- Repeated email content is categorized from the response cache
+- Responses are requested as JSON following a schema
+- A rate-limited (429) request is retried
+- A persistently rate-limited request is sent a bounded number of times
+- Prompt templates keep braces in email content and render single JSON braces
+"""
+
+import json
+import sys
+import threading
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'src'))
+
+import utils.gemini_utils as gemini_utils
+from utils.gemini_utils import categorize_email_with_gemini, categorize_emails
+
+
+@pytest.fixture(autouse=True)
+def isolated_gemini_state(monkeypatch):
+    """Give each test fresh rate limiters and keep interactions out of the log files."""
+    monkeypatch.setattr(gemini_utils, '_limiters', {})
+    monkeypatch.setattr(gemini_utils, 'gemini_logger', MagicMock())
+
+
+def _fake_client(generate):
+    """Create a client whose generate_content() answers with generate(prompt) as JSON."""
+    client = MagicMock()
+    client.models.generate_content.side_effect = (
+        lambda model, contents, config=None: SimpleNamespace(text=json.dumps(generate(contents)))
+    )
+    return client
+
+
+def _categorization(category):
+    """Build a valid categorization response for category."""
+    return {
+        'category': category,
+        'subcategory': 'General',
+        'summary': f'{category} email',
+        'action_item': 'None',
+        'date_due': None
+    }
+
+
+@pytest.mark.unit
+@pytest.mark.basic
+def test_categorize_emails_runs_concurrently_in_order(sample_emails):
+    """
+    Test that categorization requests overlap and results keep the input order.
+    """
+    emails = sample_emails[:3]
+    # Every request blocks until all three are in flight at once
+    all_in_flight = threading.Barrier(len(emails), timeout=5)
+
+    def generate(prompt):
+        all_in_flight.wait()
+        return _categorization('FYI' if emails[1]['subject'] in prompt else 'Need-Action')
+
+    categorized = categorize_emails(emails, _fake_client(generate), 'test-model', batch_size=1)
+
+    assert [email['id'] for email in categorized] == [email['id'] for email in emails]
+    assert [email['category'] for email in categorized] == ['Need-Action', 'FYI', 'Need-Action']
+
+
+@pytest.mark.unit
+@pytest.mark.extended
+def test_categorize_emails_shares_rate_limiter(sample_emails, monkeypatch):
+    """
+    Test that each request takes a token from one limiter per request rate.
+    """
+    acquired = []
+    monkeypatch.setattr(gemini_utils.TokenBucket, 'acquire', lambda self: acquired.append(self) or 0.0)
+    client = _fake_client(lambda prompt: _categorization('FYI'))
+
+    categorize_emails(sample_emails[:2], client, 'test-model', requests_per_minute=20, batch_size=1)
+    categorize_emails(sample_emails[2:4], client, 'test-model', requests_per_minute=20, batch_size=1)
+
+    limiter = gemini_utils._get_limiter(20)
+    assert acquired == [limiter] * 4
+    assert limiter.capacity == 20 and limiter.rate == pytest.approx(20 / 60)
+    assert gemini_utils._get_limiter(10) is not limiter
+
+
+@pytest.mark.unit
+@pytest.mark.extended
+def test_categorize_emails_falls_back_for_failed_email(sample_emails):
+    """
+    Test that a failing request yields the Unknown fallback and the rest still succeed.
+    """
+    emails = sample_emails[:3]
+
+    def generate(prompt):
+        if emails[0]['subject'] in prompt:
+            raise RuntimeError("500 Internal error")
+        return _categorization('Newsletter')
+
+    categorized = categorize_emails(emails, _fake_client(generate), 'test-model', batch_size=1)
+
+    assert [email['category'] for email in categorized] == ['Unknown', 'Newsletter', 'Newsletter']
+    assert categorized[0]['id'] == emails[0]['id']
+
+
+@pytest.mark.unit
+@pytest.mark.extended
+def test_categorize_emails_batches_requests(sample_emails, monkeypatch):
+    """
+    Test that a batch is one request mapped back by index, with single retries for gaps.
+    """
+    emails = sample_emails[:3]
+    acquired = []
+    monkeypatch.setattr(gemini_utils.TokenBucket, 'acquire', lambda self: acquired.append(self) or 0.0)
+    prompts = []
+
+    def generate(model, contents, config=None):
+        prompts.append(contents)
+        if 'Email 1:' in contents:
+            # Out of order, fenced, and missing email 2
+            results = [dict(_categorization('SPAM'), index=3), dict(_categorization('FYI'), index=1)]
+            return SimpleNamespace(text='```json\n' + json.dumps({'results': results}) + '\n```')
+        return SimpleNamespace(text=json.dumps(_categorization('Marketing')))
+
+    client = MagicMock()
+    client.models.generate_content.side_effect = generate
+
+    categorized = categorize_emails(emails, client, 'test-model', batch_size=10)
+
+    assert [email['category'] for email in categorized] == ['FYI', 'Marketing', 'SPAM']
+    assert 'index' not in categorized[0]
+    assert len(prompts) == 2 and len(acquired) == 2
+    assert all(email['subject'] in prompts[0] for email in emails)
+    assert emails[1]['subject'] in prompts[1] and emails[0]['subject'] not in prompts[1]
+
+
+@pytest.mark.unit
+@pytest.mark.extended
+def test_failed_batch_request_not_retried_per_email(sample_emails):
+    """
+    Test that a batch whose request fails gets fallback categorizations, not one request per email.
+    """
+    client = MagicMock()
+    client.models.generate_content.side_effect = RuntimeError("503 Service unavailable")
+
+    categorized = categorize_emails(sample_emails[:3], client, 'test-model', batch_size=10)
+
+    assert client.models.generate_content.call_count == 1
+    assert [email['category'] for email in categorized] == ['Unknown'] * 3
+
+
+@pytest.mark.unit
+@pytest.mark.basic
+def test_categorize_email_parses_fenced_and_rejects_invalid_json(sample_emails):
+    """
+    Test that ```json fences are stripped and unparseable responses fall back to Unknown.
+    """
+    client = MagicMock()
+    client.models.generate_content.return_value = SimpleNamespace(
+        text='```json\n' + json.dumps(_categorization('FYI')) + '\n```'
+    )
+    assert categorize_email_with_gemini(sample_emails[0], client, 'test-model')['category'] == 'FYI'
+
+    client.models.generate_content.return_value = SimpleNamespace(text='```json\n{"category": \n```')
+    assert categorize_email_with_gemini(sample_emails[1], client, 'test-model')['category'] == 'Unknown'
+
+    bare = '{"a": "```"}'
+    assert gemini_utils._strip_fence(bare) is bare
+    assert gemini_utils._strip_fence('```\n{"a": 1}\n```') == '{"a": 1}'
+
+
+@pytest.mark.unit
+@pytest.mark.extended
+def test_repeated_email_content_served_from_response_cache(sample_emails):
+    """
+    Test that an email with already-categorized content skips Gemini, even under a new ID.
+    """
+    email = sample_emails[0]
+    client = _fake_client(lambda prompt: _categorization('Marketing'))
+
+    assert categorize_email_with_gemini(email, client, 'test-model')['category'] == 'Marketing'
+    resent = dict(email, id='resent-id')
+    categorized = categorize_emails([resent, sample_emails[1]], client, 'test-model')
+
+    assert client.models.generate_content.call_count == 2
+    assert [e['category'] for e in categorized] == ['Marketing', 'Marketing']
+    assert categorized[0]['id'] == 'resent-id'
+
+    # Failed categorizations are not cached
+    failing = _fake_client(lambda prompt: 'not a categorization')
+    assert categorize_email_with_gemini(sample_emails[2], failing, 'test-model')['category'] == 'Unknown'
+    assert gemini_utils.get_response_cache().get('categorize', sample_emails[2]) is None
+
+
+@pytest.mark.unit
+@pytest.mark.basic
+def test_gemini_calls_request_schema_constrained_json(sample_emails):
+    """
+    Test that categorization and summaries ask for JSON that follows their schemas.
+    """
+    client = _fake_client(lambda prompt: {**_categorization('FYI'), 'bullet1': 'a', 'bullet2': 'b', 'bullet3': 'c',
+                                          'summary_points': ['x']})
+
+    categorize_email_with_gemini(sample_emails[0], client, 'test-model')
+    gemini_utils.generate_newsletter_summary('Body', 'Weekly digest', client, 'test-model')
+    gemini_utils.generate_category_summary(sample_emails[:2], 'FYI', client, 'test-model')
+
+    configs = [call.kwargs['config'] for call in client.models.generate_content.call_args_list]
+    assert all(config['response_mime_type'] == 'application/json' for config in configs)
+    assert configs[0]['response_schema']['properties']['category']['enum'][0] == 'Need-Action'
+    assert configs[1]['response_schema']['required'] == ['bullet1', 'bullet2', 'bullet3']
+    assert configs[2]['response_schema']['properties']['summary_points']['type'] == 'ARRAY'
+
+
+@pytest.mark.unit
+@pytest.mark.basic
+def test_rate_limited_request_is_retried(sample_emails, monkeypatch):
+    """
+    Test that a Gemini request failing with HTTP 429 is sent again after a backoff.
+    """
+    monkeypatch.setattr('utils.rate_limiter.time.sleep', lambda seconds: None)
+    client = MagicMock()
+    client.models.generate_content.side_effect = [
+        RuntimeError("429 RESOURCE_EXHAUSTED"),
+        SimpleNamespace(text=json.dumps(_categorization('FYI')))
+    ]
+
+    assert categorize_email_with_gemini(sample_emails[0], client, 'test-model')['category'] == 'FYI'
+    assert client.models.generate_content.call_count == 2
+
+
+@pytest.mark.unit
+@pytest.mark.extended
+def test_persistent_rate_limit_sends_bounded_requests(sample_emails, monkeypatch):
+    """
+    Test that a prompt that keeps hitting HTTP 429 is sent once per retry attempt, no more.
+    """
+    from utils.gemini_transport import RETRY_STATUS_CODES
+
+    monkeypatch.setattr('utils.rate_limiter.time.sleep', lambda seconds: None)
+    client = MagicMock()
+    client.models.generate_content.side_effect = RuntimeError("429 RESOURCE_EXHAUSTED")
+
+    assert categorize_email_with_gemini(sample_emails[0], client, 'test-model')['category'] == 'Unknown'
+    # The SDK transport must not retry 429s underneath each of these sends
+    assert 429 not in RETRY_STATUS_CODES
+    assert client.models.generate_content.call_count == 3
+
+
+@pytest.mark.unit
+@pytest.mark.extended
+def test_prompt_templates_keep_email_braces(sample_emails):
+    """
+    Test that braces in email text pass through the templates and the JSON example is intact.
+    """
+    email = {**sample_emails[0], 'subject': 'Invoice {2025} for {name}', 'snippet': 'Total: {}'}
+    client = _fake_client(lambda prompt: {'results': [{'index': 1, **_categorization('FYI')}]})
+
+    gemini_utils.categorize_email_batch([email], client, 'test-model')
+
+    prompt = client.models.generate_content.call_args.kwargs['contents']
+    assert prompt.startswith('Analyze each of the following 1 emails')
+    assert 'Email 1:\nFrom: ' + email['from'] + '\nSubject: Invoice {2025} for {name}\nContent: Total: {}' in prompt
+    assert '{"results": [...]}' in prompt
+    assert '{{' not in prompt
@@ -0,0 +1,60 @@
+"""
+Unit Tests for Logger Utilities
+
+Tests the shared logging setup:
+- Loggers only enqueue records; a background listener writes them to the log file
+- Repeat setup calls are served from the cache without touching the filesystem
+"""
+
+import logging
+import logging.handlers
+import sys
+import uuid
+from pathlib import Path
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'src'))
+
+from utils import logger_utils
+from utils.logger_utils import setup_logger
+
+
+@pytest.mark.unit
+@pytest.mark.basic
+def test_logger_enqueues_records_for_background_listener():
+    """
+    Test that a logger only has a QueueHandler and its records reach the log file.
+    """
+    logger = setup_logger('tests.logger_utils.queue')
+
+    assert len(logger.handlers) == 1
+    assert isinstance(logger.handlers[0], logging.handlers.QueueHandler)
+    assert setup_logger('tests.logger_utils.queue').handlers == logger.handlers
+    assert logger_utils._listener._thread is not None
+
+    marker = uuid.uuid4().hex
+    logger.debug("queued record %s", marker)
+    logger_utils._log_queue.join()
+
+    log_file = logger_utils.LOG_DIR / 'email_assistant.log'
+    assert f'queued record {marker}' not in log_file.read_text(encoding='utf-8')
+
+    logger.info("queued record %s", marker)
+    logger_utils._log_queue.join()
+
+    assert f'queued record {marker}' in log_file.read_text(encoding='utf-8')
+
+
+@pytest.mark.unit
+@pytest.mark.extended
+def test_repeat_setup_returns_cached_logger(monkeypatch):
+    """
+    Test that a second setup_logger() call with the same arguments skips all setup work.
+    """
+    logger = setup_logger('tests.logger_utils.cached')
+    monkeypatch.setattr(logger_utils, '_start_listener', lambda log_dir: pytest.fail("setup repeated"))
+    monkeypatch.setattr(logger_utils, 'LOG_DIR', None)
+
+    assert setup_logger('tests.logger_utils.cached') is logger
@@ -0,0 +1,79 @@
+"""
+Unit Tests for Rate Limiter
+
+Tests token-bucket pacing and rate-limit retries:
+- Bursts up to capacity pass without waiting
+- Further requests wait only for the next token
+- 429 errors are retried with backoff; other errors are not
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'src'))
+
+import utils.rate_limiter as rate_limiter
+from utils.rate_limiter import TokenBucket, retry_on_rate_limit
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """Record requested sleeps instead of sleeping."""
+    calls = []
+    monkeypatch.setattr(rate_limiter.time, 'sleep', calls.append)
+    return calls
+
+
+@pytest.mark.unit
+@pytest.mark.basic
+def test_token_bucket_bursts_then_paces(sleeps):
+    """
+    Test that a full bucket serves a burst and then waits per missing token.
+    """
+    bucket = TokenBucket(rate=10 / 60, capacity=2)
+
+    assert bucket.acquire() == 0.0
+    assert bucket.acquire() == 0.0
+    third = bucket.acquire()
+    fourth = bucket.acquire()
+
+    assert third == pytest.approx(6.0, abs=0.1)
+    assert fourth == pytest.approx(12.0, abs=0.1), "Queued callers should wait behind each other"
+    assert len(sleeps) == 2
+
+
+@pytest.mark.unit
+@pytest.mark.basic
+def test_retry_on_rate_limit_retries_429(sleeps):
+    """
+    Test that a 429 error is retried and the eventual result returned.
+    """
+    attempts = []
+
+    @retry_on_rate_limit(max_attempts=3, base=2.0, jitter=False)
+    def call():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise RuntimeError("429 RESOURCE_EXHAUSTED")
+        return 'ok'
+
+    assert call() == 'ok'
+    assert sleeps == [2.0, 4.0]
+
+
+@pytest.mark.unit
+@pytest.mark.extended
+def test_retry_on_rate_limit_reraises_other_errors(sleeps):
+    """
+    Test that non rate-limit errors propagate without retrying.
+    """
+    @retry_on_rate_limit(max_attempts=3)
+    def call():
+        raise ValueError("bad request")
+
+    with pytest.raises(ValueError):
+        call()
+    assert sleeps == []
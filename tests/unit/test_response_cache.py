@@ -0,0 +1,70 @@
+"""
+Unit Tests for ResponseCache
+
+Tests the content-hash keyed Gemini response cache:
+- Set/get round trip keyed by email content
+- Keys depend on prompt type and content, not email ID
+- Expired entries are treated as misses
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'src'))
+
+import utils.response_cache as response_cache
+from utils.response_cache import ResponseCache, content_key
+
+
+@pytest.fixture
+def cache(tmp_path):
+    """Create a ResponseCache backed by a temporary database."""
+    return ResponseCache(db_path=str(tmp_path / 'responses.db'))
+
+
+@pytest.mark.unit
+@pytest.mark.basic
+def test_response_cache_round_trip(cache):
+    """
+    Test that a stored response is returned for the same content.
+    """
+    email = pytest.create_test_email(email_id="a", subject="Sale!", snippet="50% off")
+    assert cache.get('spam', email) is None
+
+    assert cache.set('spam', email, {'is_spam': True})
+
+    # Same content under a different message ID still hits
+    assert cache.get('spam', dict(email, id="b")) == {'is_spam': True}
+    # Different prompt type misses
+    assert cache.get('event', email) is None
+
+
+@pytest.mark.unit
+@pytest.mark.extended
+def test_content_key_ignores_snippet_tail():
+    """
+    Test that only the first SNIPPET_KEY_CHARS of the snippet affect the key.
+    """
+    base = 'x' * response_cache.SNIPPET_KEY_CHARS
+    email_a = {'from': 'a@b.com', 'subject': 'Hi', 'snippet': base + 'tail one'}
+    email_b = {'from': 'a@b.com', 'subject': 'Hi', 'snippet': base + 'tail two'}
+
+    assert content_key('spam', email_a) == content_key('spam', email_b)
+    assert content_key('spam', email_a) != content_key('event', email_a)
+
+
+@pytest.mark.unit
+@pytest.mark.extended
+def test_response_cache_expiry(cache, monkeypatch):
+    """
+    Test that entries past their TTL are not returned.
+    """
+    email = pytest.create_test_email()
+    monkeypatch.setitem(response_cache.TTL_SECONDS, 'event', -1)
+
+    cache.set('event', email, {'has_event': False})
+
+    assert cache.get('event', email) is None